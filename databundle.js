@@ -0,0 +1,111 @@
+/**
+ * Columnar data bundles — reader for the bundles written by tools/bundle_data.py
+ * Rows are stored column by column; facet columns carry an inverted index
+ * (value -> ascending row numbers), so filters on them only touch matching rows.
+ *
+ *   DataBundle.rows(bundle)                 -> array of row objects
+ *   DataBundle.values(bundle, field)        -> sorted distinct values of a column
+ *   DataBundle.select(bundle, {field: v})   -> ascending row numbers, or null for "all rows"
+ *
+ * A criterion is a value (matched like ==, so '2024' finds 2024) or a
+ * predicate on the value; '' / null / undefined criteria are ignored.
+ */
+(function () {
+  'use strict';
+
+  var VERSION = 1;
+
+  function check(bundle) {
+    if (!bundle || bundle.version !== VERSION) {
+      throw new Error('DataBundle: unsupported bundle version ' + (bundle && bundle.version));
+    }
+  }
+
+  function facet(bundle, field) {
+    var col = bundle.columns[field];
+    if (!col || !col.index) throw new Error('DataBundle: "' + field + '" is not a facet');
+    return col;
+  }
+
+  // Code of every row in a facet column, rebuilt once from the index
+  function codes(bundle, col) {
+    if (!col._codes) {
+      var out = new Int32Array(bundle.rows);
+      for (var k = 0; k < col.index.length; k++) {
+        var rows = col.index[k];
+        for (var j = 0; j < rows.length; j++) out[rows[j]] = k;
+      }
+      col._codes = out;
+    }
+    return col._codes;
+  }
+
+  function column(bundle, field) {
+    var col = bundle.columns[field];
+    if (col.values) return col.values;
+    var dict = col.dict;
+    var c = col.codes || codes(bundle, col);
+    var out = new Array(bundle.rows);
+    for (var i = 0; i < out.length; i++) out[i] = dict[c[i]];
+    return out;
+  }
+
+  function rows(bundle) {
+    check(bundle);
+    var fields = bundle.fields;
+    var cols = fields.map(function (f) { return column(bundle, f); });
+    var out = new Array(bundle.rows);
+    for (var i = 0; i < out.length; i++) {
+      var row = {};
+      for (var f = 0; f < fields.length; f++) row[fields[f]] = cols[f][i];
+      out[i] = row;
+    }
+    return out;
+  }
+
+  function values(bundle, field) {
+    return facet(bundle, field).dict.slice();
+  }
+
+  // Which dictionary entries a criterion accepts, and how many rows that is
+  function accepts(col, criterion) {
+    var dict = col.dict;
+    var ok = new Uint8Array(dict.length);
+    var count = 0;
+    var test = typeof criterion === 'function' ? criterion : null;
+    var key = test ? null : String(criterion);
+    for (var k = 0; k < dict.length; k++) {
+      if (test ? test(dict[k]) : (dict[k] != null && String(dict[k]) === key)) {
+        ok[k] = 1;
+        count += col.index[k].length;
+      }
+    }
+    return { col: col, ok: ok, count: count };
+  }
+
+  function select(bundle, criteria) {
+    check(bundle);
+    var terms = [];
+    for (var field in criteria) {
+      var c = criteria[field];
+      if (c === '' || c === null || c === undefined) continue;
+      terms.push(accepts(facet(bundle, field), c));
+    }
+    if (!terms.length) return null;
+    terms.sort(function (a, b) { return a.count - b.count; });
+
+    // Rows of the most selective criterion, checked against the others by code
+    var first = terms[0], ids = [], lists = 0;
+    for (var k = 0; k < first.ok.length; k++) {
+      if (first.ok[k]) { ids = ids.concat(first.col.index[k]); lists++; }
+    }
+    if (lists > 1) ids.sort(function (a, b) { return a - b; });
+    for (var t = 1; t < terms.length && ids.length; t++) {
+      var ok = terms[t].ok, rowCodes = codes(bundle, terms[t].col);
+      ids = ids.filter(function (i) { return ok[rowCodes[i]] === 1; });
+    }
+    return ids;
+  }
+
+  window.DataBundle = { rows: rows, values: values, select: select };
+})();
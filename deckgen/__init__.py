@@ -0,0 +1,47 @@
+"""Deck generation for the company-profile presentations.
+
+Importing the package is cheap: python-pptx and lxml are only loaded the first
+time a builder or slide helper is looked up, e.g. ``deckgen.build_deck``::
+
+    import deckgen
+    from deckgen.decks import load_spec
+
+    spec = load_spec("anti-gd2")
+    prs = deckgen.build_deck(spec)          # python-pptx Presentation
+    data = deckgen.render_deck(spec)        # .pptx bytes, nothing on disk
+"""
+
+import importlib
+
+from .palette import PALETTES, Palette, get_palette
+
+_LAZY = {
+    "build_deck": "deckgen.builder",
+    "render_deck": "deckgen.builder",
+    "save_deck": "deckgen.builder",
+    "add_slide": "deckgen.builder",
+    "new_presentation": "deckgen.builder",
+    "stream_deck": "deckgen.stream",
+    "StreamingDeck": "deckgen.stream",
+    "add_background": "deckgen.shapes",
+    "rect": "deckgen.shapes",
+    "add_text_box": "deckgen.shapes",
+    "add_bullets": "deckgen.shapes",
+    "add_table": "deckgen.shapes",
+    "section_title_bar": "deckgen.shapes",
+}
+
+__all__ = ["PALETTES", "Palette", "get_palette", *_LAZY]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,234 @@
+"""Image assets (headshot, logos) for the site and the decks.
+
+Every source image is identified by the sha256 of its bytes. It is decoded
+at most once per process, and each variant rendered from it (a size in a
+format) is kept in the on-disk cache under a key made of that digest and
+the variant's parameters. Re-running a build only encodes variants that are
+new, and renaming or copying a file doesn't cost anything.
+
+Variants never upscale. ``contain`` fits the image inside the box and
+``cover`` crops it to the box's aspect ratio first. Images with
+transparency fall back to PNG and the rest to JPEG. WebP and AVIF are for
+the web, since PowerPoint can't be relied on to open them.
+
+``near_duplicates`` groups images that are the same picture at a different
+size or encoding (e.g. a logo saved as both .png and .jpg). It compares a
+difference hash of the image trimmed to its content, so the variants of a
+group can be rendered from one source. In decks, ``slide_image`` returns the
+same bytes for the same picture and placement, and python-pptx stores
+identical images once per package. A logo placed on every slide therefore
+costs one image part.
+
+Pillow is imported on first use.
+"""
+
+import io
+import os
+from collections import namedtuple
+
+from .cache import BlobCache, content_hash
+
+ASSET_VERSION = 1
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pillow format name and save options per output format
+FORMATS = {
+    "avif": ("AVIF", {"quality": 55, "speed": 6}),
+    "webp": ("WEBP", {"quality": 82, "method": 6}),
+    "png": ("PNG", {"optimize": True}),
+    "jpeg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp", "png": "image/png", "jpeg": "image/jpeg"}
+
+NEAR_DUPLICATE_BITS = 6              # of 64 hash bits
+NEAR_DUPLICATE_ASPECT = 0.05         # relative difference of the trimmed aspect ratios
+
+Source = namedtuple("Source", "path digest width height alpha")
+
+_digests = {}                        # (path, mtime, size) -> sha256
+_decoded = {}                        # sha256 -> PIL image
+_hashes = {}                         # sha256 -> (dhash, aspect ratio)
+_cache = None
+
+
+def resolve(path):
+    """``path`` as given if it exists, else relative to the repository root."""
+    if os.path.isabs(path) or os.path.exists(path):
+        return path
+    return os.path.join(ROOT, path)
+
+
+def file_digest(path):
+    """sha256 of the file's bytes, memoized on its mtime and size."""
+    path = resolve(path)
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    if key not in _digests:
+        with open(path, "rb") as f:
+            _digests[key] = content_hash(f.read())
+    return _digests[key]
+
+
+def _blob_cache():
+    global _cache
+    if _cache is None:
+        _cache = BlobCache("assets", version=ASSET_VERSION)
+    return _cache
+
+
+def decode(path):
+    """The decoded image (RGB or RGBA), shared by everything rendered from the same bytes."""
+    digest = file_digest(path)
+    if digest not in _decoded:
+        from PIL import Image
+
+        with Image.open(resolve(path)) as im:
+            im.load()
+            alpha = im.mode in ("RGBA", "LA", "PA") or (im.mode == "P" and "transparency" in im.info)
+            image = im.convert("RGBA" if alpha else "RGB")
+        if alpha and image.getchannel("A").getextrema()[0] == 255:
+            image = image.convert("RGB")          # an alpha channel that is opaque everywhere
+        _decoded[digest] = image
+    return _decoded[digest]
+
+
+def source(path):
+    image = decode(path)
+    return Source(path, file_digest(path), image.width, image.height, image.mode == "RGBA")
+
+
+def fallback_format(path):
+    """The format a variant falls back to where WebP/AVIF can't be used."""
+    return "png" if source(path).alpha else "jpeg"
+
+
+def _crop(size, box):
+    """Size of the centre crop of ``size`` to the aspect ratio of ``box``."""
+    (w, h), (bw, bh) = size, box
+    return min(w, round(h * bw / bh)), min(h, round(w * bh / bw))
+
+
+def fit(size, box, mode="contain"):
+    """Pixel size of an image of ``size`` rendered into ``box`` (never larger than the source)."""
+    if mode == "cover":
+        size = _crop(size, box)
+    elif mode != "contain":
+        raise ValueError(f"unknown fit mode {mode!r} (expected contain or cover)")
+    (w, h), (bw, bh) = size, box
+    scale = min(1.0, bw / w, bh / h)
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+
+def render(path, box, fmt, mode="contain"):
+    """Bytes of ``path`` rendered into ``box`` (pixels) as ``fmt``; cached by content."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown image format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    digest = file_digest(path)
+    key = content_hash(f"{digest}:{box[0]}x{box[1]}:{mode}:{fmt}")
+    data = _blob_cache().get(key)
+    if data is not None:
+        return data
+
+    from PIL import Image
+
+    image = decode(path)
+    w, h = image.size
+    if mode == "cover":
+        cw, ch = _crop((w, h), box)
+        image = image.crop(((w - cw) // 2, (h - ch) // 2, (w - cw) // 2 + cw, (h - ch) // 2 + ch))
+    size = fit(image.size, box)
+    if size != image.size:
+        image = image.resize(size, Image.LANCZOS)
+    if fmt == "jpeg" and image.mode == "RGBA":
+        image = image.convert("RGB")
+    name, options = FORMATS[fmt]
+    buf = io.BytesIO()
+    image.save(buf, name, **options)
+    return _blob_cache().put(key, buf.getvalue())
+
+
+def slide_image(path, width, height, dpi=200):
+    """``(bytes, (px width, px height))`` for placing ``path`` in a ``width`` x ``height`` inch box."""
+    box = (max(1, round(width * dpi)), max(1, round(height * dpi)))
+    size = fit(decode(path).size, box)
+    return render(path, box, fallback_format(path)), size
+
+
+def dhash(path, bits=8):
+    """``(64-bit difference hash, aspect ratio)`` of the image trimmed to its content."""
+    digest = file_digest(path)
+    if digest not in _hashes:
+        from PIL import Image, ImageChops
+
+        image = decode(path)
+        flat = Image.new("RGB", image.size, "white")
+        flat.paste(image, mask=image.getchannel("A") if image.mode == "RGBA" else None)
+        gray = flat.convert("L")
+        # Trim the margin (anything close to the corner colour)
+        corner = gray.getpixel((0, 0))
+        margin = ImageChops.difference(gray, Image.new("L", gray.size, corner))
+        box = margin.point(lambda v: 255 * (v > 24)).getbbox()
+        if box:
+            gray = gray.crop(box)
+        small = gray.resize((bits + 1, bits), Image.LANCZOS).tobytes()
+        value = 0
+        for y in range(bits):
+            row = small[y * (bits + 1):(y + 1) * (bits + 1)]
+            for x in range(bits):
+                value = (value << 1) | (row[x] > row[x + 1])
+        _hashes[digest] = (value, gray.width / gray.height)
+    return _hashes[digest]
+
+
+def same_picture(a, b, max_bits=NEAR_DUPLICATE_BITS, max_aspect=NEAR_DUPLICATE_ASPECT):
+    """Whether images ``a`` and ``b`` are identical or near-identical."""
+    if file_digest(a) == file_digest(b):
+        return True
+    (ha, ra), (hb, rb) = dhash(a), dhash(b)
+    return bin(ha ^ hb).count("1") <= max_bits and abs(ra - rb) <= max_aspect * max(ra, rb)
+
+
+def match(path, known):
+    """The first of ``known`` that is the same picture as ``path``; else adds ``path`` to ``known``."""
+    for other in known:
+        if same_picture(path, other):
+            return other
+    known.append(path)
+    return path
+
+
+def near_duplicates(paths, max_bits=NEAR_DUPLICATE_BITS, max_aspect=NEAR_DUPLICATE_ASPECT):
+    """Groups (lists of paths) of identical or near-identical images, largest image first.
+
+    Images that match nothing else are left out.
+    """
+    paths = list(paths)
+    parent = list(range(len(paths)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(paths)):
+        for j in range(i):
+            if same_picture(paths[i], paths[j], max_bits, max_aspect):
+                parent[root(i)] = root(j)
+
+    groups = {}
+    for i, p in enumerate(paths):
+        groups.setdefault(root(i), []).append(p)
+    pixels = {p: decode(p).width * decode(p).height for p in paths}
+    return [sorted(g, key=lambda p: -pixels[p]) for g in groups.values() if len(g) > 1]
+
+
+def canonical_sources(paths):
+    """``{path: path to render it from}``; near-duplicates map to the largest of their group."""
+    out = {p: p for p in paths}
+    for group in near_duplicates(paths):
+        for p in group:
+            out[p] = group[0]
+    return out
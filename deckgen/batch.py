@@ -0,0 +1,135 @@
+"""Build many decks in parallel from a manifest.
+
+A manifest is a JSON file::
+
+    {
+        "output_dir": "out",                              # optional, relative to the manifest
+        "decks": [
+            {"name": "Danyelza_vs_Unituxin",
+             "title": "Anti-GD2 Monoclonal Antibodies in Neuroblastoma",
+             "sources": [
+                 {"analysis": "comp analis/Danyelza_Analysis.md", "palette": "danyelza"},
+                 {"analysis": "comp analis/Unituxin_Analysis.md",
+                  "palette": {"primary": "2B4C3F", "accent": "4A8C72", "table_alt": "E8F2ED",
+                              "subtitle": "A3CCB8"}}
+             ]},
+            {"name": "anti-gd2-handbuilt", "spec": "anti-gd2"}
+        ]
+    }
+
+Each entry is either a list of analysis ``sources`` (each with its own
+palette, as a registered name or a dict of palette fields) or a ``spec``
+(built-in deck name or JSON spec file). Decks are built in a process pool,
+one deck per task, and each finished .pptx is moved into the output
+directory as soon as its worker is done, unless the deck already there is
+structurally the same (``deckgen.diff``), in which case it is left alone.
+"""
+
+import io
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def load_manifest(path):
+    """Read a manifest and resolve its relative paths; returns ``(jobs, output_dir)``."""
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    output_dir = os.path.join(base, manifest.get("output_dir", "."))
+    jobs = []
+    names = set()
+    for i, entry in enumerate(manifest["decks"]):
+        job = dict(entry)
+        job.setdefault("name", f"deck-{i + 1:04d}")
+        # Each deck is written to <name>.pptx, so two entries with one name would overwrite each other
+        if job["name"] in names:
+            raise ValueError(f"manifest has more than one deck named {job['name']!r}")
+        names.add(job["name"])
+        if "sources" in job:
+            job["sources"] = [dict(s, analysis=os.path.join(base, s["analysis"])) for s in job["sources"]]
+        elif "spec" in job:
+            spec_path = os.path.join(base, job["spec"])
+            if os.path.exists(spec_path):
+                job["spec"] = spec_path
+        else:
+            raise ValueError(f"manifest entry {job['name']!r} needs 'sources' or 'spec'")
+        jobs.append(job)
+    return jobs, output_dir
+
+
+def job_spec(job):
+    """Deck spec for one manifest entry."""
+    if "sources" in job:
+        from .markdown import analysis_spec
+
+        sources = [(s["analysis"], s.get("palette", "danyelza")) for s in job["sources"]]
+        return analysis_spec(sources, title=job.get("title"), subtitle=job.get("subtitle"))
+
+    from .decks import load_spec
+
+    return load_spec(job["spec"])
+
+
+def _warm():
+    # Pay for the python-pptx import once per worker, not once per deck
+    from . import builder  # noqa: F401
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def build_job(job, output_dir, incremental=False):
+    """Build one manifest entry into ``output_dir``; never raises.
+
+    Returns a result dict with ``name``, ``path``, ``slides``, ``seconds``,
+    ``published`` (False if the deck already there was the same, see
+    ``deckgen.diff.publish``) and ``error`` (a formatted traceback, or None).
+    """
+    start = time.perf_counter()
+    path = os.path.join(output_dir, job["name"] + ".pptx")
+    result = {"name": job["name"], "path": path, "slides": 0, "published": False, "error": None}
+    try:
+        spec = job_spec(job)
+        if incremental:
+            from .incremental import rebuild_deck
+
+            before = _mtime(path)
+            result["slides"] = sum(rebuild_deck(spec, path))
+            result["published"] = before is None or _mtime(path) != before
+        else:
+            from .builder import build_deck
+            from .diff import publish
+
+            buf = io.BytesIO()
+            prs = build_deck(spec)
+            prs.save(buf)
+            result["published"] = publish(buf.getvalue(), path)
+            result["slides"] = len(prs.slides)
+    except Exception:
+        result["error"] = traceback.format_exc()
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def run_batch(jobs, output_dir, workers=None, incremental=False, on_result=None):
+    """Build every job in a process pool and return the results in completion order.
+
+    ``on_result`` is called with each result as soon as its deck is written.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm) as pool:
+        futures = [pool.submit(build_job, job, output_dir, incremental) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    return results
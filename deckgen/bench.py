@@ -0,0 +1,301 @@
+"""Benchmarks for the slide helpers and deck builds, with JSON baselines.
+
+Each workload is a ``setup`` function that prepares its inputs (a fresh
+presentation and slide, synthetic rows, ...) and returns the call to time,
+so setup cost never shows up in the numbers. Workloads vary table rows and
+columns, bullet counts and slide counts, and include full builds of the
+built-in anti-gd2 deck and a streamed one (reopened once to check it).
+
+For every workload ``run_benchmarks`` records:
+
+* ``seconds_min`` / ``seconds_median`` — wall time per call over
+  ``repeat`` rounds of ``loops`` calls (``loops`` is calibrated so a round
+  takes ~50ms);
+* ``peak_kb`` — peak traced memory during one call (``tracemalloc``);
+* ``allocated_kb`` / ``allocated_blocks`` — memory and blocks allocated by
+  that call and still alive when it returns.
+
+Memory is measured in a separate call so tracing doesn't skew the timings.
+lxml allocates its trees outside Python's allocator, so the memory figures
+cover Python objects and strings (cell text, serialized XML), not the trees.
+``compare`` flags workloads whose time or peak memory grew by more than a
+tolerance over a baseline::
+
+    python -m deckgen bench run -o benchmarks/baseline.json
+    python -m deckgen bench compare benchmarks/baseline.json --tolerance 0.25
+
+Baselines are only meaningful on the machine that recorded them.
+"""
+
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from collections import namedtuple
+
+BENCH_VERSION = 1
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "benchmarks", "baseline.json")
+
+Workload = namedtuple("Workload", "name setup")
+
+
+# ================================================================
+# WORKLOADS
+# ================================================================
+
+def _blank_slide():
+    from .builder import new_presentation
+
+    prs = new_presentation({})
+    return prs, prs.slides.add_slide(prs.slide_layouts[6])
+
+
+def _rows(rows, cols):
+    header = [f"Column {c + 1}" for c in range(cols)]
+    return [header] + [[f"Row {r + 1} value {c + 1}" for c in range(cols)] for r in range(rows)]
+
+
+def table_workload(rows, cols):
+    data = _rows(rows, cols)
+
+    def setup():
+        from pptx.util import Inches
+
+        from .shapes import add_table
+
+        _, slide = _blank_slide()
+        return lambda: add_table(slide, Inches(0.5), Inches(1.5), Inches(12.3), data)
+
+    return Workload(f"add_table[rows={rows},cols={cols}]", setup)
+
+
+def bullets_workload(items):
+    data = [f"Bullet point {i + 1}: pivotal Phase 3 readout expected in 2025" for i in range(items)]
+
+    def setup():
+        from pptx.util import Inches
+
+        from .shapes import add_bullets
+
+        _, slide = _blank_slide()
+        return lambda: add_bullets(slide, Inches(0.5), Inches(1.5), Inches(12), Inches(5.5), data)
+
+    return Workload(f"add_bullets[items={items}]", setup)
+
+
+def title_bar_workload(slides):
+    def setup():
+        from .palette import DANYELZA
+        from .shapes import section_title_bar
+
+        prs, _ = _blank_slide()
+        targets = [prs.slides.add_slide(prs.slide_layouts[6]) for _ in range(slides)]
+
+        def run():
+            for slide in targets:
+                section_title_bar(slide, "DANYELZA  |  Overview", "Y-mAbs Therapeutics",
+                                  DANYELZA.primary, DANYELZA.accent, DANYELZA.subtitle)
+        return run
+
+    return Workload(f"section_title_bar[slides={slides}]", setup)
+
+
+def chrome_workload(slides):
+    # The same title bar through the compiled slide layout (deckgen.theme)
+    spec = {"layout": "content", "title": "DANYELZA  |  Overview", "subtitle": "Y-mAbs Therapeutics"}
+
+    def setup():
+        from .builder import add_slide
+
+        prs, _ = _blank_slide()
+
+        def run():
+            for _ in range(slides):
+                add_slide(prs, spec)
+        return run
+
+    return Workload(f"content_chrome[slides={slides}]", setup)
+
+
+def _content_slides(slides):
+    # Content slides cycled from the anti-gd2 deck, for deck-size scaling
+    from .decks import load_spec
+
+    content = [s for s in load_spec("anti-gd2")["slides"] if s.get("layout", "content") == "content"]
+    return {"slides": [content[i % len(content)] for i in range(slides)]}
+
+
+def save_workload(slides):
+    def setup():
+        from .builder import build_deck
+
+        prs = build_deck(_content_slides(slides))
+        return lambda: prs.save(io.BytesIO())
+
+    return Workload(f"save[slides={slides}]", setup)
+
+
+def build_workload(slides):
+    def setup():
+        from .builder import render_deck
+
+        spec = _content_slides(slides)
+        return lambda: render_deck(spec)
+
+    return Workload(f"build[slides={slides}]", setup)
+
+
+def stream_workload(slides):
+    # The cycled content slides repeat, so this also checks that identical slides
+    # all survive streaming: the deck is reopened once before anything is timed
+    def setup():
+        from pptx import Presentation
+
+        from .stream import stream_deck
+
+        spec = _content_slides(slides)
+        buf = io.BytesIO()
+        stream_deck(spec, buf)
+        written = len(Presentation(io.BytesIO(buf.getvalue())).slides)
+        if written != slides:
+            raise ValueError(f"streamed deck reopens with {written} slides, not {slides}")
+        return lambda: stream_deck(spec, io.BytesIO())
+
+    return Workload(f"stream[slides={slides}]", setup)
+
+
+def rebuild_workload():
+    def setup():
+        from .builder import render_deck
+        from .decks import load_spec
+
+        spec = load_spec("anti-gd2")
+        return lambda: render_deck(spec)
+
+    return Workload("rebuild[anti-gd2]", setup)
+
+
+def default_workloads():
+    return [
+        *(table_workload(rows, 6) for rows in (10, 50, 200, 500)),
+        *(table_workload(50, cols) for cols in (2, 4, 16)),
+        *(bullets_workload(items) for items in (5, 25, 100)),
+        *(title_bar_workload(slides) for slides in (1, 50)),
+        *(chrome_workload(slides) for slides in (1, 50)),
+        *(save_workload(slides) for slides in (15, 100, 500)),
+        *(build_workload(slides) for slides in (15, 100)),
+        stream_workload(100),
+        rebuild_workload(),
+    ]
+
+
+# ================================================================
+# RUNNING
+# ================================================================
+
+def _time_round(workload, loops):
+    calls = [workload.setup() for _ in range(loops)]
+    gc.collect()
+    gc.disable()                                 # as timeit does: no collections mid-round
+    try:
+        start = time.perf_counter()
+        for call in calls:
+            call()
+        return (time.perf_counter() - start) / loops
+    finally:
+        gc.enable()
+
+
+def _measure_memory(workload):
+    call = workload.setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        call()
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    finally:
+        tracemalloc.stop()
+    return {"peak_kb": round(peak / 1024, 1), "allocated_kb": round(current / 1024, 1),
+            "allocated_blocks": blocks}
+
+
+def run_workload(workload, repeat=5, target=0.05):
+    """Time and measure one workload; returns its result dict."""
+    _time_round(workload, 1)                     # warm-up (imports, compiled layouts, caches)
+    single = _time_round(workload, 1)
+    loops = max(1, min(100, int(target / max(single, 1e-9))))
+    times = [_time_round(workload, loops) for _ in range(repeat)]
+    return {"seconds_min": min(times), "seconds_median": statistics.median(times),
+            "loops": loops, "repeat": repeat, **_measure_memory(workload)}
+
+
+def run_benchmarks(workloads=None, repeat=5, select=None, on_result=None):
+    """Run ``workloads`` (default: all) whose name contains ``select``; returns a results document."""
+    import pptx
+
+    results = {}
+    for workload in workloads or default_workloads():
+        if select and select not in workload.name:
+            continue
+        results[workload.name] = result = run_workload(workload, repeat)
+        if on_result is not None:
+            on_result(workload.name, result)
+    return {
+        "version": BENCH_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "python_pptx": pptx.__version__,
+        "machine": f"{platform.system()} {platform.machine()}",
+        "results": results,
+    }
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    if document.get("version") != BENCH_VERSION:
+        raise ValueError(f"{path}: benchmark results version {document.get('version')!r}, "
+                         f"expected {BENCH_VERSION}")
+    return document
+
+
+def save_results(document, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=1)
+        f.write("\n")
+
+
+# ================================================================
+# COMPARING
+# ================================================================
+
+COMPARED = ("seconds_min", "peak_kb")
+
+
+def compare(baseline, current, tolerance=0.25):
+    """Compare two results documents.
+
+    Returns one row per workload present in both: ``(name, metric ratios,
+    regressed metrics)``, where a ratio is current / baseline and a metric
+    regresses when its ratio exceeds ``1 + tolerance``.
+    """
+    rows = []
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        ratios = {m: new[m] / old[m] if old[m] else 1.0 for m in COMPARED}
+        rows.append((name, ratios, [m for m, r in ratios.items() if r > 1 + tolerance]))
+    return rows
+
+
+def format_result(name, result):
+    return (f"{name:<34} {result['seconds_min'] * 1000:>10.3f} ms  {result['peak_kb']:>10.1f} KB peak"
+            f"  {result['allocated_blocks']:>8} blocks")
@@ -0,0 +1,190 @@
+"""Turn a deck spec into a python-pptx ``Presentation``.
+
+A spec is a plain dict (JSON-compatible) describing the slides::
+
+    {
+        "width": 13.333, "height": 7.5,          # inches, optional
+        "slides": [
+            {"layout": "title", "title": "...", "subtitle": "...", "palette": "danyelza"},
+            {"layout": "cover", "title": "...", "company": "...", "tagline": "...", "palette": "unituxin"},
+            {"layout": "content", "title": "...", "subtitle": "...", "palette": "danyelza",
+             "blocks": [{"type": "table", "rows": [[...], ...], "col_widths": [2.8, 9.5]},
+                        {"type": "bullets", "top": 5.5, "height": 1.5, "items": [...]}]},
+            {"layout": "closing", "title": "...", "subtitle": "..."},
+        ],
+    }
+
+Positions and sizes are in inches, colours are ``RRGGBB`` hex strings and
+palettes are either a registered name (see ``deckgen.palette.PALETTES``) or a
+dict of palette fields.
+
+Image blocks (``{"type": "image", "src": "logos/msk.png", "left": 11.5,
+"top": 0.25, "height": 0.7}``) name a file relative to the working directory
+or the repository root. An image (or a near-duplicate of it, see
+``deckgen.assets``) shown at the same size on many slides is stored once.
+
+Chart blocks (``{"type": "chart", "chart": "column", "categories": [...],
+"series": [{"name": "Net Revenue", "values": [...]}], "number_format":
+'"$"#,##0.0"M"', "left": 7.5, "top": 1.5, "width": 5.3, "height": 3}``)
+become native charts; ``deckgen.metrics.chart_block`` builds them from
+parsed figures.
+"""
+
+import io
+import os
+
+from pptx import Presentation
+from pptx.util import Inches
+
+from .paginate import paginate
+from .palette import DARK_GRAY, get_palette
+from .shapes import ALIGNMENTS, add_bullets, add_chart, add_picture, add_table, add_text_box
+from .theme import fill_placeholders, theme_for
+from .trace import span
+
+
+# ================================================================
+# BLOCKS — content placed below the title bar
+# ================================================================
+
+def table_block(slide, block, palette):
+    palette = get_palette(block.get("palette", palette))
+    col_widths = block.get("col_widths")
+    add_table(slide, Inches(block.get("left", 0.5)), Inches(block.get("top", 1.5)),
+              Inches(block.get("width", 12.3)), block["rows"],
+              col_widths=[Inches(w) for w in col_widths] if col_widths else None,
+              header_bg=palette.table_hdr, alt_bg=palette.table_alt)
+
+
+def bullets_block(slide, block, palette):
+    add_bullets(slide, Inches(block.get("left", 0.5)), Inches(block["top"]),
+                Inches(block.get("width", 12)), Inches(block["height"]), block["items"],
+                font_size=block.get("font_size", 14), color=block.get("color", DARK_GRAY),
+                spacing=block.get("spacing", 8))
+
+
+def text_block(slide, block, palette):
+    add_text_box(slide, Inches(block.get("left", 0.5)), Inches(block["top"]),
+                 Inches(block.get("width", 12)), Inches(block.get("height", 0.4)), block["text"],
+                 font_size=block.get("font_size", 18), color=block.get("color", DARK_GRAY),
+                 bold=block.get("bold", False), alignment=ALIGNMENTS[block.get("align", "left")])
+
+
+def image_block(slide, block, palette):
+    width, height = block.get("width"), block.get("height")
+    add_picture(slide, block["src"], Inches(block.get("left", 0.5)), Inches(block.get("top", 1.5)),
+                Inches(width) if width is not None else None, Inches(height) if height is not None else None)
+
+
+def chart_block(slide, block, palette):
+    palette = get_palette(block.get("palette", palette))
+    series = [(s.get("name", ""), s["values"]) for s in block["series"]]
+    add_chart(slide, block.get("chart", "column"), Inches(block.get("left", 0.5)), Inches(block.get("top", 1.5)),
+              Inches(block.get("width", 6)), Inches(block.get("height", 3)), block["categories"], series,
+              number_format=block.get("number_format", "General"),
+              colors=block.get("colors", (palette.primary, palette.accent, palette.accent_line)))
+
+
+BLOCK_BUILDERS = {
+    "table": table_block,
+    "bullets": bullets_block,
+    "text": text_block,
+    "image": image_block,
+    "chart": chart_block,
+}
+
+
+# ================================================================
+# SLIDE LAYOUTS — chrome comes from the compiled layout, see theme.py
+# ================================================================
+
+def title_slide(slide, spec, palette):
+    fill_placeholders(slide, "title", spec)
+
+
+def cover_slide(slide, spec, palette):
+    fill_placeholders(slide, "cover", spec)
+
+
+def content_slide(slide, spec, palette):
+    fill_placeholders(slide, "content", spec)
+    for block in spec.get("blocks", ()):
+        try:
+            build = BLOCK_BUILDERS[block["type"]]
+        except KeyError:
+            raise ValueError(f"unknown block type {block.get('type')!r}") from None
+        build(slide, block, palette)
+
+
+def closing_slide(slide, spec, palette):
+    fill_placeholders(slide, "closing", dict(spec, title=spec.get("title", "Thank You")))
+
+
+SLIDE_BUILDERS = {
+    "title": title_slide,
+    "cover": cover_slide,
+    "content": content_slide,
+    "closing": closing_slide,
+}
+
+
+# ================================================================
+# DECK
+# ================================================================
+
+def new_presentation(spec):
+    prs = Presentation()
+    prs.slide_width = Inches(spec.get("width", 13.333))
+    prs.slide_height = Inches(spec.get("height", 7.5))
+    return prs
+
+
+def slide_layout(prs, spec):
+    """The compiled layout (see ``deckgen.theme``) that ``spec`` is built on."""
+    layout = spec.get("layout", "content")
+    if layout not in SLIDE_BUILDERS:
+        raise ValueError(f"unknown slide layout {layout!r}")
+    return theme_for(prs).layout(layout, get_palette(spec.get("palette", "danyelza")), spec)
+
+
+def add_slide(prs, spec):
+    """Append one slide described by ``spec`` to ``prs`` and return it."""
+    layout = spec.get("layout", "content")
+    with span(spec.get("title") or layout, "slide", layout=layout) as s:
+        slide = prs.slides.add_slide(slide_layout(prs, spec))
+        SLIDE_BUILDERS[layout](slide, spec, get_palette(spec.get("palette", "danyelza")))
+        s.measure(slide._element)
+    return slide
+
+
+def build_deck(spec):
+    """Build every slide in ``spec`` and return the ``Presentation``.
+
+    Slides whose content runs off the page are split first (see ``deckgen.paginate``).
+    """
+    spec = paginate(spec)
+    with span("build_deck", slides=len(spec["slides"])):
+        prs = new_presentation(spec)
+        for slide_spec in spec["slides"]:
+            add_slide(prs, slide_spec)
+    return prs
+
+
+def save(prs, file):
+    """``prs.save(file)``, traced (see ``deckgen.trace``)."""
+    with span("save", "io") as s:
+        prs.save(file)
+        s.set(bytes=file.tell() if hasattr(file, "tell") else os.path.getsize(file))
+
+
+def render_deck(spec):
+    """Build ``spec`` and return the serialized .pptx as bytes."""
+    buf = io.BytesIO()
+    save(build_deck(spec), buf)
+    return buf.getvalue()
+
+
+def save_deck(spec, path):
+    prs = build_deck(spec)
+    save(prs, path)
+    return prs
@@ -0,0 +1,96 @@
+"""On-disk cache of JSON values and blobs, keyed by content hash.
+
+Entries live under ``$DECKGEN_CACHE_DIR`` (default ``~/.cache/deckgen``), one
+file per key, sharded by the first two hex digits. Writes are atomic so
+concurrent builds can share a cache directory, and a write that fails
+(read-only or full disk) is skipped: ``put`` still returns the value.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+
+def default_cache_dir():
+    return os.environ.get("DECKGEN_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "deckgen")
+
+
+def file_mode(path):
+    """Permissions for a file about to replace ``path``: the current file's, else 0o666 less the umask.
+
+    ``tempfile.mkstemp`` creates files 0600; chmod them to this before the rename.
+    """
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def content_hash(data):
+    """sha256 hex digest of ``data`` (bytes or str)."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class JsonCache:
+    """A namespace of JSON values keyed by hex digest.
+
+    ``version`` is folded into the directory name, so bumping it when the
+    cached format changes invalidates old entries without touching them.
+    """
+
+    suffix = ".json"
+
+    def __init__(self, namespace, version=1, root=None):
+        self.root = os.path.join(root or default_cache_dir(), f"{namespace}-v{version}")
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key + self.suffix)
+
+    def get(self, key):
+        try:
+            with open(self.path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, value):
+        self._write(key, json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        return value
+
+    def _write(self, key, data):
+        # A cache only saves work: if the directory is unwritable or full, the value just isn't kept
+        path = self.path(key)
+        tmp = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException as exc:
+            if tmp is not None and os.path.exists(tmp):
+                os.unlink(tmp)
+            if not isinstance(exc, OSError):
+                raise
+
+
+class BlobCache(JsonCache):
+    """Like ``JsonCache``, for bytes (encoded images and the like)."""
+
+    suffix = ".bin"
+
+    def get(self, key):
+        try:
+            with open(self.path(key), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key, value):
+        self._write(key, value)
+        return value
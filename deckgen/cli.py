@@ -0,0 +1,384 @@
+"""Command line interface: ``python -m deckgen <command> ...``."""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+from .bench import DEFAULT_BASELINE
+from .decks import DECKS, default_output, load_spec
+
+DEFAULT_PALETTES = ("danyelza", "unituxin")
+
+
+def cmd_build(args):
+    spec = load_spec(args.deck)
+    if args.dump_spec:
+        json.dump(spec, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return 0
+
+    write_deck(spec, args.output or [default_output(args.deck)], args)
+    return 0
+
+
+def write_deck(spec, outputs, args):
+    """Build ``spec`` into every path in ``outputs``, incrementally or streamed if requested."""
+    start = time.perf_counter()
+    written = set(outputs)
+    if args.incremental:
+        from .incremental import rebuild_deck
+
+        before = os.stat(outputs[0]).st_mtime_ns if os.path.exists(outputs[0]) else None
+        rendered, reused = rebuild_deck(spec, outputs[0])
+        if os.stat(outputs[0]).st_mtime_ns == before:
+            written.discard(outputs[0])
+        for path in outputs[1:]:
+            shutil.copyfile(outputs[0], path)
+        slides = rendered + reused
+        summary = f"{rendered} rendered, {reused} reused"
+    elif args.stream:
+        from .stream import stream_deck
+
+        slides = stream_deck(spec, outputs[0])
+        for path in outputs[1:]:
+            shutil.copyfile(outputs[0], path)
+        summary = f"{slides} rendered, streamed"
+    else:
+        import io
+
+        from .builder import build_deck, save
+        from .diff import publish
+
+        prs = build_deck(spec)
+        buf = io.BytesIO()
+        save(prs, buf)
+        written = {path for path in outputs if publish(buf.getvalue(), path)}
+        slides = len(prs.slides)
+        summary = f"{slides} rendered"
+    if not args.quiet:
+        for path in outputs:
+            print(f"Presentation {'saved to' if path in written else 'unchanged'}: {path}")
+        print(f"Total slides: {slides} ({summary}, {time.perf_counter() - start:.2f}s)")
+
+
+def analysis_sources(values):
+    """``(path, palette)`` pairs for ``FILE[:PALETTE]`` arguments; palettes alternate by default."""
+    sources = []
+    for i, source in enumerate(values):
+        path, _, palette = source.rpartition(":") if ":" in source else (source, "", "")
+        sources.append((path, palette or DEFAULT_PALETTES[i % len(DEFAULT_PALETTES)]))
+    return sources
+
+
+def cmd_analysis(args):
+    from .markdown import analysis_spec
+
+    sources = analysis_sources(args.sources)
+    spec = analysis_spec(sources, title=args.title, subtitle=args.subtitle)
+    output = args.output or os.path.splitext(os.path.basename(sources[0][0]))[0] + ".pptx"
+    write_deck(spec, [output], args)
+    return 0
+
+
+def cmd_batch(args):
+    from .batch import load_manifest, run_batch
+
+    jobs, output_dir = load_manifest(args.manifest)
+    output_dir = args.output_dir or output_dir
+
+    def report(result):
+        if result["error"]:
+            print(f"FAIL  {result['name']}: {result['error'].strip().splitlines()[-1]}", file=sys.stderr)
+        elif not args.quiet:
+            state = "" if result["published"] else "  (unchanged)"
+            print(f"ok    {result['name']}  {result['slides']} slides  {result['seconds']:.2f}s{state}")
+
+    start = time.perf_counter()
+    results = run_batch(jobs, output_dir, workers=args.jobs, incremental=args.incremental, on_result=report)
+    elapsed = time.perf_counter() - start
+    failed = [r for r in results if r["error"]]
+    unchanged = sum(1 for r in results if not r["error"] and not r["published"])
+    print(f"{len(results) - len(failed)}/{len(results)} decks built in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.1f} decks/s), {unchanged} unchanged -> {output_dir}")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"seconds": round(elapsed, 4), "results": results}, f, indent=2)
+    return 1 if failed else 0
+
+
+def cmd_watch(args):
+    from .watch import analysis_target, deck_target, manifest_targets, watch
+
+    out = args.output_dir or "."
+    targets = []
+    for deck in args.decks:
+        targets.append(deck_target(deck, os.path.join(out, os.path.basename(default_output(deck)))))
+    for values in args.analysis or ():
+        sources = analysis_sources(values)
+        targets.append(analysis_target(sources, os.path.join(out, os.path.splitext(
+            os.path.basename(sources[0][0]))[0] + ".pptx")))
+    for manifest in args.manifest or ():
+        targets.extend(manifest_targets(manifest, args.output_dir))
+    if not targets:
+        raise ValueError("nothing to watch (give a deck, --analysis FILE... or --manifest FILE)")
+    os.makedirs(out, exist_ok=True)
+
+    built = 0
+    try:
+        for result in watch(targets, debounce=args.debounce, poll=args.poll):
+            if result["error"]:
+                print(f"FAIL  {result['name']}: {result['error'].strip().splitlines()[-1]}", file=sys.stderr)
+            elif result["latency"] is None:
+                if not args.quiet:
+                    print(f"built {result['name']}  {result['slides']} slides  {result['seconds']:.2f}s")
+            else:
+                changed = ", ".join(p if os.path.relpath(p).startswith("..") else os.path.relpath(p)
+                                    for p in result["changed"])
+                print(f"rebuilt {result['name']}  {result['rendered']} rendered, {result['reused']} reused  "
+                      f"{result['seconds'] * 1000:.0f} ms build, {result['latency'] * 1000:.0f} ms from change "
+                      f"({changed})", flush=True)
+            if result["latency"] is None:
+                built += 1
+                if built == len(targets) and not args.quiet:
+                    files = set().union(*(t.files for t in targets))
+                    print(f"watching {len(files)} files for {len(targets)} decks (Ctrl-C to stop)", flush=True)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_diff(args):
+    from .diff import diff_decks, diff_dirs, format_diff
+
+    if os.path.isdir(args.old) and os.path.isdir(args.new):
+        results = diff_dirs(args.old, args.new, workers=args.jobs, details=not args.brief)
+        if args.json:
+            json.dump(results, sys.stdout, indent=2, ensure_ascii=False)
+            sys.stdout.write("\n")
+        else:
+            for name, result in results.items():
+                if result["status"] == "changed" and not args.brief:
+                    print("\n".join(format_diff(result["diff"], name)))
+                elif result["status"] != "unchanged":
+                    print(f"{result['status']}: {name}")
+            counts = {s: sum(1 for r in results.values() if r["status"] == s)
+                      for s in ("changed", "added", "removed", "unchanged")}
+            print(", ".join(f"{n} {s}" for s, n in counts.items()) + " decks")
+        return 1 if any(r["status"] != "unchanged" for r in results.values()) else 0
+    if os.path.isdir(args.old) or os.path.isdir(args.new):
+        raise ValueError("compare two .pptx files or two directories")
+
+    diff = diff_decks(args.old, args.new)
+    if args.json:
+        json.dump(diff, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+    else:
+        lines = format_diff(diff, args.new)
+        print("\n".join(lines[:1] if args.brief else lines))
+    return 0 if diff["identical"] else 1
+
+
+def cmd_serve(args):
+    from .serve import run
+
+    if args.jobs is not None and args.jobs < 1:
+        raise ValueError("--jobs must be at least 1")
+    run(args.host, args.port, workers=args.jobs, max_pending=args.max_pending, cache_mb=args.cache_mb,
+        quiet=args.quiet)
+    return 0
+
+
+def cmd_bench_run(args):
+    from .bench import format_result, run_benchmarks, save_results
+
+    def report(name, result):
+        if not args.quiet:
+            print(format_result(name, result), flush=True)
+
+    document = run_benchmarks(repeat=args.repeat, select=args.select, on_result=report)
+    if args.output:
+        save_results(document, args.output)
+        print(f"{len(document['results'])} benchmarks saved to: {args.output}")
+    return 0
+
+
+def cmd_bench_compare(args):
+    from .bench import COMPARED, compare, load_results, run_benchmarks
+
+    baseline = load_results(args.baseline)
+    if args.current:
+        current = load_results(args.current)
+    else:
+        current = run_benchmarks(repeat=args.repeat, select=args.select)
+
+    rows = compare(baseline, current, args.tolerance)
+    regressed = [row for row in rows if row[2]]
+    for name, ratios, bad in rows:
+        flag = "REGRESSED" if bad else "ok"
+        print(f"{flag:<10} {name:<34} " + "  ".join(f"{m} x{ratios[m]:.2f}" for m in COMPARED))
+    missing = sorted(set(baseline["results"]) - set(current["results"]))
+    if missing and not args.select:
+        print(f"not run: {', '.join(missing)}")
+    print(f"{len(regressed)}/{len(rows)} benchmarks regressed beyond {args.tolerance:.0%}")
+    return 1 if regressed else 0
+
+
+def cmd_deals(args):
+    from .deals import DEALS_PATH, DealTable, format_value
+
+    table = DealTable.load(args.data or DEALS_PATH).filter(
+        buyer=args.buyer, modality=args.modality, indCat=args.indcat, year=args.year, q=args.quarter)
+    if args.group:
+        how = "sum" if args.sum else "mean" if args.mean else "count"
+        result = table.group(args.group, args.sum or args.mean, how)[:args.top]
+    else:
+        result = [table.rows[i] for i in table.top(args.top)]
+    if args.json:
+        json.dump(result, sys.stdout, indent=1, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return 0
+
+    if args.group:
+        for label, v in result:
+            print(f"{label:<34} {format_value(v) if how == 'sum' else v:>10}")
+        return 0
+    for d in result:
+        print(f"{d['year']} {d['q']}  {d['type']:<18} {d['buyer'][:22]:<22} {d['target'][:22]:<22} "
+              f"{d['modality']:<16} {format_value(d['totalVal']):>8}")
+    print(f"{len(result)} of {len(table)} matching deals")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="deckgen", description="Build company-profile decks.")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write per-slide and per-helper spans as a Chrome trace-event JSON file")
+    parser.add_argument("--profile", metavar="FILE", help="write a cProfile capture (.prof) of the command")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("build", help="build one deck")
+    p.add_argument("deck", nargs="?", default="anti-gd2",
+                   help=f"built-in deck ({', '.join(sorted(DECKS))}) or path to a JSON spec")
+    p.add_argument("-o", "--output", action="append",
+                   help="output .pptx path (repeat to write several copies)")
+    p.add_argument("--dump-spec", action="store_true", help="print the deck spec as JSON and exit")
+    p.add_argument("-i", "--incremental", action="store_true",
+                   help="re-render only slides that changed since the last build of the first output")
+    p.add_argument("--stream", action="store_true",
+                   help="write slides to the file as they are built (bounded memory for very large decks)")
+    p.add_argument("-q", "--quiet", action="store_true")
+    p.set_defaults(func=cmd_build)
+
+    p = commands.add_parser("analysis", help="build a deck from analysis markdown files")
+    p.add_argument("sources", nargs="+", metavar="FILE[:PALETTE]",
+                   help="analysis .md file, optionally with a palette name (danyelza, unituxin, ...)")
+    p.add_argument("-o", "--output", help="output .pptx path (default: first file name)")
+    p.add_argument("--title", help="deck title (default: drug names)")
+    p.add_argument("--subtitle")
+    p.add_argument("-i", "--incremental", action="store_true",
+                   help="re-render only slides that changed since the last build")
+    p.add_argument("--stream", action="store_true", help="write slides to the file as they are built")
+    p.add_argument("-q", "--quiet", action="store_true")
+    p.set_defaults(func=cmd_analysis)
+
+    p = commands.add_parser("watch", help="rebuild decks as their sources change")
+    p.add_argument("decks", nargs="*", metavar="DECK",
+                   help=f"built-in deck ({', '.join(sorted(DECKS))}), JSON spec or analysis .md file")
+    p.add_argument("-a", "--analysis", action="append", nargs="+", metavar="FILE[:PALETTE]",
+                   help="an analysis deck made of these markdown files (repeat for more decks)")
+    p.add_argument("-m", "--manifest", action="append", help="every deck in this batch manifest")
+    p.add_argument("-o", "--output-dir", help="where to write the decks (default: current directory, "
+                                              "or the manifest's output_dir)")
+    p.add_argument("--debounce", type=float, default=0.15, metavar="SECONDS",
+                   help="wait for this long without changes before rebuilding (default: 0.15)")
+    p.add_argument("--poll", type=float, metavar="SECONDS",
+                   help="poll file times at this interval instead of using inotify")
+    p.add_argument("-q", "--quiet", action="store_true", help="only report rebuilds and failures")
+    p.set_defaults(func=cmd_watch)
+
+    p = commands.add_parser("batch", help="build every deck in a manifest in parallel")
+    p.add_argument("manifest", help="JSON manifest of decks (see deckgen.batch)")
+    p.add_argument("-o", "--output-dir", help="override the manifest's output_dir")
+    p.add_argument("-j", "--jobs", type=int, help="worker processes (default: CPU count)")
+    p.add_argument("-i", "--incremental", action="store_true")
+    p.add_argument("--report", help="write per-deck timings and failures to this JSON file")
+    p.add_argument("-q", "--quiet", action="store_true", help="only report failures and the summary")
+    p.set_defaults(func=cmd_batch)
+
+    p = commands.add_parser("diff", help="what changed between two builds of a deck (exit status 1 if anything)")
+    p.add_argument("old", help="previous .pptx, or a directory of them")
+    p.add_argument("new", help="new .pptx, or a directory of them (decks are paired by relative path)")
+    p.add_argument("-b", "--brief", action="store_true", help="only report which decks / how many slides changed")
+    p.add_argument("-j", "--jobs", type=int, help="processes hashing decks when comparing directories "
+                                                  "(default: CPU count)")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_diff)
+
+    p = commands.add_parser("serve", help="render decks on request over HTTP (see deckgen.serve)")
+    p.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    p.add_argument("-p", "--port", type=int, default=8765, help="port to listen on (default: 8765)")
+    p.add_argument("-j", "--jobs", type=int, help="worker processes building decks (default: CPU count)")
+    p.add_argument("--max-pending", type=int, metavar="N",
+                   help="decks queued or building at once before answering 503 (default: 4 per worker)")
+    p.add_argument("--cache-mb", type=float, default=256, metavar="MB",
+                   help="memory for rendered decks, least recently used dropped first (default: 256)")
+    p.add_argument("-q", "--quiet", action="store_true", help="don't log requests")
+    p.set_defaults(func=cmd_serve)
+
+    p = commands.add_parser("deals", help="query the deals dataset (top deals, or --group totals)")
+    p.add_argument("--buyer")
+    p.add_argument("--modality")
+    p.add_argument("--indcat", help="indication category (Solid Tumors, Hematology, ...)")
+    p.add_argument("--year")
+    p.add_argument("--quarter", help="Q1..Q4")
+    p.add_argument("-g", "--group", metavar="FIELD", help="group matching deals by this field")
+    agg = p.add_mutually_exclusive_group()
+    agg.add_argument("--sum", metavar="FIELD", help="with --group: sum this field (default: count deals)")
+    agg.add_argument("--mean", metavar="FIELD", help="with --group: average this field")
+    p.add_argument("-n", "--top", type=int, default=10, help="rows to show (default: 10)")
+    p.add_argument("--json", action="store_true")
+    p.add_argument("--data", help="deals JSON file (default: data/oncology_deals.json)")
+    p.set_defaults(func=cmd_deals)
+
+    p = commands.add_parser("bench", help="benchmark the slide helpers and deck builds")
+    bench = p.add_subparsers(dest="bench_command", required=True)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-k", "--select", help="only run benchmarks whose name contains this")
+    common.add_argument("-r", "--repeat", type=int, default=5, help="timing rounds per benchmark")
+
+    p = bench.add_parser("run", parents=[common], help="run the benchmarks")
+    p.add_argument("-o", "--output", help="save results (e.g. a new baseline) to this JSON file")
+    p.add_argument("-q", "--quiet", action="store_true")
+    p.set_defaults(func=cmd_bench_run)
+
+    p = bench.add_parser("compare", parents=[common],
+                         help="flag regressions against a baseline (exit status 1 if any)")
+    p.add_argument("baseline", nargs="?", default=DEFAULT_BASELINE,
+                   help="baseline results JSON (default: benchmarks/baseline.json)")
+    p.add_argument("current", nargs="?", help="results JSON to check (default: run the benchmarks now)")
+    p.add_argument("-t", "--tolerance", type=float, default=0.25,
+                   help="allowed slowdown / memory growth as a fraction (default: 0.25)")
+    p.set_defaults(func=cmd_bench_compare)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        if args.trace or args.profile:
+            from .trace import tracing
+
+            with tracing(args.trace, args.profile):
+                return args.func(args)
+        return args.func(args)
+    except ValueError as exc:
+        print(f"deckgen: error: {exc}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""Columnar analytics over the oncology deals dataset (``data/oncology_deals.json``).
+
+``DealTable`` keeps the deals as NumPy columns: numeric fields as float
+arrays (``NaN`` for missing values), every other field dictionary-encoded
+on first use. Filters produce views that share those columns, so a query
+is a few array operations over the selected rows::
+
+    table = DealTable.load()
+    table.filter(modality="ADC", year=2024).group("buyer", "totalVal")
+    table.top(10)                            # biggest deals by totalVal
+
+Groupings return ``[(label, value), ...]`` ordered the way the dashboard's
+``groupSum`` / ``groupCount`` order them: by value, descending, ties in
+JavaScript object-key order. Labels are the keys the page would see
+(``"2024"``, not ``2024``).
+
+``snapshot`` computes every aggregate the deals dashboard and the comps
+deck show, computed once. ``load_snapshot`` caches it by the
+content of the data, both in memory and in the on-disk cache, so the page
+build (``python -m tools.bundle_data``) and the deck builds share one
+computation.
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+
+from .cache import JsonCache, content_hash
+
+DEALS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "oncology_deals.json")
+
+# Bump when ``snapshot`` changes shape or meaning
+SNAPSHOT_VERSION = 1
+
+# The dashboard's modality panels; some cover more than one modality
+MODALITY_GROUPS = {
+    "ADC": ("ADC",),
+    "Bispecific/Trispecific": ("Bispecific", "Trispecific"),
+    "Radioligand": ("Radioligand",),
+    "Protein Degrader": ("Protein Degrader",),
+    "Cell Therapy": ("Cell Therapy",),
+}
+
+_snapshots = {}
+
+
+def js_key(value):
+    """``String(value)``, i.e. the key ``value`` becomes in a JavaScript object."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _key_order(label):
+    # Object.entries order: array-index keys ascending, then the rest as inserted
+    return (0, int(label)) if label.isdigit() and len(label) < 10 else (1, 0)
+
+
+def js_round(x):
+    """``Math.round``: halves round up."""
+    return int(math.floor(x + 0.5))
+
+
+def format_value(n):
+    """The page's ``fmtB``: ``$850M``, ``$43.0B``, ``—`` when missing."""
+    if n is None:
+        return "—"
+    return f"${n / 1000:.1f}B" if n >= 1000 else f"${_number(n)}M"
+
+
+def js_sorted(values):
+    """``[...].sort()`` with no comparator: by string value, in UTF-16 code units."""
+    return sorted(values, key=lambda v: js_key(v).encode("utf-16-be"))
+
+
+class DealTable:
+    """The deals as columns, or a filtered view of them."""
+
+    def __init__(self, rows, _columns=None, _index=None):
+        self.rows = rows
+        self._columns = {} if _columns is None else _columns
+        self.index = np.arange(len(rows)) if _index is None else _index
+
+    @classmethod
+    def load(cls, path=DEALS_PATH):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.index)
+
+    def records(self):
+        """The selected rows (dicts), in table order."""
+        return [self.rows[i] for i in self.index]
+
+    # --- columns (computed once for the whole table, then sliced) ---
+
+    def _check(self, field):
+        if self.rows and field not in self.rows[0]:
+            raise ValueError(f"unknown deal field {field!r} (fields: {', '.join(self.rows[0])})")
+
+    def _numeric(self, field):
+        key = ("num", field)
+        if key not in self._columns:
+            self._check(field)
+            self._columns[key] = np.array([np.nan if r.get(field) is None else r[field] for r in self.rows],
+                                          dtype=np.float64)
+        return self._columns[key]
+
+    def _encoded(self, field):
+        key = ("codes", field)
+        if key not in self._columns:
+            self._check(field)
+            labels = {}
+            codes = np.fromiter((labels.setdefault(js_key(r.get(field)), len(labels)) for r in self.rows),
+                                dtype=np.int64, count=len(self.rows))
+            self._columns[key] = (codes, list(labels))
+        return self._columns[key]
+
+    def values(self, field):
+        """Float array of a numeric field over the selected rows (``NaN`` where missing)."""
+        return self._numeric(field)[self.index]
+
+    def codes(self, field):
+        """``(codes, labels)`` of a field over the selected rows; ``labels[code]`` is the page key."""
+        codes, labels = self._encoded(field)
+        return codes[self.index], labels
+
+    # --- queries ---
+
+    def where(self, mask):
+        """View of the selected rows where ``mask`` (a boolean array over them) is true."""
+        return DealTable(self.rows, self._columns, self.index[np.asarray(mask, dtype=bool)])
+
+    def filter(self, **criteria):
+        """View of the rows matching every criterion: ``field=value`` or ``field=[values]``.
+
+        Values match like the page's filters (``year="2024"`` finds 2024).
+        ``None`` criteria are ignored.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for field, wanted in criteria.items():
+            if wanted is None:
+                continue
+            if isinstance(wanted, (str, int, float)):
+                wanted = (wanted,)
+            codes, labels = self.codes(field)
+            keep = {js_key(w) for w in wanted}
+            mask &= np.isin(codes, [k for k, label in enumerate(labels) if label in keep])
+        return self.where(mask)
+
+    def group(self, key, value=None, how=None):
+        """``[(label, value), ...]`` per distinct ``key``, largest first.
+
+        With no ``value`` field this counts rows (``groupCount``). With one,
+        ``how="sum"`` (the default) adds it up, treating missing values as 0
+        (``groupSum``). ``how="mean"`` averages the rows that have it,
+        rounded like ``avgByGroup``.
+        """
+        how = how or ("sum" if value else "count")
+        codes, labels = self.codes(key)
+        n = len(labels)
+        counted = codes                          # the rows that make a group appear
+        if how == "count":
+            result = np.bincount(codes, minlength=n)
+        else:
+            vals = self.values(value)
+            has = ~np.isnan(vals)
+            sums = np.bincount(codes, weights=np.where(has, vals, 0.0), minlength=n)
+            if how == "sum":
+                result = sums
+            elif how == "mean":
+                counted = codes[has]
+                result = [js_round(s / c) if c else 0 for s, c in zip(sums, np.bincount(counted, minlength=n))]
+            else:
+                raise ValueError(f"unknown aggregate {how!r} (expected count, sum or mean)")
+        first = np.full(n, len(counted))
+        np.minimum.at(first, counted, np.arange(len(counted)))
+        groups = sorted((k for k in range(n) if first[k] < len(counted)),
+                        key=lambda k: (_key_order(labels[k]), first[k]))
+        groups.sort(key=lambda k: -result[k])
+        return [(labels[k], _number(result[k])) for k in groups]
+
+    def top(self, n=10, by="totalVal"):
+        """Indexes (into ``rows``) of the ``n`` largest rows by ``by``, skipping missing and zero values."""
+        vals = self.values(by)
+        keep = np.flatnonzero(~np.isnan(vals) & (vals != 0))
+        order = keep[np.argsort(-vals[keep], kind="stable")]
+        return [int(i) for i in self.index[order[:n]]]
+
+    def total(self, field):
+        return _number(np.nansum(self.values(field)))
+
+    def facet(self, field):
+        """Distinct values of ``field`` in the page's menu order."""
+        return js_sorted({self.rows[i].get(field) for i in self.index})
+
+
+def _number(x):
+    x = float(x)
+    return int(x) if x.is_integer() else x
+
+
+def snapshot(table):
+    """Every aggregate the deals dashboard and comps deck use, as plain JSON.
+
+    Deals are referred to by their index in the dataset, the order the page's
+    ``DEALS`` array has.
+    """
+    ma = table.filter(type="M&A")
+    lic = table.filter(type="Licensing")
+    china = table.filter(country="China")
+    biomarker = table.filter(biomarker="Yes")
+
+    buyers = []
+    for buyer, spend in table.group("buyer", "totalVal")[:15]:
+        deals = table.filter(buyer=buyer)
+        valued = int(np.count_nonzero(np.nan_to_num(deals.values("totalVal"))))
+        rows = deals.records()
+        buyers.append({
+            "buyer": buyer, "deals": len(deals), "totalVal": spend,
+            "avg": js_round(spend / valued) if valued else 0,
+            "modalities": list(dict.fromkeys(r["modality"] for r in rows)),
+            "targets": [r["target"] for r in rows],
+        })
+
+    # Deals with milestones on top of the upfront, lowest upfront share first
+    total, upfront = np.nan_to_num(table.values("totalVal")), np.nan_to_num(table.values("upfront"))
+    structured = np.flatnonzero((upfront != 0) & (total > upfront))
+    share = upfront[structured] / total[structured]
+    order = structured[np.argsort(share, kind="stable")][:12]
+
+    lic_valued = int(np.count_nonzero(np.nan_to_num(lic.values("totalVal"))))
+    return {
+        "version": SNAPSHOT_VERSION,
+        "totals": {
+            "deals": len(table),
+            "totalVal": table.total("totalVal"),
+            "upfront": table.total("upfront"),
+            "ma": {"deals": len(ma), "avg": js_round(ma.total("totalVal") / len(ma)) if len(ma) else 0},
+            "licensing": {"deals": len(lic),
+                          "avg": js_round(lic.total("totalVal") / lic_valued) if lic_valued else 0},
+        },
+        "facets": {f: table.facet(f) for f in ("year", "type", "modality", "indCat", "phase", "country")},
+        "count": {f: table.group(f) for f in ("year", "q", "type", "modality", "buyer", "platform")},
+        "value": {f: table.group(f, "totalVal") for f in ("year", "type", "modality", "buyer")},
+        "quarter": [(f"{year} {q}", count) for year, q, count in _quarters(table)],
+        "avgUpfront": {"type": table.group("type", "upfront", how="mean")},
+        "countByYear": {"M&A": ma.group("year"), "Licensing": lic.group("year")},
+        "biomarkerByModality": biomarker.group("modality"),
+        "top": {"all": table.top(10),
+                **{name: table.filter(modality=mods).top(10) for name, mods in MODALITY_GROUPS.items()}},
+        "buyers": buyers,
+        "china": {"deals": [int(i) for i in china.index], "totalVal": china.total("totalVal"),
+                  "modality": china.group("modality"), "buyer": china.group("buyer", "totalVal")},
+        "upfrontShare": [(int(table.index[k]), js_round(upfront[k] / total[k] * 100)) for k in order],
+    }
+
+
+def _quarters(table):
+    """``(year, quarter, deals)`` in calendar order."""
+    years, year_labels = table.codes("year")
+    qs, q_labels = table.codes("q")
+    pairs = years * len(q_labels) + qs
+    counts = np.bincount(pairs, minlength=len(year_labels) * len(q_labels))
+    out = [(year_labels[k // len(q_labels)], q_labels[k % len(q_labels)], int(c))
+           for k, c in enumerate(counts) if c]
+    return sorted(out, key=lambda t: (_key_order(t[0]), t[0], t[1]))
+
+
+def snapshot_for_rows(rows, cache=None):
+    """``snapshot`` of ``rows``, cached by their content."""
+    key = content_hash(json.dumps(rows, sort_keys=True, ensure_ascii=False))
+    if key in _snapshots:
+        return _snapshots[key]
+    cache = JsonCache("deals-snapshot", SNAPSHOT_VERSION) if cache is None else cache
+    value = cache.get(key)
+    if value is None:
+        value = cache.put(key, snapshot(DealTable(rows)))
+        value = json.loads(json.dumps(value))        # tuples -> lists, as a cache hit returns them
+    _snapshots[key] = value
+    return value
+
+
+def load_snapshot(path=DEALS_PATH, cache=None):
+    """The (cached) snapshot of the deals file at ``path``."""
+    with open(path, encoding="utf-8") as f:
+        return snapshot_for_rows(json.load(f), cache)
@@ -0,0 +1,31 @@
+"""Built-in deck specs, addressable by name from the CLI."""
+
+import importlib
+import json
+import os
+
+DECKS = {
+    "anti-gd2": "deckgen.decks.anti_gd2",
+    "deal-comps": "deckgen.decks.deal_comps",
+}
+
+
+def load_spec(name_or_path):
+    """Return the spec for a built-in deck name, a JSON spec file or an analysis .md file."""
+    if name_or_path in DECKS:
+        return importlib.import_module(DECKS[name_or_path]).SPEC
+    if name_or_path.endswith(".md") and os.path.exists(name_or_path):
+        from ..markdown import analysis_spec
+
+        return analysis_spec([(name_or_path, "danyelza")])
+    if os.path.exists(name_or_path):
+        with open(name_or_path, encoding="utf-8") as f:
+            return json.load(f)
+    raise ValueError(f"unknown deck {name_or_path!r} (built-in decks: {', '.join(sorted(DECKS))})")
+
+
+def default_output(name_or_path):
+    """Default .pptx file name for a deck."""
+    if name_or_path in DECKS:
+        return importlib.import_module(DECKS[name_or_path]).OUTPUT_NAME
+    return os.path.splitext(os.path.basename(name_or_path))[0] + ".pptx"
@@ -0,0 +1,370 @@
+"""Company profiles: Danyelza (Y-mAbs / SERB) and Unituxin (United Therapeutics).
+
+Revenue figures are entered once below; growth, CAGR and the revenue charts
+are computed from them (see ``deckgen.metrics``).
+"""
+
+from ..metrics import MetricSeries, chart_block, growth_labels, summarize
+from ..palette import DANYELZA, DARK_GRAY, MED_GRAY, UNITUXIN
+
+OUTPUT_NAME = "Danyelza_vs_Unituxin_Analysis.pptx"
+
+# Period, net revenue, growth where it can't be computed from the rows here, notes
+DANYELZA_REVENUE = [
+    ("2021", "$34.9M", "—", "Launch year (product: $32.9M + licensing: $2.0M)"),
+    ("2022", "~$49.3M", None, "Record Q4 at $16.4M (+31% sequential)"),
+    ("2023", "$84.3M", None, "Record year; strong international expansion"),
+    ("2024", "$87.7M", None, "International revenue $19.2M (+16% YoY)"),
+    ("Q1 2025", "$20.9M", "+8% YoY", "—"),
+    ("Q2 2025", "$19.5M", "Above guidance", "Exceeded $17–19M guidance range"),
+]
+
+# Year, estimated revenue, notes
+UNITUXIN_REVENUE = [
+    ("2015", "~$12–20M", "Partial year (approved March)"),
+    ("2016", "~$30–40M", "Early commercial ramp"),
+    ("2017", "~$50–60M", "+$13.5M YoY growth; approaching peak range"),
+    ("2018", "~$50–60M", "Stable; peak annual level"),
+    ("2024", "Still marketed", "Revenue growth from price increases"),
+]
+
+danyelza_revenue = MetricSeries.parse([(p, v) for p, v, _, _ in DANYELZA_REVENUE], "Net Revenue")
+unituxin_revenue = MetricSeries.parse([(p, v) for p, v, _ in UNITUXIN_REVENUE], "Estimated Revenue")
+danyelza_summary, unituxin_summary = summarize([danyelza_revenue, unituxin_revenue])
+
+
+def growth_span(series, summary):
+    """The yearly span the CAGR covers, formatted (``first``, ``last``, ``start``, ``end``, ``cagr``), or None."""
+    if summary["cagr"] is None:
+        return None
+    annual = series.select("Y")
+    by_year = dict(zip(annual.start.astype(int).tolist(), annual.mid.tolist()))
+    first, last = summary["first"], summary["last"]
+    return {"first": first, "last": last, "start": f"~${by_year[first]:.0f}M", "end": f"~${by_year[last]:.0f}M",
+            "cagr": f"{round(summary['cagr'] * 100)}%"}
+
+
+danyelza_growth = growth_span(danyelza_revenue, danyelza_summary)
+unituxin_growth = growth_span(unituxin_revenue, unituxin_summary)
+
+SPEC = {
+    "title": "Anti-GD2 Monoclonal Antibodies in Neuroblastoma",
+    "slides": [
+        # ================================================================
+        # SLIDE 1: GENERAL TITLE
+        # ================================================================
+        {
+            "layout": "title",
+            "palette": "danyelza",
+            "title": "Anti-GD2 Monoclonal Antibodies\nin Neuroblastoma",
+            "subtitle": "Company Profiles: Danyelza (Y-mAbs / SERB)  &  Unituxin (United Therapeutics)",
+        },
+
+        # ================================================================
+        #  PART 1 — DANYELZA / Y-mAbs  (slides 2–7)
+        # ================================================================
+
+        # --- SLIDE 2: Danyelza section cover ---
+        {
+            "layout": "cover",
+            "palette": "danyelza",
+            "title": "DANYELZA (Naxitamab-gqgk)",
+            "company": "Y-mAbs Therapeutics  /  SERB Pharmaceuticals",
+            "tagline": "Humanized anti-GD2 monoclonal antibody (hu3F8) for relapsed/refractory high-risk neuroblastoma",
+        },
+
+        # --- SLIDE 3: Danyelza — Overview ---
+        {
+            "palette": "danyelza",
+            "title": "DANYELZA  |  Overview",
+            "blocks": [
+                {"type": "table", "col_widths": [2.8, 9.5], "rows": [
+                    ["Parameter", "Details"],
+                    ["Generic Name", "Naxitamab-gqgk"],
+                    ["Brand Name", "Danyelza"],
+                    ["Type", "Humanized anti-GD2 monoclonal antibody (hu3F8)"],
+                    ["Target", "GD2 (disialoganglioside)"],
+                    ["Indication", "Relapsed/refractory high-risk neuroblastoma (in combination with GM-CSF)"],
+                    ["FDA Approval", "November 25, 2020 (accelerated approval)"],
+                    ["Original Developer", "Memorial Sloan Kettering Cancer Center (Dr. Nai-Kong Cheung)"],
+                    ["Commercializer", "Y-mAbs Therapeutics (2015–2025) → SERB Pharmaceuticals (acquired Sept 2025)"],
+                    ["Developed In-House?", "NO — Academic (MSK) developed, licensed to Y-mAbs"],
+                    ["FDA Designations", "Accelerated Approval, Breakthrough Therapy, Priority Review,\n"
+                                         "Orphan Drug, Rare Pediatric Disease, PRV (sold)"],
+                ]},
+            ],
+        },
+
+        # --- SLIDE 4: Danyelza — Development History ---
+        {
+            "palette": "danyelza",
+            "title": "DANYELZA  |  Development History",
+            "subtitle": "30+ years of translational research at Memorial Sloan Kettering",
+            "blocks": [
+                {"type": "table", "col_widths": [2.0, 10.3], "rows": [
+                    ["Period", "Milestone"],
+                    ["1980s", "Dr. Nai-Kong Cheung develops murine anti-GD2 antibody 3F8 at MSK"],
+                    ["Mid-1980s", "Clinical trials of 3F8 begin at MSK"],
+                    ["1990s–2000s", "Extensive clinical experience with 3F8 in hundreds of neuroblastoma patients"],
+                    ["2000s–2010s", "Development of humanized version hu3F8 (naxitamab) to reduce immunogenicity"],
+                    ["2015", "Y-mAbs Therapeutics founded to commercialize MSK anti-GD2 portfolio"],
+                    ["Sept 2018", "Y-mAbs IPO on Nasdaq (~$86M raised at ~$14/share)"],
+                    ["Nov 25, 2020", "FDA accelerated approval of Danyelza"],
+                    ["Aug 2025", "SERB Pharmaceuticals agrees to acquire Y-mAbs"],
+                    ["Sept 16, 2025", "SERB acquisition closes; Y-mAbs delisted from Nasdaq"],
+                ]},
+                {"type": "bullets", "top": 6.0, "height": 1.2, "font_size": 13, "color": MED_GRAY, "items": [
+                    "Pivotal Study 201 (hu3F8 + GM-CSF) conducted at MSK — demonstrated efficacy in relapsed/refractory patients",
+                    "3F8 (murine, never commercially approved) → hu3F8 (humanized, lower immunogenicity, more durable treatment)",
+                ]},
+            ],
+        },
+
+        # --- SLIDE 5: Danyelza — Y-mAbs Company Profile ---
+        {
+            "palette": "danyelza",
+            "title": "DANYELZA  |  Y-mAbs Therapeutics — Company Profile",
+            "subtitle": "The commercializing company before SERB acquisition",
+            "blocks": [
+                {"type": "table", "col_widths": [2.8, 9.5], "rows": [
+                    ["Parameter", "Details"],
+                    ["Founded", "2015 by Thomas Gad (Danish entrepreneur)"],
+                    ["Incorporated", "Delaware, USA"],
+                    ["Purpose", "Created specifically to commercialize Dr. Cheung's MSK anti-GD2 portfolio"],
+                    ["IPO", "September 28, 2018 — Nasdaq (YMAB), ~$14/share, ~$86M raised"],
+                    ["Stage at IPO", "Clinical-stage, pre-revenue, no approved products"],
+                    ["Manufacturing", "Via contract manufacturing organizations (CMOs)"],
+                    ["Key Assets", "Naxitamab (Danyelza), Omburtamab (8H9, anti-B7-H3), murine 3F8"],
+                    ["Value Proposition", "MSK-licensed assets + Dr. Cheung's 30+ year clinical track record"],
+                ]},
+                {"type": "bullets", "top": 5.5, "height": 1.5, "font_size": 13, "color": MED_GRAY, "items": [
+                    "Classic academic spinout / biotech startup — pre-revenue, cash-burning, small team",
+                    "Entire company built around Danyelza as the core commercial asset",
+                    "License from MSK: exclusive worldwide rights to naxitamab, 3F8, and omburtamab",
+                    "IP: patents covering humanized 3F8 (composition of matter, methods of use); Dr. Cheung as inventor",
+                ]},
+            ],
+        },
+
+        # --- SLIDE 6: Danyelza — Revenue & Commercial ---
+        {
+            "palette": "danyelza",
+            "title": "DANYELZA  |  Revenue & Commercial Performance",
+            "subtitle": "Strong growth trajectory since 2021 launch",
+            "blocks": [
+                {"type": "table", "width": 7.9, "col_widths": [1.1, 1.5, 1.5, 3.8], "rows": [
+                    ["Year", "Net Revenue", "YoY Growth", "Notes"],
+                    *[[period, revenue, growth, notes] for (period, revenue, _, notes), growth in zip(
+                        DANYELZA_REVENUE, growth_labels(danyelza_revenue, [g for _, _, g, _ in DANYELZA_REVENUE]))],
+                ]},
+                chart_block(danyelza_revenue, left=8.7, top=1.5, width=4.1, height=3.4),
+                {"type": "bullets", "top": 5.2, "height": 2.0, "font_size": 14, "color": DARK_GRAY, "items": [
+                    *([f"Revenue grew from {g['start']} to {g['end']} in {g['last'] - g['first']} years "
+                       f"({g['first']}–{g['last']}), a {g['cagr']} CAGR" for g in [danyelza_growth] if g]),
+                    "International expansion is a key growth driver (~$19.2M in 2024, +16% YoY)",
+                    "H1 2025 revenue: $40.4M — on track for continued growth under SERB ownership",
+                ]},
+            ],
+        },
+
+        # --- SLIDE 7: Danyelza — Valuation & Acquisition ---
+        {
+            "palette": "danyelza",
+            "title": "DANYELZA  |  Valuation & SERB Acquisition",
+            "subtitle": "From IPO to acquisition — the Y-mAbs trajectory",
+            "blocks": [
+                {"type": "table", "col_widths": [2.5, 2.2, 2.2, 5.4], "rows": [
+                    ["Period", "Price Range", "Market Cap", "Event"],
+                    ["IPO (Sept 2018)", "~$14/share", "~$400–500M", "Clinical-stage launch on Nasdaq"],
+                    ["2019–2020", "Rising", "Growing", "Positive clinical data, BLA filing"],
+                    ["Peak (~2020)", "~$40–55+/share", "~$1.5–2.0B", "FDA approval euphoria"],
+                    ["2021–2023", "$3–10/share", "$100–400M", "Commercial disappointment, omburtamab CRL,\n"
+                                                             "biotech downturn"],
+                    ["52-wk range (2024–25)", "$3.55–$16.11", "—", "Volatile trading"],
+                    ["Acquisition (Aug 2025)", "$8.60/share", "~$412M", "SERB buyout at 105% premium"],
+                ]},
+                {"type": "bullets", "top": 5.3, "height": 2.0, "font_size": 14, "color": DARK_GRAY, "items": [
+                    "SERB acquisition: $8.60/share cash (~$412M total), 105% premium over pre-announcement price",
+                    "~16% of stockholders entered tender and support agreement",
+                    "Y-mAbs now operates as subsidiary of SERB S.A.S.; delisted from Nasdaq Sept 16, 2025",
+                    "Classic biotech boom-and-bust: peak ~$2B market cap → acquired at ~$412M",
+                ]},
+            ],
+        },
+
+        # ================================================================
+        #  PART 2 — UNITUXIN / United Therapeutics  (slides 8–13)
+        # ================================================================
+
+        # --- SLIDE 8: Unituxin section cover ---
+        {
+            "layout": "cover",
+            "palette": "unituxin",
+            "title": "UNITUXIN (Dinutuximab)",
+            "company": "United Therapeutics Corporation",
+            "tagline": "Chimeric anti-GD2 monoclonal antibody (ch14.18) for high-risk neuroblastoma",
+        },
+
+        # --- SLIDE 9: Unituxin — Overview ---
+        {
+            "palette": "unituxin",
+            "title": "UNITUXIN  |  Overview",
+            "blocks": [
+                {"type": "table", "col_widths": [2.8, 9.5], "rows": [
+                    ["Parameter", "Details"],
+                    ["Generic Name", "Dinutuximab"],
+                    ["Brand Name", "Unituxin"],
+                    ["Type", "Chimeric anti-GD2 monoclonal antibody (ch14.18)"],
+                    ["Target", "GD2 (disialoganglioside)"],
+                    ["Indication", "High-risk neuroblastoma (pediatric, frontline post-consolidation)"],
+                    ["Combination", "GM-CSF + IL-2 + isotretinoin"],
+                    ["FDA Approval", "March 10, 2015"],
+                    ["Current Owner", "United Therapeutics (U.S.); Recordati/EUSA Pharma (EU — Qarziba)"],
+                    ["Developed In-House?", "NO — Government/academic (NCI, COG, Scripps, UCSD)"],
+                    ["FDA Designations", "Priority Review, Breakthrough Therapy, Orphan Drug,\n"
+                                         "Rare Pediatric Disease, PRV ($67–350M historical value)"],
+                ]},
+            ],
+        },
+
+        # --- SLIDE 10: Unituxin — Development History ---
+        {
+            "palette": "unituxin",
+            "title": "UNITUXIN  |  Development History",
+            "subtitle": "Government & academic-driven development through NCI and COG",
+            "blocks": [
+                {"type": "table", "col_widths": [2.0, 10.3], "rows": [
+                    ["Period", "Milestone"],
+                    ["1980s", "Dr. Ralph Reisfeld develops murine anti-GD2 antibody 14.18 at Scripps Research Institute"],
+                    ["Late 1980s–90s", "Chimeric ch14.18 engineered; Dr. Alice Yu (UCSD) advances clinical development"],
+                    ["2000s", "NCI funds research, manufactures antibody via Biologics Resources Branch, sponsors IND via CTEP"],
+                    ["2006–2010", "Pivotal ANBL0032 Phase III trial by COG across 200+ children's hospitals"],
+                    ["2010", "Yu et al. publish landmark results in NEJM — significant OS/EFS improvement"],
+                    ["March 10, 2015", "FDA approves dinutuximab as Unituxin"],
+                    ["2017", "United Therapeutics withdraws Unituxin from EU market (manufacturing difficulties)"],
+                ]},
+                {"type": "bullets", "top": 5.7, "height": 1.5, "font_size": 13, "color": MED_GRAY, "items": [
+                    "Pivotal ANBL0032: ch14.18 + GM-CSF + IL-2 + isotretinoin vs. isotretinoin alone — significant OS/EFS benefit",
+                    "Rare example of a drug developed almost entirely through government and academic effort, then licensed to a private company",
+                    "EU gap filled by Qarziba (dinutuximab beta) — Apeiron → EUSA Pharma → Recordati ($845M acquisition, 2021)",
+                ]},
+            ],
+        },
+
+        # --- SLIDE 11: Unituxin — United Therapeutics Company Profile ---
+        {
+            "palette": "unituxin",
+            "title": "UNITUXIN  |  United Therapeutics — Company Profile",
+            "subtitle": "The commercializing company — an established PAH leader",
+            "blocks": [
+                {"type": "table", "col_widths": [3.0, 9.3], "rows": [
+                    ["Parameter", "Details"],
+                    ["Founded", "1996 by Martine Rothblatt"],
+                    ["Motivation", "Daughter diagnosed with pulmonary arterial hypertension (PAH)"],
+                    ["Core Business", "PAH treatments (Remodulin, Tyvaso, Orenitram, Adcirca)"],
+                    ["Annual Revenue (~2015)", "~$1.4–1.6 billion"],
+                    ["Market Cap (~2015)", "~$6–8 billion"],
+                    ["Financial Health", "Solidly profitable, strong cash reserves, no debt concerns"],
+                    ["Pipeline", "Xenotransplantation (genetically modified pig organs)"],
+                    ["Current Market Cap (2025)", "~$14+ billion (driven by Tyvaso + xenotransplantation)"],
+                ]},
+                {"type": "bullets", "top": 5.5, "height": 1.5, "font_size": 13, "color": MED_GRAY, "items": [
+                    "Unituxin was a small, complementary diversification into oncology — NOT a transformational asset",
+                    "Commercial rights obtained from NCI under a CRADA (Cooperative Research & Development Agreement)",
+                    "Government-to-private technology transfer — not a traditional M&A deal",
+                    "NCI license terms: upfront fees, milestone payments, royalties on net sales back to NIH/NCI",
+                ]},
+            ],
+        },
+
+        # --- SLIDE 12: Unituxin — Revenue & Commercial ---
+        {
+            "palette": "unituxin",
+            "title": "UNITUXIN  |  Revenue & Commercial Performance",
+            "subtitle": "Small orphan product in a niche market",
+            "blocks": [
+                {"type": "table", "width": 7.9, "col_widths": [1.1, 1.9, 4.9], "rows": [
+                    ["Year", "Estimated Revenue", "Notes"],
+                    *[list(row) for row in UNITUXIN_REVENUE],
+                ]},
+                chart_block(unituxin_revenue, left=8.7, top=1.5, width=4.1, height=2.8),
+                {"type": "bullets", "top": 4.5, "height": 2.5, "font_size": 14, "color": DARK_GRAY, "items": [
+                    "Launch price: ~$175,000 per course of treatment",
+                    "Addressable population: ~700–800 new high-risk neuroblastoma patients/year in U.S., only a subset eligible",
+                    "Peak annual U.S. sales: ~$50–60M — small by pharma standards but significant for neuroblastoma community"
+                    + "".join(f" (~{g['cagr']} CAGR {g['first']}–{g['last']} on range midpoints)"
+                              for g in [unituxin_growth] if g),
+                    "Competition from Danyelza (approved 2020) created additional commercial pressure",
+                    "PRV voucher (historically valued at $67–350M) potentially had more standalone financial value than Unituxin sales",
+                ]},
+            ],
+        },
+
+        # --- SLIDE 13: Unituxin — Valuation Impact ---
+        {
+            "palette": "unituxin",
+            "title": "UNITUXIN  |  Valuation Impact on United Therapeutics",
+            "subtitle": "Modest impact on an established, profitable company",
+            "blocks": [
+                {"type": "bullets", "top": 1.6, "height": 5.5, "font_size": 16, "color": DARK_GRAY, "spacing": 14, "items": [
+                    "Stock traded ~$160–180/share around FDA approval (March 2015) — no dramatic movement attributable to Unituxin",
+                    "Market had largely priced in the approval given strong Phase III clinical data and orphan drug status",
+                    "PAH franchise (Remodulin, Tyvaso, Orenitram) was always the dominant value driver",
+                    "PRV voucher potentially had more standalone financial value than Unituxin's sales projections",
+                    "Unituxin never became a material valuation driver for United Therapeutics",
+                    "Current state (2025): UTHR market cap ~$14+ billion — driven by Tyvaso growth and xenotransplantation pipeline",
+                    "Unituxin remains a minor, steady contributor to overall revenue",
+                ]},
+                # EU sub-section
+                {"type": "text", "top": 5.0, "text": "EU Market", "font_size": 18,
+                 "color": UNITUXIN.primary, "bold": True},
+                {"type": "bullets", "top": 5.4, "height": 1.8, "font_size": 14, "color": MED_GRAY, "items": [
+                    "Unituxin withdrawn from EU in 2017 due to manufacturing difficulties",
+                    "Gap filled by Qarziba (dinutuximab beta) — Recordati via EUSA Pharma acquisition ($845M, 2021)",
+                    "Recordati targets peak Qarziba sales at €300–350M",
+                ]},
+            ],
+        },
+
+        # --- SLIDE 14: Key Scientists ---
+        {
+            "palette": "neutral",
+            "title": "Key Scientists & Institutions",
+            "subtitle": "The researchers behind anti-GD2 immunotherapy in neuroblastoma",
+            "blocks": [
+                # Danyelza scientists
+                {"type": "text", "top": 1.5, "width": 6, "text": "DANYELZA", "font_size": 18,
+                 "color": DANYELZA.primary, "bold": True},
+                {"type": "table", "top": 2.0, "palette": "danyelza", "col_widths": [2.8, 3.5, 6.0], "rows": [
+                    ["Scientist", "Institution", "Role"],
+                    ["Dr. Nai-Kong Cheung", "Memorial Sloan Kettering", "Developed 3F8 & hu3F8 (naxitamab);\n"
+                                                                         "30+ years of anti-GD2 research"],
+                ]},
+                # Unituxin scientists
+                {"type": "text", "top": 3.3, "width": 6, "text": "UNITUXIN", "font_size": 18,
+                 "color": UNITUXIN.primary, "bold": True},
+                {"type": "table", "top": 3.8, "palette": "unituxin", "col_widths": [2.8, 3.5, 6.0], "rows": [
+                    ["Scientist", "Institution", "Role"],
+                    ["Dr. Ralph Reisfeld", "Scripps Research Institute", "Developed original murine 14.18 antibody"],
+                    ["Dr. Alice Yu", "UCSD / Rady Children's", "Central clinical investigator;\n"
+                                                              "led pivotal ANBL0032 Phase III trial (NEJM 2010)"],
+                    ["Dr. Katherine Matthay", "UCSF Benioff Children's", "Senior COG neuroblastoma investigator"],
+                    ["Dr. John Maris", "CHOP / UPenn", "Leading neuroblastoma biologist"],
+                    ["Dr. Stephen Gillies", "—", "Antibody-cytokine fusion proteins"],
+                    ["NCI CTEP Officers", "NCI, Bethesda, MD", "Managed IND and clinical development"],
+                ]},
+            ],
+        },
+
+        # ================================================================
+        # SLIDE 15: CLOSING
+        # ================================================================
+        {
+            "layout": "closing",
+            "palette": "danyelza",
+            "title": "Thank You",
+            "subtitle": "Anti-GD2 Monoclonal Antibodies in Neuroblastoma\n"
+                        "Danyelza (Y-mAbs / SERB)  &  Unituxin (United Therapeutics)",
+        },
+    ],
+}
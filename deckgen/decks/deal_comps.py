@@ -0,0 +1,147 @@
+"""Oncology deal comparables, generated from the deals dataset.
+
+Every table comes from ``deckgen.deals.load_snapshot``, the same cached
+snapshot the deals dashboard is built from, so the deck and the page agree
+and are updated by editing ``data/oncology_deals.json``.
+"""
+
+from ..deals import DEALS_PATH, DealTable, format_value, snapshot_for_rows
+from ..palette import DARK_GRAY
+
+OUTPUT_NAME = "Oncology_Deal_Comps.pptx"
+
+# Data the spec is computed from (``deckgen.watch`` rebuilds the deck when it changes)
+SOURCES = (DEALS_PATH,)
+
+
+def deal_row(deal):
+    return [str(deal["year"]), deal["q"], deal["type"], deal["buyer"], deal["target"], deal["modality"],
+            format_value(deal["totalVal"]), format_value(deal["upfront"])]
+
+
+def comps_spec(table=None):
+    """Deck spec for the deals in ``table``, a ``DealTable`` or a filtered view of one (default: the dataset)."""
+    table = DealTable.load() if table is None else table
+    deals = table.records()
+    snap = snapshot_for_rows(deals)
+    totals = snap["totals"]
+    years = snap["facets"]["year"]
+    span = f"{years[0]}–{years[-1]}" if years else ""
+
+    value_by_year = dict(snap["value"]["year"])
+    count_by_year = dict(snap["count"]["year"])
+    ma_by_year = dict(snap["countByYear"]["M&A"])
+    lic_by_year = dict(snap["countByYear"]["Licensing"])
+    count_by_modality = dict(snap["count"]["modality"])
+
+    deal_header = ["Year", "Q", "Type", "Buyer", "Target", "Modality", "Total Value", "Upfront"]
+    deal_widths = [0.8, 0.6, 1.5, 2.1, 2.2, 1.7, 1.7, 1.7]
+
+    return {
+        "title": "Oncology Deal Comparables",
+        "slides": [
+            {
+                "layout": "title",
+                "palette": "neutral",
+                "title": "Oncology Deal\nComparables",
+                "subtitle": f"{totals['deals']} M&A, licensing and financing deals, {span}",
+            },
+
+            # --- Summary ---
+            {
+                "palette": "neutral",
+                "title": "DEAL LANDSCAPE  |  Summary",
+                "subtitle": f"{totals['deals']} deals tracked, {span}",
+                "blocks": [
+                    {"type": "table", "col_widths": [4.0, 3.0, 5.3], "rows": [
+                        ["Metric", "Value", "Notes"],
+                        ["Deals tracked", str(totals["deals"]), span],
+                        ["Total deal value", format_value(totals["totalVal"]), "Including milestones"],
+                        ["Total upfront", format_value(totals["upfront"]), "Cash + equity at signing"],
+                        ["M&A deals", str(totals["ma"]["deals"]), f"Avg {format_value(totals['ma']['avg'])}"],
+                        ["Licensing deals", str(totals["licensing"]["deals"]),
+                         f"Avg {format_value(totals['licensing']['avg'])} (deals with a disclosed value)"],
+                    ]},
+                ],
+            },
+
+            # --- Top deals ---
+            {
+                "palette": "danyelza",
+                "title": "TOP DEALS  |  By Total Value",
+                "subtitle": "Ten largest deals with a disclosed value",
+                "blocks": [
+                    {"type": "table", "col_widths": deal_widths,
+                     "rows": [deal_header] + [deal_row(deals[i]) for i in snap["top"]["all"]]},
+                ],
+            },
+
+            # --- By year ---
+            {
+                "palette": "unituxin",
+                "title": "DEAL FLOW  |  By Year",
+                "blocks": [
+                    {"type": "table", "col_widths": [2.0, 2.0, 2.0, 2.0, 4.3], "rows": [
+                        ["Year", "Deals", "M&A", "Licensing", "Total Value"],
+                        *[[year, str(count_by_year[year]), str(ma_by_year.get(year, 0)),
+                           str(lic_by_year.get(year, 0)), format_value(value_by_year[year])]
+                          for year in map(str, years)],
+                    ]},
+                    {"type": "bullets", "top": 1.5 + 0.4 * (len(years) + 2), "height": 1.5,
+                     "font_size": 14, "color": DARK_GRAY, "items": [
+                         "Deals by quarter: " + ", ".join(f"{q} ({n})" for q, n in snap["quarter"]),
+                     ]},
+                ],
+            },
+
+            # --- By modality ---
+            {
+                "palette": "danyelza",
+                "title": "MODALITIES  |  Value and Deal Count",
+                "blocks": [
+                    {"type": "table", "col_widths": [4.3, 3.0, 5.0], "rows": [
+                        ["Modality", "Deals", "Total Value"],
+                        *[[modality, str(count_by_modality[modality]), format_value(value)]
+                          for modality, value in snap["value"]["modality"][:10]],
+                    ]},
+                ],
+            },
+
+            # --- Buyers ---
+            {
+                "palette": "unituxin",
+                "title": "BUYERS  |  Top Acquirers and Licensees by Spend",
+                "blocks": [
+                    {"type": "table", "col_widths": [2.6, 1.0, 1.8, 1.8, 5.1], "rows": [
+                        ["Buyer", "Deals", "Total Value", "Avg Deal", "Modalities"],
+                        *[[b["buyer"], str(b["deals"]), format_value(b["totalVal"]), format_value(b["avg"]),
+                           ", ".join(b["modalities"])] for b in snap["buyers"][:10]],
+                    ]},
+                ],
+            },
+
+            # --- Modality comps ---
+            *[{
+                "palette": "neutral",
+                "title": f"COMPS  |  {name} Deals",
+                "blocks": [
+                    {"type": "table", "col_widths": deal_widths,
+                     "rows": [deal_header] + [deal_row(deals[i]) for i in ids]},
+                ],
+            } for name, ids in snap["top"].items() if name != "all" and ids],
+
+            {
+                "layout": "closing",
+                "palette": "neutral",
+                "title": "Thank You",
+                "subtitle": "Oncology Deal Comparables",
+            },
+        ],
+    }
+
+
+def __getattr__(name):
+    # SPEC is computed on access, so importing the module doesn't load the dataset
+    if name == "SPEC":
+        return comps_spec()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
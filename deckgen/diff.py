@@ -0,0 +1,469 @@
+"""Structural diffs between two builds of a deck, and publishing only what changed.
+
+Two .pptx files built from the same spec are never byte-identical: the zip
+entries and ``docProps/core.xml`` carry the build time, and part names,
+relationship ids and shape ids depend on the order things were added in.
+So decks are compared by a digest of each slide, read straight from the
+zip (no ``Presentation`` is loaded, only the parts a slide refers to are
+read, and a part shared by several slides is hashed once per file):
+
+* the slide's XML, canonicalized (C14N): shape ids and the number python-pptx
+  appends to shape names dropped, the creation / revision / row and column
+  ids Office writes into ``extLst`` removed, and every relationship id
+  replaced by the digest of the part it points to;
+* the digests of the parts it relates to (its layout, charts, images):
+  XML parts canonicalized the same way, other parts by their bytes.
+
+A deck's digest covers its slide size and its slide digests in order.
+Digests of files on disk are cached by content under the ``deck-digests``
+namespace (see ``deckgen.cache``), so sweeping a directory of unchanged
+decks reads each file once and parses nothing.
+
+``diff_decks`` lines up the slides of two builds (an inserted slide
+doesn't make every later slide "changed") and, for changed slides, reports
+the table cells, chart points and text paragraphs that differ.
+``publish`` writes a deck only if it differs from the one already at its
+path; ``deckgen.batch``, ``deckgen.incremental`` and ``python -m deckgen
+build`` publish through it, so unchanged decks keep their file (and
+mtime) and downstream syncs skip them.
+"""
+
+import difflib
+import hashlib
+import io
+import os
+import posixpath
+import re
+import tempfile
+import zipfile
+
+from .cache import JsonCache, content_hash, file_mode
+
+DIFF_VERSION = 1                     # bump when canonicalization changes
+
+_NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "c": "http://schemas.openxmlformats.org/drawingml/2006/chart",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+}
+_REL_NS = "{%s}" % _NS["r"]
+_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+_CNVPR = "{%s}cNvPr" % _NS["p"]
+_EXT = "{%s}ext" % _NS["a"]
+_EXT_LST = "{%s}extLst" % _NS["a"]
+_P_EXT = "{%s}ext" % _NS["p"]
+_P_EXT_LST = "{%s}extLst" % _NS["p"]
+_A_P = "{%s}p" % _NS["a"]
+_A_T = "{%s}t" % _NS["a"]
+_A_BR = "{%s}br" % _NS["a"]
+
+# Local names of elements that only carry ids Office generates (a16:creationId, p14:modId, a16:rowId, ...)
+_VOLATILE = {"creationId", "modId", "colId", "rowId"}
+_SHAPE_NUMBER = re.compile(r" \d+$")
+
+_cache = None
+_memo = {}                           # (path, mtime_ns, size) -> digest dict
+
+
+def _xml():
+    from lxml import etree
+
+    return etree
+
+
+def _rels_name(part):
+    return posixpath.join(posixpath.dirname(part), "_rels", posixpath.basename(part) + ".rels")
+
+
+class Package:
+    """The parts of one .pptx, read lazily from its zip; ``source`` is a path or bytes."""
+
+    def __init__(self, source):
+        try:
+            self.zip = zipfile.ZipFile(io.BytesIO(source) if isinstance(source, bytes) else source)
+        except (zipfile.BadZipFile, OSError) as exc:
+            raise ValueError(f"can't read {source if isinstance(source, str) else 'deck'} as a .pptx: {exc}") from None
+        self.names = set(self.zip.namelist())
+        self._digests = {}
+
+    def close(self):
+        self.zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def parse(self, part):
+        return _xml().fromstring(self.zip.read(part))
+
+    def rels(self, part):
+        """``{rId: (type, target part or external URL, external?)}`` of ``part``."""
+        name = _rels_name(part)
+        if name not in self.names:
+            return {}
+        rels = {}
+        for rel in self.parse(name).iter(_PKG_REL):
+            target = rel.get("Target")
+            external = rel.get("TargetMode") == "External"
+            if not external:
+                target = posixpath.normpath(posixpath.join(posixpath.dirname(part), target)).lstrip("/")
+            rels[rel.get("Id")] = (rel.get("Type").rsplit("/", 1)[-1], target, external)
+        return rels
+
+    def slides(self):
+        """Part names of the slides, in presentation order."""
+        pres = "ppt/presentation.xml"
+        rels = self.rels(pres)
+        root = self.parse(pres)
+        order = root.findall("p:sldIdLst/p:sldId", _NS)
+        return [rels[s.get(_REL_NS + "id")][1] for s in order]
+
+    def slide_size(self):
+        size = self.parse("ppt/presentation.xml").find("p:sldSz", _NS)
+        return [int(size.get("cx")), int(size.get("cy"))] if size is not None else None
+
+    def part_digest(self, part):
+        """Digest of a related part: canonical XML for XML parts (relationships not followed), else bytes."""
+        digest = self._digests.get(part)
+        if digest is None:
+            if part not in self.names:
+                digest = "missing"
+            elif part.endswith(".xml"):
+                digest = hashlib.sha256(canonical(self.parse(part))).hexdigest()
+            else:
+                digest = hashlib.sha256(self.zip.read(part)).hexdigest()
+            self._digests[part] = digest
+        return digest
+
+    def slide_digest(self, part):
+        rels = self.rels(part)
+        targets = {rid: ("ext:" + target if external else self.part_digest(target))
+                   for rid, (_, target, external) in rels.items()}
+        h = hashlib.sha256(canonical(self.parse(part), targets))
+        # The layout isn't referenced from the slide XML, only from its rels
+        for kind, digest in sorted((kind, targets[rid]) for rid, (kind, _, _) in rels.items()):
+            h.update(f"\n{kind}:{digest}".encode())
+        return h.hexdigest()
+
+
+def canonical(root, targets=None):
+    """C14N bytes of ``root`` without volatile ids; relationship ids become ``targets[rId]`` (or are dropped)."""
+    etree = _xml()
+    doomed = []
+    for el in root.iter():
+        if not isinstance(el.tag, str):
+            continue
+        local = el.tag.rsplit("}", 1)[-1]
+        if local in _VOLATILE:
+            doomed.append(el)
+            continue
+        if el.tag == _CNVPR:
+            el.attrib.pop("id", None)
+            name = el.get("name")
+            if name:
+                el.set("name", _SHAPE_NUMBER.sub("", name))
+        for attr, value in list(el.attrib.items()):
+            if attr.startswith(_REL_NS):
+                el.set(attr, (targets or {}).get(value, ""))
+    for el in doomed:
+        parent = el.getparent()
+        if parent is None:
+            continue
+        parent.remove(el)
+        # Drop the <ext> / <extLst> wrappers left empty
+        while parent.tag in (_EXT, _EXT_LST, _P_EXT, _P_EXT_LST) and not len(parent):
+            grandparent = parent.getparent()
+            if grandparent is None:
+                break
+            grandparent.remove(parent)
+            parent = grandparent
+    return etree.tostring(root, method="c14n")
+
+
+# ================================================================
+# DIGESTS
+# ================================================================
+
+def _digest_package(pkg):
+    slides = [pkg.slide_digest(part) for part in pkg.slides()]
+    size = pkg.slide_size()
+    digest = hashlib.sha256(f"{size}\n{''.join(slides)}".encode()).hexdigest()
+    return {"digest": digest, "size": size, "slides": slides}
+
+
+def _digest_cache():
+    global _cache
+    if _cache is None:
+        _cache = JsonCache("deck-digests", version=DIFF_VERSION)
+    return _cache
+
+
+def deck_digest(source):
+    """``{"digest", "size", "slides": [slide digests]}`` of a .pptx path or bytes."""
+    if isinstance(source, bytes):
+        with Package(source) as pkg:
+            return _digest_package(pkg)
+    try:
+        st = os.stat(source)
+    except OSError as exc:
+        raise ValueError(f"can't read {source}: {exc.strerror}") from None
+    key = (os.path.abspath(source), st.st_mtime_ns, st.st_size)
+    if key not in _memo:
+        with open(source, "rb") as f:
+            data = f.read()
+        cache_key = content_hash(data)
+        result = _digest_cache().get(cache_key)
+        if result is None:
+            with Package(data) as pkg:
+                result = _digest_package(pkg)
+            _digest_cache().put(cache_key, result)
+        _memo[key] = result
+    return _memo[key]
+
+
+def same_deck(a, b):
+    """Whether two decks (paths or bytes) have the same slides, in the same order, on the same page."""
+    return deck_digest(a)["digest"] == deck_digest(b)["digest"]
+
+
+def publish(data, path):
+    """Write the .pptx ``data`` to ``path`` unless the deck there is the same; returns whether it wrote.
+
+    The write is atomic (temporary file, then rename) and keeps the mode of the file it
+    replaces (a new file gets the umask's).
+    """
+    if os.path.exists(path):
+        digest = deck_digest(data)
+        try:
+            if deck_digest(path)["digest"] == digest["digest"]:
+                return False
+        except ValueError:               # not a readable .pptx: replace it
+            pass
+        # The next publish to this path compares against these bytes: save it the parse
+        _digest_cache().put(content_hash(data), digest)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".pptx.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, file_mode(path))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
+
+
+# ================================================================
+# CONTENT (for the slides that changed)
+# ================================================================
+
+def _text(el):
+    # Paragraphs and line breaks (<a:br/>) both end a line
+    return "\n".join("".join("\n" if r.tag == _A_BR else r.text or "" for r in p.iter(_A_T, _A_BR))
+                     for p in el.iter(_A_P))
+
+
+def slide_content(pkg, part):
+    """``{"title", "text": [lines outside tables], "tables": [rows], "charts": [{series: {cat: value}}]}``.
+
+    ``text`` includes the title's lines, so a retitled slide shows up in the text diff.
+    """
+    root = pkg.parse(part)
+    rels = pkg.rels(part)
+    title, text, tables, charts = None, [], [], []
+    for shape in root.find("p:cSld/p:spTree", _NS):
+        tbl = shape.find(".//a:tbl", _NS)
+        if tbl is not None:
+            tables.append([[_text(tc.find("a:txBody", _NS)) if tc.find("a:txBody", _NS) is not None else ""
+                            for tc in tr.findall("a:tc", _NS)] for tr in tbl.findall("a:tr", _NS)])
+            continue
+        chart = shape.find(".//c:chart", _NS)
+        if chart is not None:
+            _, target, _ = rels.get(chart.get(_REL_NS + "id"), (None, None, None))
+            if target in pkg.names:
+                charts.append(_chart_points(pkg.parse(target)))
+            continue
+        body = shape.find("p:txBody", _NS)
+        if body is None:
+            continue
+        ph = shape.find("p:nvSpPr/p:nvPr/p:ph", _NS)
+        paragraphs = [p for p in _text(body).split("\n") if p.strip()]
+        if title is None and ph is not None and ph.get("type") in ("title", "ctrTitle"):
+            title = " ".join(paragraphs)
+        text.extend(paragraphs)
+    if title is None and text:
+        title = text[0]
+    return {"title": title, "text": text, "tables": tables, "charts": charts}
+
+
+def _chart_points(root):
+    def values(el, tag):
+        cache = el.find(f"c:{tag}//c:strCache", _NS)
+        if cache is None:
+            cache = el.find(f"c:{tag}//c:numCache", _NS)
+        return [] if cache is None else [pt.findtext("c:v", "", _NS) for pt in cache.findall("c:pt", _NS)]
+
+    points = {}
+    for ser in root.iter("{%s}ser" % _NS["c"]):
+        name = (values(ser, "tx") or [f"series {len(points) + 1}"])[0]
+        points[name] = dict(zip(values(ser, "cat"), values(ser, "val")))
+    return points
+
+
+def _cell_changes(old_tables, new_tables):
+    changes = []
+    for t in range(max(len(old_tables), len(new_tables))):
+        old = old_tables[t] if t < len(old_tables) else []
+        new = new_tables[t] if t < len(new_tables) else []
+        matcher = difflib.SequenceMatcher(None, [tuple(r) for r in old], [tuple(r) for r in new], autojunk=False)
+        for op, i1, i2, j1, j2 in matcher.get_opcodes():
+            if op == "equal":
+                continue
+            if op == "replace" and i2 - i1 == j2 - j1:
+                for i, j in zip(range(i1, i2), range(j1, j2)):
+                    for c in range(max(len(old[i]), len(new[j]))):
+                        a = old[i][c] if c < len(old[i]) else None
+                        b = new[j][c] if c < len(new[j]) else None
+                        if a != b:
+                            changes.append({"table": t + 1, "row": j + 1, "col": c + 1, "old": a, "new": b})
+                continue
+            for i in range(i1, i2):
+                changes.append({"table": t + 1, "row": i + 1, "old": old[i], "new": None})
+            for j in range(j1, j2):
+                changes.append({"table": t + 1, "row": j + 1, "old": None, "new": new[j]})
+    return changes
+
+
+def _point_changes(old_charts, new_charts):
+    changes = []
+    for n in range(max(len(old_charts), len(new_charts))):
+        old = old_charts[n] if n < len(old_charts) else {}
+        new = new_charts[n] if n < len(new_charts) else {}
+        for series in dict.fromkeys([*old, *new]):
+            a, b = old.get(series, {}), new.get(series, {})
+            for cat in dict.fromkeys([*a, *b]):
+                if a.get(cat) != b.get(cat):
+                    changes.append({"chart": n + 1, "series": series, "category": cat,
+                                    "old": a.get(cat), "new": b.get(cat)})
+    return changes
+
+
+def _slide_changes(old, new):
+    text = [line for line in difflib.ndiff(old["text"], new["text"]) if line[:1] in "+-"]
+    return {"cells": _cell_changes(old["tables"], new["tables"]),
+            "points": _point_changes(old["charts"], new["charts"]),
+            "text": text}
+
+
+# ================================================================
+# DIFF
+# ================================================================
+
+def diff_decks(old, new):
+    """What changed between two builds of a deck (paths or bytes).
+
+    Returns ``{"identical", "size_changed", "unchanged", "slides": [...]}``
+    where each slide entry has ``status`` (added / removed / changed), the
+    slide numbers ``old`` / ``new`` (1-based, None where it doesn't exist),
+    its ``title`` and, for changed slides, ``cells``, ``points`` and
+    ``text`` (ndiff lines) that differ.
+    """
+    a, b = deck_digest(old), deck_digest(new)
+    result = {"identical": a["digest"] == b["digest"], "size_changed": a["size"] != b["size"],
+              "unchanged": 0, "slides": []}
+    if result["identical"]:
+        result["unchanged"] = len(b["slides"])
+        return result
+
+    with Package(old) as old_pkg, Package(new) as new_pkg:
+        old_parts, new_parts = old_pkg.slides(), new_pkg.slides()
+        matcher = difflib.SequenceMatcher(None, a["slides"], b["slides"], autojunk=False)
+        for op, i1, i2, j1, j2 in matcher.get_opcodes():
+            if op == "equal":
+                result["unchanged"] += i2 - i1
+                continue
+            paired = min(i2 - i1, j2 - j1) if op == "replace" else 0
+            for i, j in zip(range(i1, i1 + paired), range(j1, j1 + paired)):
+                before, after = slide_content(old_pkg, old_parts[i]), slide_content(new_pkg, new_parts[j])
+                result["slides"].append(dict({"status": "changed", "old": i + 1, "new": j + 1,
+                                              "title": after["title"]}, **_slide_changes(before, after)))
+            for i in range(i1 + paired, i2):
+                result["slides"].append({"status": "removed", "old": i + 1, "new": None,
+                                         "title": slide_content(old_pkg, old_parts[i])["title"]})
+            for j in range(j1 + paired, j2):
+                result["slides"].append({"status": "added", "old": None, "new": j + 1,
+                                         "title": slide_content(new_pkg, new_parts[j])["title"]})
+    return result
+
+
+def deck_files(directory):
+    """Relative paths of the .pptx files under ``directory``."""
+    found = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith(".pptx") and not name.startswith("~$"):
+                found.append(os.path.relpath(os.path.join(root, name), directory))
+    return sorted(found)
+
+
+def diff_dirs(old_dir, new_dir, workers=None, details=True):
+    """Compare every deck in two output directories, paired by relative path.
+
+    Returns ``{relative path: {"status": added / removed / changed / unchanged,
+    "diff": diff_decks(...) for changed decks if details}}``. Digests are
+    computed in a process pool of ``workers`` processes (1: in this process).
+    """
+    old_files, new_files = set(deck_files(old_dir)), set(deck_files(new_dir))
+    both = sorted(old_files & new_files)
+    paths = [os.path.join(old_dir, p) for p in both] + [os.path.join(new_dir, p) for p in both]
+    if workers == 1 or len(paths) < 16:
+        digests = [deck_digest(p)["digest"] for p in paths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            digests = [d["digest"] for d in pool.map(deck_digest, paths, chunksize=8)]
+    results = {p: {"status": "removed"} for p in old_files - new_files}
+    results.update({p: {"status": "added"} for p in new_files - old_files})
+    for p, a, b in zip(both, digests, digests[len(both):]):
+        results[p] = {"status": "unchanged" if a == b else "changed"}
+        if a != b and details:
+            results[p]["diff"] = diff_decks(os.path.join(old_dir, p), os.path.join(new_dir, p))
+    return dict(sorted(results.items()))
+
+
+def format_diff(diff, name=None):
+    """Human-readable lines for a ``diff_decks`` result."""
+    counts = {s: sum(1 for e in diff["slides"] if e["status"] == s) for s in ("changed", "added", "removed")}
+    head = f"{name}: " if name else ""
+    if diff["identical"]:
+        return [f"{head}identical ({diff['unchanged']} slides)"]
+    lines = [f"{head}{counts['changed']} slides changed, {counts['added']} added, {counts['removed']} removed "
+             f"({diff['unchanged']} unchanged)" + (", page size changed" if diff["size_changed"] else "")]
+    marks = {"changed": "~", "added": "+", "removed": "-"}
+    for entry in diff["slides"]:
+        if entry["new"] is None:
+            where = f"slide {entry['old']} of the old deck"
+        elif entry["old"] in (None, entry["new"]):
+            where = f"slide {entry['new']}"
+        else:
+            where = f"slide {entry['new']} (was {entry['old']})"
+        lines.append(f"  {marks[entry['status']]} {where}: {entry['title'] or '(untitled)'}")
+        for cell in entry.get("cells", ()):
+            if "col" in cell:
+                lines.append(f"      table {cell['table']} row {cell['row']} col {cell['col']}: "
+                             f"{cell['old']!r} -> {cell['new']!r}")
+            else:
+                verb, row = ("removed", cell["old"]) if cell["new"] is None else ("added", cell["new"])
+                lines.append(f"      table {cell['table']} row {cell['row']} {verb}: {' | '.join(row)}")
+        for point in entry.get("points", ()):
+            lines.append(f"      chart {point['chart']} {point['series']} {point['category']}: "
+                         f"{point['old']} -> {point['new']}")
+        for line in entry.get("text", ()):
+            lines.append(f"      {line[0]} {line[2:]}")
+        if entry["status"] == "changed" and not (entry["cells"] or entry["points"] or entry["text"]):
+            lines.append("      (formatting or layout only)")
+    return lines
@@ -0,0 +1,56 @@
+"""Stable fingerprints of deck and slide specs.
+
+A slide's fingerprint covers everything that affects how it renders: its own
+spec (title, subtitle, blocks and their rows), the resolved palette colours
+(so editing a palette dirties every slide that uses it), the content of the
+images it shows and the deck page size. Bump ``FINGERPRINT_VERSION``
+whenever a builder changes its output for the same spec.
+"""
+
+import hashlib
+import json
+
+from .assets import file_digest
+from .palette import get_palette
+
+FINGERPRINT_VERSION = 3
+
+
+def canonical_json(value):
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _resolve_palettes(value):
+    # Replace palette names with their colours, recursively (tables carry their own),
+    # and pin image blocks to the content of their file
+    if isinstance(value, dict):
+        resolved = {k: (get_palette(v)._asdict() if k == "palette" else _resolve_palettes(v))
+                    for k, v in value.items()}
+        if value.get("type") == "image":
+            resolved["src"] = [value["src"], file_digest(value["src"])]
+        return resolved
+    if isinstance(value, list):
+        return [_resolve_palettes(v) for v in value]
+    return value
+
+
+def slide_fingerprint(slide_spec, deck_spec=None):
+    deck_spec = deck_spec or {}
+    slide_spec = dict(slide_spec)
+    slide_spec.setdefault("palette", "danyelza")
+    payload = {
+        "version": FINGERPRINT_VERSION,
+        "page": [deck_spec.get("width", 13.333), deck_spec.get("height", 7.5)],
+        "slide": _resolve_palettes(slide_spec),
+    }
+    return hashlib.sha256(canonical_json(payload).encode("utf-8")).hexdigest()
+
+
+def deck_fingerprints(spec):
+    """Fingerprint of every slide in ``spec``, in order."""
+    return [slide_fingerprint(s, spec) for s in spec["slides"]]
+
+
+def deck_fingerprint(spec):
+    """One hash for the whole deck: changes if any slide, or the slide order, changes."""
+    return hashlib.sha256("".join(deck_fingerprints(spec)).encode("ascii")).hexdigest()
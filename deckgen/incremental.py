@@ -0,0 +1,133 @@
+"""Incremental rebuilds: re-render only the slides whose inputs changed.
+
+Next to each deck ``X.pptx`` a manifest ``X.pptx.slides.json`` records the
+fingerprint of every slide (see ``deckgen.fingerprint``) and the sha256 of
+the .pptx it describes. On rebuild, a slide whose fingerprint already
+appears in the previous build is not rendered: a blank slide holds its place
+in the new package and its ``slideN.xml`` (and rels) are copied byte-for-byte
+from the previous file. Only dirty slides go through the builders.
+
+Previous slides that relate to anything but their layout (pictures, charts,
+notes) are always re-rendered, since those parts are not carried over, and
+so are slides whose compiled layout (``deckgen.theme``) ended up under a
+different part name in the new package. If the .pptx no longer matches its
+manifest (edited by hand, or the manifest is missing) everything is rebuilt.
+
+The file is only replaced if the new build differs from it (see
+``deckgen.diff.publish``).
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import zipfile
+
+from .builder import add_slide, new_presentation, save, slide_layout
+from .diff import publish
+from .fingerprint import FINGERPRINT_VERSION, deck_fingerprints
+from .paginate import paginate
+from .trace import span
+
+_SLIDE_PART = "ppt/slides/slide{}.xml"
+_SLIDE_RELS = "ppt/slides/_rels/slide{}.xml.rels"
+_TARGET = re.compile(rb'Target="([^"]*)"')
+
+
+def manifest_path(path):
+    return path + ".slides.json"
+
+
+def _sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest(path):
+    """Fingerprints of the existing build at ``path``, or ``[]`` if it can't be trusted."""
+    try:
+        with open(manifest_path(path), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != FINGERPRINT_VERSION or manifest.get("sha256") != _sha256_file(path):
+            return []
+        return manifest["slides"]
+    except (OSError, ValueError, KeyError):
+        return []
+
+
+def _reusable_slides(zf, fingerprints):
+    """Map fingerprint -> (slide number, layout target) for previous slides that can be copied as-is."""
+    reusable = {}
+    names = set(zf.namelist())
+    for n, fp in enumerate(fingerprints, 1):
+        part, rels = _SLIDE_PART.format(n), _SLIDE_RELS.format(n)
+        if part not in names or rels not in names or fp in reusable:
+            continue
+        targets = _TARGET.findall(zf.read(rels))
+        if len(targets) == 1 and targets[0].startswith(b"../slideLayouts/"):
+            reusable[fp] = (n, targets[0].decode())
+    return reusable
+
+
+def rebuild_deck(spec, path):
+    """Build ``spec`` into ``path``, reusing unchanged slides from the previous build.
+
+    Returns ``(rendered, reused)`` slide counts, after pagination (see ``deckgen.paginate``).
+    """
+    spec = paginate(spec)
+    fingerprints = deck_fingerprints(spec)
+    old = None
+    reusable = {}
+    previous = load_manifest(path) if os.path.exists(path) else []
+    if previous:
+        old = zipfile.ZipFile(path)
+        reusable = _reusable_slides(old, previous)
+
+    prs = new_presentation(spec)
+    copied = {}                                  # new slide number -> previous slide number
+    for n, (slide_spec, fp) in enumerate(zip(spec["slides"], fingerprints), 1):
+        layout = slide_layout(prs, slide_spec)
+        old_n, old_target = reusable.get(fp, (None, None))
+        # Layouts are compiled per deck, so only reuse a slide that lands on the same layout part
+        if old_target == "../slideLayouts/" + layout.part.partname.filename:
+            prs.slides.add_slide(layout)
+            copied[n] = old_n
+        else:
+            add_slide(prs, slide_spec)
+
+    buf = io.BytesIO()
+    save(prs, buf)
+    if copied:
+        with span("splice", "io", slides=len(copied)):
+            buf = _splice(buf, old, copied)
+    if old is not None:
+        old.close()
+
+    publish(buf.getvalue(), path)
+    with open(manifest_path(path), "w", encoding="utf-8") as f:
+        json.dump({"version": FINGERPRINT_VERSION, "sha256": _sha256_file(path), "slides": fingerprints},
+                  f, indent=1)
+    return len(fingerprints) - len(copied), len(copied)
+
+
+def _splice(buf, old, copied):
+    """Copy of the package in ``buf`` with the ``copied`` slide parts taken from ``old``."""
+    replace = {}
+    for new_n, old_n in copied.items():
+        replace[_SLIDE_PART.format(new_n)] = _SLIDE_PART.format(old_n)
+        replace[_SLIDE_RELS.format(new_n)] = _SLIDE_RELS.format(old_n)
+    old_names = set(old.namelist())
+
+    out = io.BytesIO()
+    with zipfile.ZipFile(buf) as src, zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            source = replace.get(info.filename)
+            if source in old_names:
+                dst.writestr(info, old.read(source))
+            else:
+                dst.writestr(info, src.read(info))
+    return out
@@ -0,0 +1,292 @@
+"""Build deck specs from the company-analysis markdown files.
+
+``parse_markdown`` reads an analysis (``Danyelza_Analysis.md`` etc.) line by
+line into a small document tree::
+
+    {"title": "...", "sections": [{"title": "Overview", "blocks": [
+        {"type": "table", "rows": [[...], ...]},
+        {"type": "heading", "text": "Timeline"},
+        {"type": "bullets", "items": [...]},
+        {"type": "paragraph", "text": "..."},
+    ]}]}
+
+Parsed trees are cached on disk keyed by the file's content hash, so
+unchanged analyses are never re-parsed. ``analysis_slides`` then flows each
+``##`` section onto content slides (title bar, tables, bullets), starting a
+continuation slide when the measured height runs past the bottom margin. A
+table too tall for any slide is split when the deck is built (see
+``deckgen.paginate``).
+"""
+
+import re
+
+from .cache import JsonCache, content_hash
+from .paginate import BLOCK_GAP, CONTENT_BOTTOM, CONTENT_TOP, CONTENT_WIDTH, block_height
+from .palette import DARK_GRAY, MED_GRAY, get_palette
+
+PARSER_VERSION = 1
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+_TABLE_ALIGN = re.compile(r"^\s*\|?(\s*:?-+:?\s*\|)+\s*(:?-+:?\s*)?$")
+_BULLET = re.compile(r"^(\s*)[-*+]\s+(.*)$")
+_ESCAPE = re.compile(r"\\(.)")
+_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_EMPHASIS = re.compile(r"(\*\*|__)(.+?)\1")
+_SECTION_NUMBER = re.compile(r"^\d+(\.\d+)*\.?\s+")
+
+_cache = None
+
+
+def clean_inline(text):
+    """Strip inline markdown (bold, links, backslash escapes) from ``text``."""
+    text = _LINK.sub(r"\1", text)
+    text = _EMPHASIS.sub(r"\2", text)
+    text = _ESCAPE.sub(r"\1", text)
+    return " ".join(text.split())
+
+
+def _table_cells(line):
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    return [clean_inline(c) for c in re.split(r"(?<!\\)\|", line)]
+
+
+class _Parser:
+    """Single-pass line parser; ``feed`` one line at a time, then ``close``."""
+
+    def __init__(self):
+        self.doc = {"title": "", "sections": []}
+        self.section = None
+        self.block = None           # block currently being accumulated
+        self.indent = None          # indent of top-level bullets in self.block
+
+    def _section(self):
+        if self.section is None:
+            self.section = {"title": "", "blocks": []}
+            self.doc["sections"].append(self.section)
+        return self.section
+
+    def _flush(self):
+        if self.block is not None:
+            if self.block["type"] == "paragraph":
+                self.block["text"] = clean_inline(" ".join(self.block.pop("lines")))
+            self._section()["blocks"].append(self.block)
+        self.block = None
+        self.indent = None
+
+    def _start(self, kind, **fields):
+        if self.block is None or self.block["type"] != kind:
+            self._flush()
+            self.block = {"type": kind, **fields}
+        return self.block
+
+    def feed(self, line):
+        line = line.rstrip("\n")
+        stripped = line.strip()
+
+        if not stripped:
+            # blank lines end paragraphs and tables; bullet lists may be loose
+            if self.block is not None and self.block["type"] != "bullets":
+                self._flush()
+            return
+
+        m = _HEADING.match(stripped)
+        if m:
+            self._flush()
+            level, text = len(m.group(1)), clean_inline(m.group(2))
+            if level == 1 and not self.doc["title"]:
+                self.doc["title"] = text
+            elif level <= 2:
+                self.section = {"title": _SECTION_NUMBER.sub("", text), "blocks": []}
+                self.doc["sections"].append(self.section)
+            else:
+                self._section()["blocks"].append({"type": "heading", "text": text})
+            return
+
+        if _RULE.match(stripped):
+            self._flush()
+            return
+
+        if stripped.startswith("|"):
+            block = self._start("table", rows=[])
+            if not _TABLE_ALIGN.match(stripped):
+                block["rows"].append(_table_cells(stripped))
+            return
+
+        m = _BULLET.match(line)
+        if m:
+            block = self._start("bullets", items=[])
+            indent, text = len(m.group(1).expandtabs(4)), clean_inline(m.group(2))
+            if self.indent is None:
+                self.indent = indent
+            if indent > self.indent and block["items"]:
+                # fold nested items into their parent: "also covered: a; b"
+                parent = block["items"][-1]
+                block["items"][-1] = parent + (" " if parent.endswith(":") else "; ") + text
+                return
+            block["items"].append(text)
+            return
+
+        if self.block is not None and self.block["type"] == "bullets" and line[:1].isspace():
+            # lazy continuation of the previous bullet
+            block = self.block
+            block["items"][-1] = clean_inline(block["items"][-1] + " " + stripped)
+            return
+
+        self._start("paragraph", lines=[])["lines"].append(stripped)
+
+    def close(self):
+        self._flush()
+        return self.doc
+
+
+def parse_lines(lines):
+    """Parse an iterable of markdown lines into a document tree."""
+    parser = _Parser()
+    for line in lines:
+        parser.feed(line)
+    return parser.close()
+
+
+def parse_markdown(path, cache=True):
+    """Parse the analysis at ``path``, reusing the on-disk cache when the content is unchanged."""
+    global _cache
+    with open(path, "rb") as f:
+        data = f.read()
+    key = content_hash(data)
+    if cache:
+        if _cache is None:
+            _cache = JsonCache("markdown", version=PARSER_VERSION)
+        doc = _cache.get(key)
+        if doc is not None:
+            return doc
+    doc = parse_lines(data.decode("utf-8").splitlines())
+    if cache:
+        _cache.put(key, doc)
+    return doc
+
+
+# ================================================================
+# LAYOUT — flow sections onto content slides
+# ================================================================
+
+def column_widths(rows, total=CONTENT_WIDTH):
+    """Split ``total`` inches between columns in proportion to their longest cell."""
+    n_cols = max(len(r) for r in rows)
+    weights = [min(max((len(r[c]) for r in rows if c < len(r)), default=0), 60) + 6
+               for c in range(n_cols)]
+    scale = total / sum(weights)
+    widths = [round(w * scale, 2) for w in weights]
+    widths[-1] = round(total - sum(widths[:-1]), 2)
+    return widths
+
+
+def _layout_block(block, palette):
+    """Return ``(spec_block, height)`` for a parsed block; heights are measured (``deckgen.measure``)."""
+    kind = block["type"]
+    if kind == "table":
+        rows = [r + [""] * (max(map(len, block["rows"])) - len(r)) for r in block["rows"]]
+        spec = {"type": "table", "rows": rows, "col_widths": column_widths(rows)}
+        return spec, block_height(spec)
+    if kind == "heading":
+        return {"type": "text", "text": block["text"], "height": 0.4, "font_size": 18,
+                "color": palette.primary, "bold": True}, 0.4
+    if kind == "bullets":
+        spec = {"type": "bullets", "items": block["items"], "font_size": 14, "color": DARK_GRAY}
+        height = block_height(spec)
+        return dict(spec, height=round(height, 2)), height
+    spec = {"type": "text", "text": block["text"], "height": 0.4, "font_size": 14, "color": MED_GRAY}
+    height = block_height(spec)
+    return dict(spec, height=round(height, 2)), height
+
+
+def _flow(section, brand, palette_name, palette):
+    slides = []
+
+    def new_slide():
+        title = f"{brand}  |  {section['title']}" if brand else section["title"]
+        if slides:
+            title += " (cont.)"
+        slides.append({"palette": palette_name, "title": title, "blocks": []})
+        return slides[-1]["blocks"], CONTENT_TOP
+
+    current, y = new_slide()
+    for block in section["blocks"]:
+        spec, height = _layout_block(block, palette)
+        if y + height > CONTENT_BOTTOM and current:
+            # keep a subsection heading together with the block that follows it
+            heading = current.pop() if current[-1].get("bold") else None
+            if heading:
+                y = heading["top"]
+            if current:
+                current, y = new_slide()
+            if heading:
+                heading["top"] = round(y, 2)
+                current.append(heading)
+                y += heading["height"] + BLOCK_GAP
+        spec["top"] = round(y, 2)
+        current.append(spec)
+        y += height + BLOCK_GAP
+    return [s for s in slides if s["blocks"]]
+
+
+def _overview(doc):
+    """Key/value pairs from the first two-column table (the Overview table)."""
+    for section in doc["sections"]:
+        for block in section["blocks"]:
+            if block["type"] == "table" and all(len(r) == 2 for r in block["rows"]):
+                return {k: v for k, v in block["rows"][1:]}
+    return {}
+
+
+def cover_slide(doc, palette_name):
+    """Section cover built from the document title and its Overview table."""
+    overview = _overview(doc)
+    title = doc["title"].split(" — ")[0]
+    company = next((overview[k] for k in ("Commercializer", "Current Owner", "Company") if k in overview), "")
+    return {
+        "layout": "cover",
+        "palette": palette_name,
+        "title": title,
+        "company": company,
+        "tagline": overview.get("Type", ""),
+    }
+
+
+def analysis_slides(doc, palette="danyelza", brand=None):
+    """Cover plus content slides for every ``##`` section of a parsed analysis."""
+    palette_name = palette
+    palette = get_palette(palette)
+    if brand is None:
+        brand = re.split(r"\s+[(—-]", doc["title"], maxsplit=1)[0].strip()
+    slides = [cover_slide(doc, palette_name)]
+    for section in doc["sections"]:
+        if section["blocks"]:
+            slides.extend(_flow(section, brand, palette_name, palette))
+    return slides
+
+
+def analysis_spec(sources, title=None, subtitle=None):
+    """Deck spec for one or more analyses.
+
+    ``sources`` is a list of ``(path, palette)`` pairs. With more than one
+    source the deck gets a title and closing slide like the hand-built
+    comparison deck.
+    """
+    docs = [(parse_markdown(path), palette) for path, palette in sources]
+    slides = []
+    for doc, palette in docs:
+        slides.extend(analysis_slides(doc, palette))
+    names = "  &  ".join(doc["title"].split(" — ")[0] for doc, _ in docs)
+    title = title or names
+    if len(docs) > 1:
+        first_palette = docs[0][1]
+        slides.insert(0, {"layout": "title", "palette": first_palette, "title": title,
+                          "subtitle": subtitle or "Company Profiles: " + names})
+        slides.append({"layout": "closing", "palette": first_palette, "title": "Thank You",
+                       "subtitle": names if title == names else f"{title}\n{names}"})
+    return {"title": title, "slides": slides}
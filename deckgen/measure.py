@@ -0,0 +1,180 @@
+"""Text measurement: how many lines a string wraps to, and how tall it is.
+
+Widths come from the font's advance widths. When the font file is on this
+machine (``calibri.ttf``, or Carlito, which has the same metrics) they are
+read from it with Pillow. Otherwise they come from a table of Calibri's
+widths, which is close enough to place text but ignores kerning. Fonts
+are looked for in ``$DECKGEN_FONT_DIR`` and then in the usual system font
+directories.
+
+Widths are kept in ems, so one table serves every size. A glyph is
+measured once per font and weight, a word once per font and weight, and a
+wrapped line count once per ``(text, width, size, weight)``. Measuring the
+cells of a table that has been seen before costs a dict lookup each.
+
+Wrapping follows PowerPoint. Lines break at spaces, a word wider than the
+line is broken between characters, and ``"\\n"`` and ``"\\v"`` always
+start a new line. A single-spaced line is ``LINE_SPACING`` times the font
+size.
+"""
+
+import glob
+import os
+import unicodedata
+from functools import lru_cache
+
+LINE_SPACING = 1.2                   # line height / font size, single spacing
+
+# Text insets (inches): PowerPoint's defaults for text boxes and table cells
+INSET_X = 0.1
+INSET_Y = 0.05
+
+FONT_FILES = {
+    ("Calibri", False): ("calibri.ttf", "Carlito-Regular.ttf"),
+    ("Calibri", True): ("calibrib.ttf", "Carlito-Bold.ttf"),
+}
+
+FONT_DIRS = (
+    "/usr/share/fonts", "/usr/local/share/fonts", "~/.local/share/fonts", "~/.fonts",
+    "/Library/Fonts", "/System/Library/Fonts", "~/Library/Fonts",
+    os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+)
+
+# Calibri advance widths in 1/2048 em, printable ASCII from " " to "~"
+_CALIBRI_ASCII = (
+    463, 546, 714, 1038, 1038, 1463, 1397, 394, 621, 621, 1038, 1038, 511, 627, 517, 791,
+    1038, 1038, 1038, 1038, 1038, 1038, 1038, 1038, 1038, 1038, 548, 548, 1038, 1038, 1038, 945,
+    1837, 1185, 1114, 1092, 1260, 1000, 941, 1292, 1276, 516, 653, 1064, 861, 1751, 1322, 1356,
+    1058, 1378, 1112, 941, 998, 1314, 1162, 1822, 1063, 998, 959, 628, 791, 628, 1038, 1020,
+    588, 981, 1076, 866, 1076, 1019, 625, 964, 1076, 470, 490, 931, 470, 1636, 1076, 1080,
+    1076, 1076, 714, 801, 686, 1076, 925, 1464, 887, 927, 809, 680, 941, 680, 1038,
+)
+_CALIBRI = {chr(32 + i): w / 2048 for i, w in enumerate(_CALIBRI_ASCII)}
+_CALIBRI.update({"–": 1024 / 2048, "—": 1843 / 2048, "•": 1024 / 2048, "’": 511 / 2048, "‘": 511 / 2048,
+                 "“": 832 / 2048, "”": 832 / 2048, "…": 1548 / 2048, "\u00a0": 463 / 2048})
+_CALIBRI_BOLD_SCALE = 1.04           # Calibri Bold runs about 4% wider
+_CALIBRI_DEFAULT = 1038 / 2048       # anything else: the width of a digit
+
+_fonts = {}
+
+
+def find_font(name="Calibri", bold=False):
+    """Path of the font file for ``name``, or None."""
+    files = FONT_FILES.get((name, bold), ())
+    dirs = [os.environ["DECKGEN_FONT_DIR"]] if os.environ.get("DECKGEN_FONT_DIR") else []
+    for d in dirs + [os.path.expanduser(d) for d in FONT_DIRS]:
+        for file in files:
+            found = glob.glob(os.path.join(glob.escape(d), "**", file), recursive=True)
+            if found:
+                return found[0]
+    return None
+
+
+class FontMetrics:
+    """Advance widths (in ems) of one font and weight, memoized per glyph and per word."""
+
+    def __init__(self, name="Calibri", bold=False, path=None):
+        self.name = name
+        self.bold = bold
+        self.path = path
+        self._font = None
+        self._glyphs = {}
+        self._words = {}
+        self.space = self.glyph(" ")
+
+    def _advance(self, ch):
+        if self.path:
+            if self._font is None:
+                from PIL import ImageFont
+
+                self._font = ImageFont.truetype(self.path, 2048)
+            return self._font.getlength(ch) / 2048
+        if ch in _CALIBRI:
+            width = _CALIBRI[ch]
+        elif unicodedata.east_asian_width(ch) in ("W", "F"):
+            width = 1.0
+        elif unicodedata.combining(ch):
+            width = 0.0
+        else:
+            base = unicodedata.normalize("NFKD", ch)[:1]      # é -> e
+            width = _CALIBRI.get(base, _CALIBRI_DEFAULT)
+        return width * _CALIBRI_BOLD_SCALE if self.bold else width
+
+    def glyph(self, ch):
+        width = self._glyphs.get(ch)
+        if width is None:
+            width = self._glyphs[ch] = self._advance(ch)
+        return width
+
+    def width(self, word):
+        """Width of ``word`` (no line breaks) in ems."""
+        width = self._words.get(word)
+        if width is None:
+            width = self._words[word] = sum(self.glyph(ch) for ch in word)
+        return width
+
+
+def metrics(name="Calibri", bold=False):
+    """The (shared) ``FontMetrics`` for a font and weight."""
+    key = (name, bold)
+    if key not in _fonts:
+        _fonts[key] = FontMetrics(name, bold, find_font(name, bold))
+    return _fonts[key]
+
+
+@lru_cache(maxsize=1 << 16)
+def line_count(text, width, size, bold=False, font="Calibri"):
+    """Lines ``text`` wraps to in a ``width``-inch line at ``size`` points."""
+    m = metrics(font, bold)
+    limit = width * 72 / size                    # line width in ems
+    lines = 0
+    for para in text.replace("\v", "\n").split("\n"):
+        lines += 1
+        x = None                                 # width of the current line, None at its start
+        for word in para.split(" "):
+            w = m.width(word)
+            if x is not None and x + m.space + w <= limit:
+                x += m.space + w
+                continue
+            if x is not None:
+                lines += 1
+            if w <= limit:
+                x = w
+                continue
+            # A word longer than the line: break it between characters
+            x = 0.0
+            for ch in word:
+                g = m.glyph(ch)
+                if x + g > limit and x > 0:
+                    lines += 1
+                    x = 0.0
+                x += g
+    return lines
+
+
+def text_height(text, width, size, bold=False, font="Calibri"):
+    """Height in inches of ``text`` in a box ``width`` inches wide, insets included."""
+    lines = line_count(text, width - 2 * INSET_X, size, bold, font)
+    return lines * size * LINE_SPACING / 72 + 2 * INSET_Y
+
+
+def paragraphs_height(items, width, size, spacing=0, bold=False, font="Calibri"):
+    """Height in inches of a text box holding ``items`` as paragraphs ``spacing`` points apart."""
+    em = size * LINE_SPACING / 72
+    lines = sum(line_count(item, width - 2 * INSET_X, size, bold, font) for item in items)
+    return lines * em + len(items) * spacing / 72 + 2 * INSET_Y
+
+
+def row_heights(rows, col_widths, min_height=0.4, header_size=13, body_size=12):
+    """Height in inches of each row of a table: the tallest cell, and at least ``min_height``.
+
+    ``col_widths`` are in inches. The first row is the bold header, as
+    ``deckgen.shapes.add_table`` draws it.
+    """
+    inner = [w - 2 * INSET_X for w in col_widths]
+    heights = []
+    for r, row in enumerate(rows):
+        size, bold = (header_size, True) if r == 0 else (body_size, False)
+        lines = max((line_count(str(txt), w, size, bold) for txt, w in zip(row, inner)), default=0)
+        heights.append(max(min_height, lines * size * LINE_SPACING / 72 + 2 * INSET_Y))
+    return heights
@@ -0,0 +1,312 @@
+"""Financial figures as typed series: parsing, growth, CAGR and charts.
+
+The profile decks and analyses write figures the way analysts do:
+``"$34.9M"``, ``"~$49.3M"``, ``"~$12–20M"``, ``"~$1.5–2.0B"``, ``"+71%"``.
+``parse_value`` turns one of these into a ``Value`` (low, high, approximate
+or not, kind). ``parse_period`` does the same for ``"2023"``, ``"Q1 2025"``
+or ``"H1 2025"``. ``MetricSeries`` holds a column of them as NumPy arrays::
+
+    revenue = MetricSeries.parse([("2021", "$34.9M"), ("2022", "~$49.3M"), ("2023", "$84.3M")])
+    revenue.growth()           # [nan, 0.413, 0.710]: year over year, quarters against the same quarter
+    revenue.cagr()             # 0.554, between the first and last full years
+    format_percent(revenue.growth()[2])        # "+71%"
+
+Money is kept in $M, percentages as fractions and per-share prices in
+dollars. A range is kept as its two ends and computed on at its midpoint.
+Anything that isn't a figure ("Rising", "—") is NaN.
+
+``Panel`` stacks many series on one axis of years, so the growth and CAGR
+of a whole batch of company profiles are a few array operations.
+``summarize`` is that batch computation cached per series by content. It
+uses memory and the on-disk cache, like ``deckgen.deals.snapshot_for_rows``.
+
+``chart_block`` turns a series into a ``chart`` block, which
+``deckgen.builder`` renders as a native PowerPoint chart. The chart's data
+is editable in PowerPoint.
+"""
+
+import json
+import math
+import re
+from collections import namedtuple
+
+import numpy as np
+
+from .cache import JsonCache, content_hash
+
+METRICS_VERSION = 1
+
+Value = namedtuple("Value", "low high approx kind")            # kind: money ($M), percent, price ($)
+Period = namedtuple("Period", "start freq")                     # start in years (2025.25 = Q2 2025); Y, H, Q
+
+# Multipliers to $M
+UNITS = {"": 1e-6, "k": 1e-3, "thousand": 1e-3, "m": 1.0, "mm": 1.0, "mn": 1.0, "million": 1.0,
+         "b": 1e3, "bn": 1e3, "billion": 1e3, "t": 1e6, "trillion": 1e6}
+
+_NUMBER = r"\d[\d,]*(?:\.\d+)?|\.\d+"
+_UNIT = r"(?:thousand|million|billion|trillion|bn|mn|mm|[kmbt])\b"
+_MONEY = re.compile(
+    rf"^(?P<approx>~|≈|c\.\s*|approx\.?\s*|about\s+)?(?P<sign>[+\-−])?\$\s*(?P<low>{_NUMBER})\s*(?P<low_unit>{_UNIT})?"
+    rf"(?:\s*(?:[–—-]|to)\s*(?P<high_sign>[+\-−])?\$?\s*(?P<high>{_NUMBER}))?\+?\s*(?P<unit>{_UNIT})?\+?"
+    r"\s*(?P<per>/\s*share|per\s+share)?", re.I)
+_PERCENT = re.compile(rf"^(?P<approx>~|≈)?(?P<sign>[+\-−])?(?P<low>{_NUMBER})(?:\s*[–—-]\s*(?P<high>{_NUMBER}))?\s*%")
+_YEAR = re.compile(r"^(?:~|≈|c\.\s*)?(?:FY\s*)?(?P<year>(?:19|20)\d\d)$", re.I)
+_PART = re.compile(r"^(?:(?P<kind>[QH])(?P<n>[1-4])\s*(?:FY\s*)?(?P<year>(?:19|20)\d\d)"
+                   r"|(?P<year2>(?:19|20)\d\d)\s*(?P<kind2>[QH])(?P<n2>[1-4]))$", re.I)
+
+_summaries = {}
+
+
+def _number(text):
+    return float(text.replace(",", ""))
+
+
+def parse_value(text):
+    """``Value`` for a figure like ``"~$12–20M"`` or ``"+8% YoY"``; None if ``text`` isn't one."""
+    text = " ".join(str(text).split())
+    m = _MONEY.match(text)
+    if m:
+        unit = (m.group("unit") or m.group("low_unit") or "").lower()
+        low_unit = (m.group("low_unit") or unit).lower()
+        sign = -1 if m.group("sign") in ("-", "−") else 1
+        if m.group("per"):
+            kind, scale, low_scale = "price", 1.0, 1.0
+        else:
+            kind, scale, low_scale = "money", UNITS[unit], UNITS[low_unit]
+        low = sign * _number(m.group("low")) * low_scale
+        high_sign = -1 if m.group("high_sign") in ("-", "−") else 1
+        high = high_sign * _number(m.group("high")) * scale if m.group("high") else low
+        approx = bool(m.group("approx")) or "+" in text[m.start("low"):m.end()]
+        return Value(low, high, approx, kind)
+    m = _PERCENT.match(text)
+    if m:
+        sign = -1 if m.group("sign") in ("-", "−") else 1
+        low = sign * _number(m.group("low")) / 100
+        high = sign * _number(m.group("high")) / 100 if m.group("high") else low
+        return Value(low, high, bool(m.group("approx")), "percent")
+    return None
+
+
+def parse_period(text):
+    """``Period`` for ``"2023"``, ``"FY2023"``, ``"Q1 2025"``, ``"2025 Q1"`` or ``"H1 2025"``; else None."""
+    text = " ".join(str(text).split())
+    m = _YEAR.match(text)
+    if m:
+        return Period(float(m.group("year")), "Y")
+    m = _PART.match(text)
+    if m:
+        kind = (m.group("kind") or m.group("kind2")).upper()
+        n = int(m.group("n") or m.group("n2"))
+        year = int(m.group("year") or m.group("year2"))
+        if kind == "H" and n > 2:
+            return None
+        return Period(year + (n - 1) * (0.25 if kind == "Q" else 0.5), kind)
+    return None
+
+
+def format_money(low, high=None, approx=False):
+    """``"$34.9M"``, ``"~$1.5–2.0B"``; ``"—"`` for NaN."""
+    if low is None or (isinstance(low, float) and math.isnan(low)):
+        return "—"
+    high = low if high is None else high
+    prefix = "~" if approx else ""
+    if max(abs(low), abs(high)) >= 1000:
+        body, unit = (f"{low / 1000:.1f}" if low == high else f"{low / 1000:.1f}–{high / 1000:.1f}"), "B"
+    else:
+        body, unit = (f"{low:.1f}" if low == high else f"{low:g}–{high:g}"), "M"
+    return f"{prefix}${body}{unit}"
+
+
+def format_percent(x, approx=False):
+    """``"+71%"``, ``"0%"`` for anything that rounds to zero (either side); ``"—"`` for NaN."""
+    if x is None or math.isnan(x):
+        return "—"
+    prefix, pct = "~" if approx else "", round(x * 100)
+    return f"{prefix}{pct:+d}%" if pct else f"{prefix}0%"
+
+
+class MetricSeries:
+    """One figure (revenue, market cap, ...) over periods, as arrays.
+
+    ``labels`` are the period labels as written; ``start`` and ``freq`` the
+    parsed periods; ``low``, ``high`` and ``approx`` the parsed values. Rows
+    whose value couldn't be parsed hold NaN.
+    """
+
+    def __init__(self, labels, periods, values, name=None):
+        self.name = name
+        self.labels = list(labels)
+        self.start = np.array([np.nan if p is None else p.start for p in periods], dtype=np.float64)
+        self.freq = np.array(["" if p is None else p.freq for p in periods])
+        self.low = np.array([np.nan if v is None else v.low for v in values], dtype=np.float64)
+        self.high = np.array([np.nan if v is None else v.high for v in values], dtype=np.float64)
+        self.approx = np.array([v is not None and v.approx for v in values], dtype=bool)
+        kinds = {v.kind for v in values if v is not None}
+        if len(kinds) > 1:
+            raise ValueError(f"series {name!r} mixes {', '.join(sorted(kinds))} values")
+        self.kind = kinds.pop() if kinds else "money"
+
+    @classmethod
+    def parse(cls, pairs, name=None):
+        """Series from ``(period, value)`` strings."""
+        pairs = list(pairs)
+        return cls([p for p, _ in pairs], [parse_period(p) for p, _ in pairs],
+                   [parse_value(v) for _, v in pairs], name)
+
+    @classmethod
+    def from_table(cls, rows, column=None, name=None):
+        """Series from a table whose first column is the period and ``column`` (index or header) the value.
+
+        With no ``column``, the first column whose body cells are mostly
+        figures is used. Rows whose first cell isn't a period are skipped.
+        """
+        header, body = rows[0], [r for r in rows[1:] if parse_period(r[0]) is not None]
+        if isinstance(column, str):
+            column = header.index(column)
+        if column is None:
+            column = next((c for c in range(1, len(header)) if body and
+                           sum(parse_value(r[c]) is not None for r in body if c < len(r)) * 2 > len(body)), None)
+            if column is None:
+                raise ValueError(f"no column of figures in table {header!r}")
+        return cls.parse(((r[0], r[column]) for r in body), name or header[column])
+
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def mid(self):
+        return (self.low + self.high) / 2
+
+    def content_key(self):
+        """Hash of what the series was parsed into (so equal figures written differently share it)."""
+        return content_hash(json.dumps([self.labels, self.start.tolist(), self.freq.tolist(), self.low.tolist(),
+                                        self.high.tolist(), self.approx.tolist(), self.kind], allow_nan=True))
+
+    def select(self, freq="Y"):
+        """The rows of one frequency (``"Y"``, ``"H"`` or ``"Q"``)."""
+        keep = np.flatnonzero(self.freq == freq)
+        out = MetricSeries.__new__(MetricSeries)
+        out.name, out.kind = self.name, self.kind
+        out.labels = [self.labels[i] for i in keep]
+        for field in ("start", "freq", "low", "high", "approx"):
+            setattr(out, field, getattr(self, field)[keep])
+        return out
+
+    def growth(self):
+        """Change against the same period a year earlier (a fraction), NaN where there is none."""
+        # Quarter numbers; rows without a period (NaN start) get 0 and are skipped below by their empty freq
+        key = np.round(np.nan_to_num(self.start * 4)).astype(np.int64)
+        index = {(f, k): i for i, (f, k) in enumerate(zip(self.freq, key)) if f}
+        prev = np.array([index.get((f, k - 4), -1) for f, k in zip(self.freq, key)], dtype=np.int64)
+        mid = self.mid
+        base = np.where(prev >= 0, mid[np.maximum(prev, 0)], np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(base > 0, mid / base - 1, np.nan)
+
+    def cagr(self):
+        """Compound annual growth between the first and last years with a value; NaN if fewer than two."""
+        years = self.select("Y")
+        ok = np.flatnonzero(~np.isnan(years.mid) & (years.mid > 0))
+        if len(ok) < 2:
+            return math.nan
+        first, last = ok[0], ok[-1]
+        return float((years.mid[last] / years.mid[first]) ** (1 / (years.start[last] - years.start[first])) - 1)
+
+    def formatted(self):
+        """The values written back out (``"~$49.3M"``, ``"+4%"``), ``"—"`` where missing."""
+        if self.kind == "percent":
+            return [format_percent(m, a) for m, a in zip(self.mid, self.approx)]
+        if self.kind == "price":
+            return ["—" if math.isnan(lo) else f"{'~' if a else ''}${lo:.2f}/share"
+                    for lo, a in zip(self.low, self.approx)]
+        return [format_money(lo, hi, a) for lo, hi, a in zip(self.low, self.high, self.approx)]
+
+
+class Panel:
+    """Yearly values of many series on one axis of years (``values[series, year]``, NaN where missing)."""
+
+    def __init__(self, series):
+        self.series = list(series)
+        annual = [s.select("Y") for s in self.series]
+        years = sorted({int(y) for s in annual for y in s.start})
+        self.years = np.array(years, dtype=np.int64)
+        self.values = np.full((len(annual), len(years)), np.nan)
+        for row, s in enumerate(annual):
+            self.values[row, np.searchsorted(self.years, s.start.astype(np.int64))] = s.mid
+
+    def growth(self):
+        """Year-over-year growth, same shape as ``values`` (NaN in the first year and after gaps)."""
+        out = np.full(self.values.shape, np.nan)
+        if self.values.shape[1] > 1:
+            consecutive = np.diff(self.years) == 1
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = self.values[:, 1:] / self.values[:, :-1] - 1
+            out[:, 1:] = np.where(consecutive & (self.values[:, :-1] > 0), ratio, np.nan)
+        return out
+
+    def cagr(self):
+        """CAGR of every series between its first and last positive year (NaN if fewer than two)."""
+        n = self.values.shape[1]
+        if not n:                            # no annual rows in any series
+            return np.full(len(self.values), np.nan)
+        ok = ~np.isnan(self.values) & (self.values > 0)
+        has = ok.sum(axis=1) >= 2
+        first = np.argmax(ok, axis=1)
+        last = n - 1 - np.argmax(ok[:, ::-1], axis=1)
+        rows = np.arange(len(self.values))
+        span = (self.years[last] - self.years[first]).astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = (self.values[rows, last] / self.values[rows, first]) ** (1 / span) - 1
+        return np.where(has & (span > 0), rate, np.nan)
+
+
+def _nan_to_none(values):
+    return [None if isinstance(v, float) and math.isnan(v) else v for v in values]
+
+
+def summarize(series, cache=None):
+    """Derived figures of each series: ``{"growth": [...per row], "cagr": x, "first": year, "last": year}``.
+
+    Computed for all uncached series in one ``Panel`` and cached by content;
+    NaN comes back as None.
+    """
+    keys = [s.content_key() for s in series]
+    out = [_summaries.get(k) for k in keys]
+    missing = [i for i, v in enumerate(out) if v is None]
+    if missing:
+        cache = JsonCache("metrics", METRICS_VERSION) if cache is None else cache
+        for i in missing:
+            out[i] = cache.get(keys[i])
+        todo = [i for i in missing if out[i] is None]
+        if todo:
+            panel = Panel(series[i] for i in todo)
+            cagrs = panel.cagr() if len(panel.years) else np.full(len(todo), np.nan)
+            ok = ~np.isnan(panel.values) & (panel.values > 0)
+            for row, i in enumerate(todo):
+                years = panel.years[ok[row]]
+                out[i] = cache.put(keys[i], {
+                    "growth": _nan_to_none(series[i].growth().tolist()),
+                    "cagr": None if math.isnan(cagrs[row]) else float(cagrs[row]),
+                    "first": int(years[0]) if len(years) else None,
+                    "last": int(years[-1]) if len(years) else None,
+                })
+        for i in missing:
+            _summaries[keys[i]] = out[i]
+    return out
+
+
+def growth_labels(series, stated=()):
+    """Formatted YoY growth per row; rows without a prior period keep the ``stated`` text (or ``"—"``)."""
+    growth = summarize([series])[0]["growth"]
+    stated = list(stated) + [None] * (len(growth) - len(stated))
+    return [format_percent(g) if g is not None else (s or "—") for g, s in zip(growth, stated)]
+
+
+def chart_block(series, kind="column", freq="Y", **placement):
+    """A ``chart`` block of the ``freq`` rows of ``series`` that have a value (ranges at their midpoint)."""
+    rows = series.select(freq)
+    keep = [i for i, v in enumerate(rows.mid) if not math.isnan(v)]
+    number_format = {"money": '"$"#,##0.0"M"', "percent": "0%", "price": '"$"#,##0.00'}[series.kind]
+    return dict({"type": "chart", "chart": kind, "categories": [rows.labels[i] for i in keep],
+                 "series": [{"name": series.name or "", "values": [round(float(rows.mid[i]), 3) for i in keep]}],
+                 "number_format": number_format}, **placement)
@@ -0,0 +1,209 @@
+"""Split content slides whose blocks run past the bottom of the page.
+
+Every block is measured (``deckgen.measure``): tables row by row, bullets
+item by item, text boxes by their wrapped lines. A slide whose blocks all
+fit is left exactly as it is. Otherwise, walking its blocks top to bottom:
+
+* a block that starts inside a block above it in the same column (e.g. a
+  table that grew taller than its author allowed for) is moved down below
+  that block;
+* a table that runs past the bottom keeps the rows that fit, and the rest
+  continues on a new slide under a repeat of its header row. Bullets are
+  split the same way, between items;
+* a block that can't be split, or of which nothing fits, moves to the next
+  slide whole, together with a bold heading right above it.
+
+Continuation slides repeat the slide's title with " (cont.)" and its
+palette and subtitle. Their content starts at ``CONTENT_TOP``. Blocks that
+follow a split or moved block keep their vertical distance to it.
+
+``deckgen.builder``, ``deckgen.incremental`` and ``deckgen.stream`` paginate
+every spec before building it. Paginating a paginated spec changes nothing.
+"""
+
+CONTENT_TOP = 1.5
+CONTENT_WIDTH = 12.3
+BLOCK_GAP = 0.15
+BOTTOM_MARGIN = 0.4                  # CONTENT_BOTTOM is the page height minus this
+CONTENT_BOTTOM = 7.5 - BOTTOM_MARGIN
+
+_SLACK = 0.02                        # inches of overlap / overflow put down to rounding
+
+# Defaults of the block builders in deckgen.builder: (left, width, font size)
+_DEFAULTS = {
+    "table": (0.5, 12.3, 12),
+    "bullets": (0.5, 12, 14),
+    "text": (0.5, 12, 18),
+    "image": (0.5, None, None),
+    "chart": (0.5, 6, None),
+}
+
+
+def table_widths(block):
+    """Column widths (inches) of a table block, as ``deckgen.shapes.add_table`` lays them out."""
+    from .tables import grid_widths
+
+    width = int(block.get("width", _DEFAULTS["table"][1]) * 914400)
+    col_widths = [int(w * 914400) for w in block.get("col_widths") or ()]
+    return [w / 914400 for w in grid_widths(width, len(block["rows"][0]), col_widths)]
+
+
+def table_row_heights(block):
+    from .measure import row_heights
+
+    return row_heights(block["rows"], table_widths(block))
+
+
+def block_height(block):
+    """Height in inches that ``block`` takes up once rendered."""
+    from .measure import paragraphs_height, text_height
+
+    kind = block["type"]
+    _, width, size = _DEFAULTS.get(kind, (0.5, 12, 14))
+    if kind == "table":
+        return sum(table_row_heights(block))
+    if kind == "bullets":
+        return paragraphs_height(block["items"], block.get("width", width), block.get("font_size", size),
+                                 block.get("spacing", 8))
+    if kind == "text":
+        measured = text_height(block["text"], block.get("width", width), block.get("font_size", size),
+                               block.get("bold", False))
+        return max(block.get("height", 0.4), measured)
+    if kind == "image":
+        if block.get("height") is not None:
+            return block["height"]
+        from .assets import source
+
+        src = source(block["src"])
+        return block["width"] * src.height / src.width
+    if kind == "chart":
+        return block.get("height", 3)
+    return block.get("height", 0)
+
+
+def _span(block):
+    left, width, _ = _DEFAULTS.get(block["type"], (0.5, 12, 14))
+    left = block.get("left", left)
+    if block["type"] == "table":
+        return left, left + sum(table_widths(block))
+    if block["type"] == "image" and block.get("width") is None:
+        return left, left + block_height(block)          # narrow enough for overlap checks
+    return left, left + block.get("width", width)
+
+
+def _top(block):
+    return block.get("top", CONTENT_TOP)
+
+
+def _split(block, room):
+    """``(head, rest)`` of a table or bullets ``block`` with ``head`` at most ``room`` inches tall.
+
+    ``head`` is None when not even one row / item fits; ``rest`` is None when
+    everything does.
+    """
+    if block["type"] == "table":
+        heights = table_row_heights(block)
+        rows = block["rows"]
+        used, n = heights[0], 1
+        while n < len(rows) and used + heights[n] <= room + _SLACK:
+            used += heights[n]
+            n += 1
+        if n == len(rows):
+            return block, None
+        if n == 1:
+            return None, block
+        return dict(block, rows=rows[:n]), dict(block, rows=rows[:1] + rows[n:])
+    if block["type"] == "bullets":
+        items = block["items"]
+        for n in range(len(items), 0, -1):
+            head = dict(block, items=items[:n])
+            if block_height(head) <= room + _SLACK:
+                break
+        else:
+            return None, block
+        if n == len(items):
+            return block, None
+        return _fit_box(head), _fit_box(dict(block, items=items[n:]))
+    return (block, None) if block_height(block) <= room + _SLACK else (None, block)
+
+
+def _fit_box(block):
+    # A split bullets box gets the height of what it holds
+    return dict(block, height=round(block_height(block), 2))
+
+
+def _fits(blocks, bottom):
+    spans = []
+    for block in blocks:
+        top, height = _top(block), block_height(block)
+        if top + height > bottom + _SLACK:
+            return False
+        left, right = _span(block)
+        if any(l < right and left < r and t < top + height and top < b - _SLACK for l, r, t, b in spans):
+            return False
+        spans.append((left, right, top, top + height))
+    return True
+
+
+def paginate_slide(slide, bottom=CONTENT_BOTTOM):
+    """``[slide]`` if its blocks fit above ``bottom``, else the slide and its continuations."""
+    blocks = slide.get("blocks")
+    if slide.get("layout", "content") != "content" or not blocks or _fits(blocks, bottom):
+        return [slide]
+
+    pages = [[]]
+    placed = []                  # (left, right, bottom) of the blocks on the current page
+    delta = 0.0                  # added to the original tops of the blocks still to place
+
+    def new_page():
+        pages.append([])
+        placed.clear()
+
+    def place(block, top):
+        block = dict(block, top=round(top, 2))
+        pages[-1].append(block)
+        left, right = _span(block)
+        placed.append((left, right, top + block_height(block)))
+        return top + block_height(block)
+
+    for block in blocks:
+        original, height = _top(block), block_height(block)
+        top = max(original + delta, min(original, CONTENT_TOP))
+        left, right = _span(block)
+        above = [b for l, r, b in placed if l < right and left < r and b - _SLACK > top]
+        if above:
+            top = max(above) + BLOCK_GAP
+        rest, first = block, True
+        while rest is not None:
+            head, rest = _split(rest, bottom - top)
+            if head is None and not pages[-1]:
+                head, rest = rest, None          # alone on a slide and still too tall: leave it
+            if head is None:
+                # Nothing fits: move to a new slide, with the heading right above if there is one
+                last = pages[-1][-1]
+                heading = first and len(pages[-1]) > 1 and last["type"] == "text" and last.get("bold")
+                if heading:
+                    pages[-1].pop()
+                    gap = max(BLOCK_GAP, top - placed.pop()[2])
+                new_page()
+                top = place(last, CONTENT_TOP) + gap if heading else CONTENT_TOP
+                continue
+            end = place(head, top)
+            first = False
+            if rest is not None:
+                new_page()
+                top = CONTENT_TOP
+        delta = end - (original + height)
+
+    title = slide.get("title", "")
+    cont = title if title.endswith(" (cont.)") else title + " (cont.)"
+    return [dict(slide, blocks=page) if n == 0 else dict(slide, title=cont, blocks=page)
+            for n, page in enumerate(pages) if page]
+
+
+def paginate(spec):
+    """``spec`` with every overflowing content slide split (see ``paginate_slide``)."""
+    bottom = spec.get("height", 7.5) - BOTTOM_MARGIN
+    slides = [page for slide in spec["slides"] for page in paginate_slide(slide, bottom)]
+    return spec if len(slides) == len(spec["slides"]) and all(
+        a is b for a, b in zip(slides, spec["slides"])) else dict(spec, slides=slides)
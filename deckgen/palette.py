@@ -0,0 +1,102 @@
+"""Colour constants and per-company palettes.
+
+Colours are kept as ``RRGGBB`` hex strings so that deck specs stay plain
+JSON and this module can be imported without loading python-pptx.
+"""
+
+from collections import namedtuple
+
+# === COLORS ===
+WHITE = "FFFFFF"
+DARK_GRAY = "333333"
+MED_GRAY = "666666"
+
+# Title / closing slides
+TITLE_BG = "0F1F33"         # near-black navy
+TITLE_SUBTITLE = "AACCEE"
+
+
+# ``tagline`` is the third line on the section cover
+Palette = namedtuple("Palette", "primary accent accent_line table_hdr table_alt light_bg subtitle tagline")
+
+
+# Danyelza / Y-mAbs palette
+DANYELZA = Palette(
+    primary="1B3A5C",       # dark navy
+    accent="3A8FD6",        # bright blue
+    accent_line="5BB5F0",   # light blue accent
+    table_hdr="1B3A5C",
+    table_alt="E3EEF8",
+    light_bg="F5F8FC",
+    subtitle="A0C4E8",
+    tagline="88AACC",
+)
+
+# Unituxin / United Therapeutics palette
+UNITUXIN = Palette(
+    primary="2B4C3F",       # dark teal-green
+    accent="4A8C72",        # muted green
+    accent_line="6BB395",   # soft sage accent
+    table_hdr="2B4C3F",
+    table_alt="E8F2ED",
+    light_bg="F2F8F5",
+    subtitle="A3CCB8",
+    tagline="99BBAA",
+)
+
+# Neutral bar used on slides that cover both companies
+NEUTRAL = Palette(
+    primary="2A2A3A",
+    accent="8888AA",
+    accent_line="8888AA",
+    table_hdr="2A2A3A",
+    table_alt="EEEEF4",
+    light_bg="F7F7FA",
+    subtitle="AAAACC",
+    tagline="AAAACC",
+)
+
+PALETTES = {
+    "danyelza": DANYELZA,
+    "unituxin": UNITUXIN,
+    "neutral": NEUTRAL,
+}
+
+# Flat aliases matching the original script's constant names
+DZ_PRIMARY = DANYELZA.primary
+DZ_ACCENT = DANYELZA.accent
+DZ_ACCENT_LINE = DANYELZA.accent_line
+DZ_TABLE_HDR = DANYELZA.table_hdr
+DZ_TABLE_ALT = DANYELZA.table_alt
+DZ_LIGHT_BG = DANYELZA.light_bg
+DZ_SUBTITLE = DANYELZA.subtitle
+
+UT_PRIMARY = UNITUXIN.primary
+UT_ACCENT = UNITUXIN.accent
+UT_ACCENT_LINE = UNITUXIN.accent_line
+UT_TABLE_HDR = UNITUXIN.table_hdr
+UT_TABLE_ALT = UNITUXIN.table_alt
+UT_LIGHT_BG = UNITUXIN.light_bg
+UT_SUBTITLE = UNITUXIN.subtitle
+
+
+def get_palette(value):
+    """Resolve a palette name, dict of fields or ``Palette`` to a ``Palette``."""
+    if isinstance(value, Palette):
+        return value
+    if isinstance(value, str):
+        try:
+            return PALETTES[value]
+        except KeyError:
+            raise ValueError(f"unknown palette {value!r}") from None
+    if isinstance(value, dict):
+        fields = dict(value)
+        fields.setdefault("table_hdr", fields.get("primary"))
+        fields.setdefault("accent_line", fields.get("accent"))
+        fields.setdefault("light_bg", WHITE)
+        fields.setdefault("tagline", fields.get("subtitle"))
+        try:
+            return Palette(**fields)
+        except TypeError as exc:
+            raise ValueError(f"invalid palette {value!r}: {exc}") from None
+    raise ValueError(f"invalid palette {value!r}")
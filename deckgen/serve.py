@@ -0,0 +1,477 @@
+"""Render decks over HTTP: ``python -m deckgen serve``.
+
+A small asyncio HTTP/1.1 server (``asyncio.start_server``, no framework)
+around the deck builder, for the website and internal tools::
+
+    POST /decks              body: a deck spec (JSON) -> the .pptx
+    GET  /decks/<name>       a built-in deck (anti-gd2, deal-comps) -> the .pptx
+    GET  /metrics            request latency, cache and worker counters (JSON)
+    GET  /healthz            "ok"
+
+Decks are built in a process pool of ``workers`` processes, each with
+python-pptx imported once, and serialized into memory: nothing is written
+to disk. The event loop only parses requests, hashes specs and copies
+bytes, so slow builds never hold up other requests or cache hits.
+
+Rendered decks are kept in an LRU cache bounded by total size and keyed
+by ``deckgen.fingerprint.deck_fingerprint``, the hash of the canonical
+spec (palettes resolved, images pinned to their content). Asking for a
+deck again returns the cached bytes without building; identical requests
+that arrive while the deck is being built wait for that one build. The
+fingerprint is also the response's ``ETag``, so a client sending
+``If-None-Match`` gets a 304 without the deck being built or sent.
+
+At most ``max_pending`` different decks are queued or being built at a
+time. Past that, a request for a deck that isn't cached or already being
+built gets ``503`` with ``Retry-After``.
+
+Image blocks in posted specs must name files inside the repository: their
+``src`` is resolved against the repository root only (never the server's
+working directory), symlinks followed, and anything that lands outside it
+is rejected; a service should not read arbitrary files on behalf of its
+callers.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_MB = 256
+MAX_BODY = 16 * 1024 * 1024          # bytes of spec JSON accepted
+HEADER_TIMEOUT = 30                  # seconds to send the request line and headers
+LATENCY_WINDOW = 1024                # requests kept for the latency percentiles
+
+PPTX_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=()):
+        super().__init__(message)
+        self.status = status
+        self.headers = list(headers)
+
+
+# ================================================================
+# WORKERS
+# ================================================================
+
+def _warm():
+    # Pay for the python-pptx import once per worker, not once per deck
+    from . import builder  # noqa: F401
+
+
+def _render(spec):
+    """Build ``spec`` in a worker; returns ``(pptx bytes, slides, build seconds)``."""
+    import io
+
+    from .builder import build_deck, save
+
+    start = time.perf_counter()
+    buf = io.BytesIO()
+    prs = build_deck(spec)
+    save(prs, buf)
+    return buf.getvalue(), len(prs.slides), time.perf_counter() - start
+
+
+def check_spec(spec):
+    """Raise ``ValueError`` unless ``spec`` looks like a deck spec this service will build.
+
+    Image ``src`` values are rewritten to the real path of the file under
+    ``assets.ROOT`` they name.
+    """
+    from .assets import ROOT
+
+    root = os.path.realpath(ROOT)
+    if not isinstance(spec, dict) or not isinstance(spec.get("slides"), list):
+        raise ValueError("a deck spec is a JSON object with a 'slides' list")
+    for n, slide in enumerate(spec["slides"], 1):
+        if not isinstance(slide, dict):
+            raise ValueError(f"slide {n} is not an object")
+        for block in slide.get("blocks") or ():
+            if not isinstance(block, dict):
+                raise ValueError(f"slide {n}: a block is not an object")
+            if block.get("type") == "image":
+                src = block.get("src")
+                path = os.path.realpath(os.path.join(root, src)) if isinstance(src, str) and src else None
+                if path is None or os.path.isabs(src) or os.path.commonpath([root, path]) != root:
+                    raise ValueError(f"slide {n}: image src must be a path inside the repository, not {src!r}")
+                block["src"] = path
+
+
+# ================================================================
+# CACHE AND METRICS
+# ================================================================
+
+class DeckCache:
+    """Rendered decks by fingerprint, least recently used first out once over ``max_bytes``."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._decks = OrderedDict()          # fingerprint -> (data, slides)
+
+    def __len__(self):
+        return len(self._decks)
+
+    def __contains__(self, key):
+        return key in self._decks
+
+    def get(self, key):
+        deck = self._decks.get(key)
+        if deck is not None:
+            self._decks.move_to_end(key)
+        return deck
+
+    def put(self, key, data, slides):
+        if len(data) > self.max_bytes:
+            return
+        if key in self._decks:
+            self.bytes -= len(self._decks.pop(key)[0])
+        self._decks[key] = (data, slides)
+        self.bytes += len(data)
+        while self.bytes > self.max_bytes:
+            _, (old, _) = self._decks.popitem(last=False)
+            self.bytes -= len(old)
+
+
+def percentiles(values, points=(50, 90, 99)):
+    """Nearest-rank percentiles of ``values`` as ``{"p50": ..., ...}``, plus the max."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    result = {f"p{p}": ordered[max(0, -(-len(ordered) * p // 100) - 1)] for p in points}
+    result["max"] = ordered[-1]
+    return result
+
+
+class Metrics:
+    """Counters and recent latencies, as served by ``GET /metrics``."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.requests = 0
+        self.statuses = {}
+        self.cache = {"hit": 0, "miss": 0, "shared": 0, "not_modified": 0}
+        self.builds = 0
+        self.build_failures = 0
+        self.rejected = 0
+        self._latency = {}                   # cache outcome -> recent latencies (ms)
+        self._build = deque(maxlen=LATENCY_WINDOW)
+
+    def request(self, status, seconds, outcome=None):
+        self.requests += 1
+        self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+        if outcome is not None:
+            self.cache[outcome] += 1
+        key = outcome or "other"
+        self._latency.setdefault(key, deque(maxlen=LATENCY_WINDOW)).append(round(seconds * 1000, 2))
+
+    def build(self, seconds):
+        self.builds += 1
+        self._build.append(round(seconds * 1000, 2))
+
+    def snapshot(self, service):
+        served = self.cache["hit"] + self.cache["shared"] + self.cache["not_modified"]
+        lookups = served + self.cache["miss"]
+        return {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "status": dict(sorted(self.statuses.items())),
+            "cache": dict(self.cache, hit_ratio=round(served / lookups, 4) if lookups else None,
+                          entries=len(service.cache), bytes=service.cache.bytes, max_bytes=service.cache.max_bytes),
+            "builds": {"completed": self.builds, "failed": self.build_failures, "pending": len(service.building),
+                       "max_pending": service.max_pending, "workers": service.workers,
+                       "rejected": self.rejected, "ms": percentiles(self._build)},
+            "latency_ms": {k: dict(percentiles(v), count=len(v)) for k, v in sorted(self._latency.items())},
+        }
+
+
+# ================================================================
+# SERVICE
+# ================================================================
+
+class DeckService:
+    """Deck rendering with an LRU result cache, shared in-flight builds and a bounded queue.
+
+    ``await service.render(spec)`` returns ``(fingerprint, data, slides,
+    outcome)`` where ``outcome`` is ``"hit"``, ``"shared"`` (waited for a
+    build another request started) or ``"miss"``. Raises ``ValueError`` for
+    a spec that can't be built and ``HTTPError`` (503) when the queue is
+    full.
+    """
+
+    def __init__(self, workers=None, max_pending=None, cache_bytes=DEFAULT_CACHE_MB * 1024 * 1024):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 4 * self.workers
+        self.cache = DeckCache(cache_bytes)
+        self.building = {}                   # fingerprint -> asyncio.Future of (data, slides)
+        self.metrics = Metrics()
+        self._pool = None
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm)
+        return self._pool
+
+    async def start(self):
+        """Start every worker now, so the first requests don't wait for python-pptx to import."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _warm) for _ in range(self.workers)))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    @staticmethod
+    def fingerprint(spec):
+        from .fingerprint import deck_fingerprint
+
+        try:
+            return deck_fingerprint(spec)
+        except OSError as exc:               # an image that doesn't exist
+            raise ValueError(f"{exc.strerror}: {exc.filename}") from None
+
+    async def render(self, spec, key=None):
+        key = key or self.fingerprint(spec)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return key, cached[0], cached[1], "hit"
+        if key in self.building:
+            data, slides = await asyncio.shield(self.building[key])
+            return key, data, slides, "shared"
+        if len(self.building) >= self.max_pending:
+            self.metrics.rejected += 1
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, f"{len(self.building)} decks already queued",
+                            [("Retry-After", "1")])
+
+        future = asyncio.get_running_loop().create_future()
+        self.building[key] = future
+        try:
+            data, slides, seconds = await self._build(spec)
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()               # retrieved: don't warn when nobody else was waiting
+            raise
+        finally:
+            del self.building[key]
+        self.metrics.build(seconds)
+        self.cache.put(key, data, slides)
+        future.set_result((data, slides))
+        return key, data, slides, "miss"
+
+    async def _build(self, spec):
+        loop = asyncio.get_running_loop()
+        pool = self.pool
+        try:
+            return await loop.run_in_executor(pool, _render, spec)
+        except BrokenProcessPool:
+            # A worker died (out of memory, killed): reap this pool, start a fresh one for the next request
+            self.metrics.build_failures += 1
+            if self._pool is pool:
+                self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        except TypeError as exc:
+            # A well-formed spec with a field of the wrong shape ({"rows": 5}): the caller's mistake
+            self.metrics.build_failures += 1
+            raise ValueError(f"invalid spec: {exc}") from None
+        except Exception:
+            self.metrics.build_failures += 1
+            raise
+
+
+# ================================================================
+# HTTP
+# ================================================================
+
+async def read_request(reader):
+    """``(method, target, headers, body)`` of the next request, or None at end of stream.
+
+    ``target`` is the request target as sent, query string included.
+    """
+    line = await asyncio.wait_for(reader.readline(), HEADER_TIMEOUT)
+    if not line.strip():
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "malformed request line") from None
+    headers = {}
+    while True:
+        line = await asyncio.wait_for(reader.readline(), HEADER_TIMEOUT)
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    headers[":version"] = version
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "send the spec with a Content-Length")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "bad Content-Length") from None
+    if length > MAX_BODY:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"specs are limited to {MAX_BODY} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+def response(status, body=b"", content_type="application/json", headers=(), keep_alive=True):
+    status = HTTPStatus(status)
+    head = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    if body or status == HTTPStatus.OK:
+        head.append(f"Content-Type: {content_type}")
+    head += [f"{name}: {value}" for name, value in headers]
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+
+def json_body(value):
+    return json.dumps(value, indent=2).encode("utf-8") + b"\n"
+
+
+def error(status, message, headers=()):
+    """A ``Server.handle`` result for an error: a JSON body ``{"error": message}``."""
+    return status, json_body({"error": message}), "application/json", list(headers), None
+
+
+class Server:
+    """The HTTP front end of a ``DeckService``; ``log`` gets one line per request."""
+
+    def __init__(self, service, log=None):
+        self.service = service
+        self.log = log
+
+    async def handle(self, method, path, headers, body):
+        """``(status, body, content type, extra headers, cache outcome)`` for one request."""
+        if path == "/healthz":
+            return HTTPStatus.OK, b"ok\n", "text/plain", [], None
+        if path == "/metrics":
+            if method != "GET":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "use GET", [("Allow", "GET")])
+            return HTTPStatus.OK, json_body(self.service.metrics.snapshot(self.service)), "application/json", [], None
+        if path == "/decks" or path == "/decks/":
+            if method != "POST":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "POST a deck spec", [("Allow", "POST")])
+            try:
+                spec = json.loads(body)
+            except ValueError as exc:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"spec is not valid JSON: {exc}") from None
+            check_spec(spec)
+            name = spec.get("name") or "deck"
+            return await self.deck(spec, f"{name}.pptx", headers)
+        if path.startswith("/decks/"):
+            from .decks import DECKS, default_output, load_spec
+
+            if method != "GET":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "use GET", [("Allow", "GET")])
+            name = path[len("/decks/"):]
+            if name not in DECKS:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"no built-in deck {name!r} ({', '.join(sorted(DECKS))})")
+            return await self.deck(load_spec(name), default_output(name), headers)
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"no such endpoint {path}")
+
+    async def deck(self, spec, filename, headers):
+        key = self.service.fingerprint(spec)
+        etag = f'"{key}"'
+        if etag in headers.get("if-none-match", ""):
+            return HTTPStatus.NOT_MODIFIED, b"", PPTX_TYPE, [("ETag", etag)], "not_modified"
+        key, data, slides, outcome = await self.service.render(spec, key)
+        extra = [("ETag", etag), ("X-Cache", outcome), ("X-Slides", str(slides)),
+                 ("Content-Disposition", f'attachment; filename="{filename}"')]
+        return HTTPStatus.OK, data, PPTX_TYPE, extra, outcome
+
+    async def __call__(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except HTTPError as exc:
+                    status, payload, content_type, extra, _ = error(exc.status, str(exc), exc.headers)
+                    writer.write(response(status, payload, content_type, extra, keep_alive=False))
+                    await writer.drain()
+                    return
+                if request is None:
+                    return
+                method, target, headers, body = request
+                path = target.split("?", 1)[0]
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and headers[":version"] != "HTTP/1.0")
+                start = time.perf_counter()
+                try:
+                    status, payload, content_type, extra, outcome = await self.handle(method, path, headers, body)
+                except HTTPError as exc:
+                    status, payload, content_type, extra, outcome = error(exc.status, str(exc), exc.headers)
+                except (ValueError, KeyError) as exc:        # a spec the builders can't make sense of
+                    message = str(exc) if isinstance(exc, ValueError) else f"missing field {exc}"
+                    status, payload, content_type, extra, outcome = error(HTTPStatus.BAD_REQUEST, message)
+                except Exception as exc:
+                    status, payload, content_type, extra, outcome = error(
+                        HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(exc).__name__}: {exc}")
+                seconds = time.perf_counter() - start
+                extra = [*extra, ("Server-Timing", f"total;dur={seconds * 1000:.1f}")]
+                writer.write(response(status, payload, content_type, extra, keep_alive))
+                await writer.drain()
+                self.service.metrics.request(int(status), seconds, outcome)
+                if self.log:
+                    self.log(f"{method} {path} {int(status)} {outcome or '-'} {len(payload)} bytes "
+                             f"{seconds * 1000:.1f} ms")
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, service=None, log=None, ready=None):
+    """Serve until cancelled or sent SIGTERM. ``ready`` is called with the listening ``(host, port)``."""
+    service = service or DeckService()
+    try:
+        server = await asyncio.start_server(Server(service, log), host, port)
+    except OSError as exc:
+        raise ValueError(f"can't listen on {host}:{port}: {os.strerror(exc.errno) if exc.errno else exc}") from None
+    try:
+        await service.start()
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, server.close)
+        except (NotImplementedError, AttributeError):        # Windows
+            pass
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[:2])
+        async with server:
+            try:
+                await server.serve_forever()
+            except asyncio.CancelledError:
+                if server.is_serving():                      # cancelled from outside, not by SIGTERM
+                    raise
+    finally:
+        service.close()
+
+
+def run(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, max_pending=None, cache_mb=DEFAULT_CACHE_MB,
+        quiet=False):
+    """Run the service in the foreground until interrupted."""
+    service = DeckService(workers, max_pending, int(cache_mb * 1024 * 1024))
+    log = None if quiet else (lambda line: print(line, file=sys.stderr, flush=True))
+
+    def ready(address):
+        print(f"serving decks on http://{address[0]}:{address[1]} ({service.workers} workers, "
+              f"{cache_mb:g} MB cache; Ctrl-C to stop)", flush=True)
+    try:
+        asyncio.run(serve(host, port, service, log, ready))
+    except KeyboardInterrupt:
+        pass
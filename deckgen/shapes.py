@@ -0,0 +1,235 @@
+"""Slide drawing helpers (backgrounds, rectangles, text boxes, bullets, tables, pictures, charts).
+
+This module imports python-pptx at load time; the package root only loads it
+on first use, see ``deckgen/__init__.py``.
+"""
+
+import io
+import weakref
+
+from pptx.dml.color import RGBColor
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
+from pptx.util import Emu, Inches, Pt
+
+from . import assets
+from .palette import DARK_GRAY, DZ_TABLE_ALT, DZ_TABLE_HDR, WHITE
+from .tables import cell_styles, replace_table, row_heights_emu
+from .trace import traced
+
+SLIDE_W = Inches(13.333)
+SLIDE_H = Inches(7.5)
+
+# Images placed so far in each package, to reuse near-duplicates (see add_picture)
+_pictures = weakref.WeakKeyDictionary()
+
+# Chart block types -> XL_CHART_TYPE members (python-pptx's chart modules load on the first chart)
+CHART_TYPES = {
+    "column": "COLUMN_CLUSTERED",
+    "bar": "BAR_CLUSTERED",
+    "line": "LINE_MARKERS",
+}
+
+ALIGNMENTS = {
+    "left": PP_ALIGN.LEFT,
+    "center": PP_ALIGN.CENTER,
+    "right": PP_ALIGN.RIGHT,
+}
+
+
+def rgb(color):
+    """Accept an ``RGBColor`` or an ``RRGGBB`` hex string."""
+    if isinstance(color, RGBColor):
+        return color
+    return RGBColor.from_string(color.lstrip("#"))
+
+
+@traced
+def add_background(slide, color):
+    slide.background.fill.solid()
+    slide.background.fill.fore_color.rgb = rgb(color)
+
+
+@traced
+def rect(slide, left, top, width, height, color):
+    s = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, left, top, width, height)
+    s.fill.solid()
+    s.fill.fore_color.rgb = rgb(color)
+    s.line.fill.background()
+    return s
+
+
+@traced
+def add_text_box(slide, left, top, width, height, text, font_size=18, color=DARK_GRAY,
+                 bold=False, alignment=PP_ALIGN.LEFT, font_name="Calibri"):
+    txBox = slide.shapes.add_textbox(left, top, width, height)
+    tf = txBox.text_frame
+    tf.word_wrap = True
+    p = tf.paragraphs[0]
+    p.text = text
+    p.font.size = Pt(font_size)
+    p.font.color.rgb = rgb(color)
+    p.font.bold = bold
+    p.font.name = font_name
+    p.alignment = alignment
+    return txBox
+
+
+@traced
+def add_bullets(slide, left, top, width, height, items, font_size=14, color=DARK_GRAY, spacing=8):
+    txBox = slide.shapes.add_textbox(left, top, width, height)
+    tf = txBox.text_frame
+    tf.word_wrap = True
+    color = rgb(color)
+    for i, item in enumerate(items):
+        p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
+        p.text = item
+        p.font.size = Pt(font_size)
+        p.font.color.rgb = color
+        p.font.name = "Calibri"
+        p.space_after = Pt(spacing)
+    return txBox
+
+
+@traced
+def add_table(slide, left, top, width, rows_data, col_widths=None, header_bg=DZ_TABLE_HDR, alt_bg=DZ_TABLE_ALT):
+    """Add a styled table; header row, then body rows with every other row shaded.
+
+    The table markup is written in one pass by ``deckgen.tables``; the output
+    matches ``add_table_per_cell``. Row heights are measured from the text
+    (see ``deckgen.measure``), so the frame is as tall as the table renders.
+    Rows shorter than the header get empty cells; longer ones are a ``ValueError``.
+    """
+    n_rows, n_cols = len(rows_data), len(rows_data[0])
+    if any(len(row) != n_cols for row in rows_data):
+        for r, row in enumerate(rows_data):
+            if len(row) > n_cols:
+                raise ValueError(f"table row {r + 1} has {len(row)} cells but the header has {n_cols}")
+        # Every <a:tr> must have one cell per <a:gridCol>
+        rows_data = [list(row) + [""] * (n_cols - len(row)) for row in rows_data]
+    tbl_shape = slide.shapes.add_table(1, 1, left, top, width, Inches(0.4 * n_rows))
+    styles = cell_styles(str(rgb(header_bg)), str(rgb(alt_bg)))
+    return replace_table(tbl_shape, rows_data, col_widths, styles)
+
+
+@traced
+def add_table_per_cell(slide, left, top, width, rows_data, col_widths=None, header_bg=DZ_TABLE_HDR,
+                       alt_bg=DZ_TABLE_ALT):
+    """Reference implementation of ``add_table`` styling each cell through python-pptx."""
+    n_rows = len(rows_data)
+    n_cols = len(rows_data[0])
+    tbl_shape = slide.shapes.add_table(n_rows, n_cols, left, top, width, Inches(0.4 * n_rows))
+    table = tbl_shape.table
+    header_bg, alt_bg = rgb(header_bg), rgb(alt_bg)
+    white, dark_gray = rgb(WHITE), rgb(DARK_GRAY)
+    if col_widths:
+        for i, w in enumerate(col_widths):
+            table.columns[i].width = w
+    heights = row_heights_emu(rows_data, [c.width for c in table.columns])
+    for row, h in zip(table.rows, heights):
+        row.height = Emu(h)
+    tbl_shape.height = Emu(sum(heights))
+    for r, row in enumerate(rows_data):
+        for c, txt in enumerate(row):
+            cell = table.cell(r, c)
+            cell.text = str(txt)
+            cell.vertical_anchor = MSO_ANCHOR.MIDDLE
+            for para in cell.text_frame.paragraphs:
+                para.font.size = Pt(12) if r > 0 else Pt(13)
+                para.font.name = "Calibri"
+                if r == 0:
+                    para.font.bold = True
+                    para.font.color.rgb = white
+                    para.alignment = PP_ALIGN.CENTER
+                else:
+                    para.font.color.rgb = dark_gray
+            if r == 0:
+                cell.fill.solid()
+                cell.fill.fore_color.rgb = header_bg
+            elif r % 2 == 0:
+                cell.fill.solid()
+                cell.fill.fore_color.rgb = alt_bg
+    return tbl_shape
+
+
+@traced
+def add_picture(slide, path, left, top, width=None, height=None):
+    """Place the image at ``path`` (see ``deckgen.assets``), fitted inside ``width`` x ``height``.
+
+    Give one dimension to size by the image's aspect ratio. The picture is
+    a variant rendered for the placed size, so the same image at the same
+    size is one image part however many slides show it. A near-duplicate of
+    an image already in the deck (``logo.png`` vs ``logo.jpg``) is drawn
+    from that image instead.
+    """
+    if width is None and height is None:
+        raise ValueError(f"picture {path!r} needs a width or a height")
+    path = assets.match(path, _pictures.setdefault(slide.part.package, []))
+    src = assets.source(path)
+    aspect = src.width / src.height
+    width = width if width is not None else round(height * aspect)
+    height = height if height is not None else round(width / aspect)
+    blob, (w, h) = assets.slide_image(path, width / 914400, height / 914400)
+    scale = min(width / w, height / h)
+    cx, cy = round(w * scale), round(h * scale)
+    return slide.shapes.add_picture(io.BytesIO(blob), Emu(left + (width - cx) // 2), Emu(top + (height - cy) // 2),
+                                    Emu(cx), Emu(cy))
+
+
+@traced
+def add_chart(slide, kind, left, top, width, height, categories, series, number_format="General",
+              colors=(DZ_TABLE_HDR,), font_size=11):
+    """Add a native chart: ``kind`` is column, bar or line, ``series`` a list of ``(name, values)``.
+
+    Values are labelled on the chart, so the value axis and gridlines are
+    left out; a legend is shown for more than one series. The data travels
+    with the chart as an embedded workbook, editable in PowerPoint.
+    """
+    if kind not in CHART_TYPES:
+        raise ValueError(f"unknown chart type {kind!r} (expected {', '.join(CHART_TYPES)})")
+    from pptx.chart.data import CategoryChartData
+    from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+
+    data = CategoryChartData(number_format=number_format)
+    data.categories = categories
+    for name, values in series:
+        data.add_series(name, values)
+    frame = slide.shapes.add_chart(getattr(XL_CHART_TYPE, CHART_TYPES[kind]), left, top, width, height, data)
+    chart = frame.chart
+    chart.font.size = Pt(font_size)
+    chart.font.name = "Calibri"
+    chart.font.color.rgb = rgb(DARK_GRAY)
+    chart.has_legend = len(series) > 1
+    if chart.has_legend:
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+    chart.value_axis.visible = False
+    chart.value_axis.has_major_gridlines = False
+    chart.category_axis.format.line.color.rgb = rgb(DARK_GRAY)
+    plot = chart.plots[0]
+    plot.has_data_labels = True
+    plot.data_labels.number_format = number_format
+    plot.data_labels.number_format_is_linked = False
+    for i, s in enumerate(plot.series):
+        color = rgb(colors[i % len(colors)])
+        if kind == "line":
+            s.format.line.color.rgb = color
+            s.marker.format.fill.solid()
+            s.marker.format.fill.fore_color.rgb = color
+        else:
+            s.format.fill.solid()
+            s.format.fill.fore_color.rgb = color
+    return frame
+
+
+@traced
+def section_title_bar(slide, title, subtitle, primary_color, accent_color, subtitle_color):
+    """Standard title bar for content slides — shows company branding."""
+    add_background(slide, WHITE)
+    rect(slide, Inches(0), Inches(0), SLIDE_W, Inches(1.2), primary_color)
+    add_text_box(slide, Inches(0.6), Inches(0.15), Inches(12), Inches(0.7),
+                 title, font_size=28, color=WHITE, bold=True)
+    if subtitle:
+        add_text_box(slide, Inches(0.6), Inches(0.75), Inches(12), Inches(0.4),
+                     subtitle, font_size=14, color=subtitle_color)
+    rect(slide, Inches(0), Inches(1.2), SLIDE_W, Inches(0.06), accent_color)
@@ -0,0 +1,194 @@
+"""Write very large decks slide by slide with bounded memory.
+
+``prs.save()`` needs every slide's lxml tree alive until the end, so memory
+grows with the deck. ``StreamingDeck`` instead serializes each slide into the
+zip as soon as it is built and detaches it from the presentation, so its tree
+(and any pictures or charts it owns) can be freed. Only the presentation
+part, master, theme and compiled layouts stay in memory. When the deck is
+closed, ``presentation.xml`` gets one ``sldId`` per streamed slide and the
+package relationships and ``[Content_Types].xml`` are written.
+
+Slides come out exactly as ``deckgen.builder.add_slide`` renders them::
+
+    with StreamingDeck("appendix.pptx", {"width": 13.333}) as deck:
+        for trial in trials:
+            deck.add_slide(trial_slide(trial))
+
+Parts owned by a slide (pictures, charts, embedded workbooks) are written
+with the slide. Leaf parts it relates to with identical bytes are stored
+once, so a logo repeated on every slide is still a single part; slides
+themselves are always written, even when two are identical.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import zipfile
+from collections import namedtuple
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.packuri import PACKAGE_URI, PackURI
+from pptx.opc.serialized import _ContentTypesItem
+from pptx.oxml.ns import qn
+
+from .builder import add_slide, new_presentation
+from .cache import file_mode
+from .paginate import BOTTOM_MARGIN, paginate_slide
+from .trace import span
+
+# Targets that stay in the package (and are written at close), not with the slide
+_SHARED_RELS = {RT.SLIDE_LAYOUT, RT.SLIDE_MASTER, RT.NOTES_MASTER, RT.THEME}
+_NUMBERED = re.compile(r"^(.*?)(\d*)(\.\w+)$")
+
+_Entry = namedtuple("_Entry", "partname content_type")
+
+
+class StreamingDeck:
+    """A .pptx written to ``path`` (a file name or binary file object) one slide at a time.
+
+    ``spec`` supplies the page size; its ``slides`` are ignored — pass each
+    slide spec to ``add_slide``. Use as a context manager, or call ``close``.
+    A file name is written through a temporary file and only replaced on a
+    successful close, keeping the replaced file's mode.
+    """
+
+    def __init__(self, path, spec=None):
+        self.prs = new_presentation(spec or {})
+        self._bottom = (spec or {}).get("height", 7.5) - BOTTOM_MARGIN
+        self.slide_count = 0
+        self._path = path
+        self._tmp = None
+        if isinstance(path, (str, os.PathLike)):
+            fd, self._tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".pptx.tmp")
+            os.close(fd)
+        self._zip = zipfile.ZipFile(self._tmp or path, "w", zipfile.ZIP_DEFLATED)
+        self._written = set()                    # member names already in the zip
+        self._blobs = {}                         # (content type, sha1) -> partname, for leaf parts
+        self._types = []                         # _Entry for every streamed part
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add_slide(self, slide_spec):
+        """Build one slide (and its continuations, see ``deckgen.paginate``), writing each to the package."""
+        for page in paginate_slide(slide_spec, self._bottom):
+            self._add_page(page)
+
+    def _add_page(self, slide_spec):
+        # Build one slide, write it to the package and drop it from memory
+        slide = add_slide(self.prs, slide_spec)
+        self.slide_count += 1
+        slide.part.partname = PackURI(f"/ppt/slides/slide{self.slide_count}.xml")
+        with span("write slide", "io"):
+            self._write_part(slide.part, set(), owned=False)
+
+        # Detach the slide so its part (and everything only it relates to) can be collected
+        sldIdLst = self.prs.part._element.get_or_add_sldIdLst()
+        sldId = sldIdLst[-1]
+        sldIdLst.remove(sldId)
+        self.prs.part.drop_rel(sldId.rId)
+
+    def _write_part(self, part, seen, owned=True):
+        """Write ``part`` and the slide-owned parts it relates to; ``owned`` is false for the slide itself."""
+        seen.add(part)
+        children = False
+        for rel in part.rels.values():
+            if rel.is_external or rel.reltype in _SHARED_RELS:
+                continue
+            children = True
+            if rel.target_part not in seen:
+                self._write_part(rel.target_part, seen)
+
+        leaf = owned and not children
+        if leaf:
+            # Identical leaf parts (the same logo on every slide) share one part
+            key = (part.content_type, hashlib.sha1(part.blob).hexdigest())
+            partname = self._blobs.get(key)
+            if partname is not None:
+                part.partname = partname
+                return
+        if part.partname.membername in self._written:
+            # python-pptx reuses the numbers of parts that were detached with earlier slides
+            part.partname = self._next_partname(part.partname)
+        if leaf:
+            self._blobs[key] = part.partname
+
+        self._write(part.partname, part.blob)
+        self._types.append(_Entry(part.partname, part.content_type))
+        if part.rels:
+            self._write(part.partname.rels_uri, part.rels.xml)
+
+    def _next_partname(self, partname):
+        head, _, ext = _NUMBERED.match(partname).groups()
+        n = 1
+        while f"{head}{n}{ext}"[1:] in self._written:
+            n += 1
+        return PackURI(f"{head}{n}{ext}")
+
+    def _write(self, partname, blob):
+        self._zip.writestr(partname.membername, blob)
+        self._written.add(partname.membername)
+
+    def close(self):
+        """Write the presentation part, remaining shared parts and content types."""
+        with span("save", "io", slides=self.slide_count):
+            try:
+                self._close()
+            except BaseException:
+                self.abort()
+                raise
+
+    def _close(self):
+        prs_part = self.prs.part
+        # Relationship ids above any the presentation part already uses
+        base = max(int(rId[3:]) for rId in prs_part.rels if rId[3:].isdigit())
+        rels = etree.fromstring(prs_part.rels.xml)
+        sldIdLst = prs_part._element.get_or_add_sldIdLst()
+        for n in range(1, self.slide_count + 1):
+            rId = f"rId{base + n}"
+            etree.SubElement(rels, qn("pr:Relationship"), Id=rId, Type=RT.SLIDE, Target=f"slides/slide{n}.xml")
+            etree.SubElement(sldIdLst, qn("p:sldId"), {"id": str(255 + n), qn("r:id"): rId})
+
+        for part in self.prs.part.package.iter_parts():
+            if part.partname.membername in self._written:
+                continue
+            self._write(part.partname, part.blob)
+            self._types.append(_Entry(part.partname, part.content_type))
+            if part is prs_part:
+                self._write(part.partname.rels_uri, serialize_part_xml(rels))
+            elif part.rels:
+                self._write(part.partname.rels_uri, part.rels.xml)
+        self._write(PACKAGE_URI.rels_uri, self.prs.part.package._rels.xml)
+        self._write(PackURI("/[Content_Types].xml"), serialize_part_xml(_ContentTypesItem.xml_for(self._types)))
+        self._zip.close()
+        if self._tmp:
+            os.chmod(self._tmp, file_mode(self._path))
+            os.replace(self._tmp, self._path)
+            self._tmp = None
+
+    def abort(self):
+        """Close without finishing the package; a partial file at ``path`` is never left behind."""
+        self._zip.close()
+        if self._tmp:
+            os.remove(self._tmp)
+            self._tmp = None
+
+
+def stream_deck(spec, path):
+    """Build ``spec`` into ``path`` one slide at a time; ``spec["slides"]`` may be any iterable.
+
+    Returns the number of slides written.
+    """
+    with StreamingDeck(path, spec) as deck:
+        for slide_spec in spec["slides"]:
+            deck.add_slide(slide_spec)
+    return deck.slide_count
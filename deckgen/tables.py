@@ -0,0 +1,129 @@
+"""Bulk writer for styled tables.
+
+``add_table`` in ``deckgen.shapes`` used to style each cell through the
+python-pptx proxies (``cell.text``, ``paragraph.font.*``, ``cell.fill``), which
+costs several lxml lookups per property per cell. Here the whole ``a:tbl``
+element is rendered as one XML string from precompiled per-row-kind templates
+and parsed once. The markup is exactly what the per-cell path produces, so
+decks are byte-identical either way.
+"""
+
+import re
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+
+from .measure import row_heights
+from .palette import DARK_GRAY, WHITE
+
+TABLE_STYLE_ID = "{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}"  # python-pptx default
+
+_CTRL_CHARS = re.compile(r"([\x00-\x08\x0B-\x1F])")
+_LINE_BREAK = re.compile("\n|\v")
+
+
+def _escape_ctrl(match):
+    return "_x%04X_" % ord(match.group(1))
+
+
+def _defrpr(size, color, bold=False):
+    b = ' b="1"' if bold else ""
+    return (f'<a:defRPr sz="{size * 100}"{b}>'
+            f'<a:solidFill><a:srgbClr val="{color}"/></a:solidFill>'
+            f'<a:latin typeface="Calibri"/></a:defRPr>')
+
+
+def _solid_tcpr(color):
+    return f'<a:tcPr anchor="ctr"><a:solidFill><a:srgbClr val="{color}"/></a:solidFill></a:tcPr>'
+
+
+class CellStyles:
+    """Precompiled ``a:pPr`` / ``a:tcPr`` markup for header, body and alternating rows."""
+
+    def __init__(self, header_bg, alt_bg):
+        header_bg, alt_bg = header_bg.upper(), alt_bg.upper()
+        self.header_ppr = f'<a:pPr algn="ctr">{_defrpr(13, WHITE, bold=True)}</a:pPr>'
+        self.body_ppr = f"<a:pPr>{_defrpr(12, DARK_GRAY)}</a:pPr>"
+        self.header_tcpr = _solid_tcpr(header_bg)
+        self.body_tcpr = '<a:tcPr anchor="ctr"/>'
+        self.alt_tcpr = _solid_tcpr(alt_bg)
+
+    def row(self, r):
+        """(pPr, tcPr) markup for row index ``r``."""
+        if r == 0:
+            return self.header_ppr, self.header_tcpr
+        if r % 2 == 0:
+            return self.body_ppr, self.alt_tcpr
+        return self.body_ppr, self.body_tcpr
+
+
+@lru_cache(maxsize=64)
+def cell_styles(header_bg, alt_bg):
+    return CellStyles(header_bg, alt_bg)
+
+
+def _paragraphs(text, ppr):
+    # Same splitting as TextFrame.text: "\n" starts a paragraph, "\v" a line break
+    out = []
+    for p_text in text.split("\n"):
+        runs = []
+        for idx, r_str in enumerate(_LINE_BREAK.split(p_text)):
+            if idx > 0:
+                runs.append("<a:br/>")
+            if r_str:
+                runs.append(f"<a:r><a:t>{escape(_CTRL_CHARS.sub(_escape_ctrl, r_str))}</a:t></a:r>")
+        out.append(f"<a:p>{ppr}{''.join(runs)}</a:p>")
+    return "".join(out)
+
+
+def table_xml(rows_data, col_widths, row_heights, styles):
+    """Return the ``a:tbl`` markup for ``rows_data``; ``col_widths`` and ``row_heights`` are EMU."""
+    parts = [f"<a:tbl {nsdecls('a')}>"
+             f'<a:tblPr firstRow="1" bandRow="1"><a:tableStyleId>{TABLE_STYLE_ID}</a:tableStyleId></a:tblPr>'
+             "<a:tblGrid>"]
+    parts.extend(f'<a:gridCol w="{w}"/>' for w in col_widths)
+    parts.append("</a:tblGrid>")
+    for r, row in enumerate(rows_data):
+        ppr, tcpr = styles.row(r)
+        parts.append(f'<a:tr h="{row_heights[r]}">')
+        for txt in row:
+            parts.append(f"<a:tc><a:txBody><a:bodyPr/><a:lstStyle/>{_paragraphs(str(txt), ppr)}"
+                         f"</a:txBody>{tcpr}</a:tc>")
+        parts.append("</a:tr>")
+    parts.append("</a:tbl>")
+    return "".join(parts)
+
+
+def grid_widths(width, n_cols, col_widths=None):
+    """Column widths in EMU: ``width`` split evenly, then overridden by ``col_widths``."""
+    colwidth = width // n_cols
+    widths = [colwidth] * n_cols
+    widths[-1] = width - (n_cols - 1) * colwidth
+    for i, w in enumerate(col_widths or ()):
+        widths[i] = int(w)
+    return widths
+
+
+def row_heights_emu(rows_data, widths):
+    """Measured height of each row (see ``deckgen.measure.row_heights``) in EMU, for columns ``widths`` EMU wide."""
+    return [round(h * 914400) for h in row_heights(rows_data, [w / 914400 for w in widths])]
+
+
+def replace_table(graphic_frame, rows_data, col_widths, styles):
+    """Swap the table inside ``graphic_frame`` for a fully styled one in a single parse.
+
+    Rows are as tall as their text needs (at least 0.4"), and the frame is
+    resized to fit them.
+    """
+    n_cols = len(rows_data[0])
+    widths = grid_widths(graphic_frame.width, n_cols, col_widths)
+    heights = row_heights_emu(rows_data, widths)
+    tbl = parse_xml(table_xml(rows_data, widths, heights, styles))
+    graphicData = graphic_frame._element.graphic.graphicData
+    graphicData.replace(graphicData.tbl, tbl)
+    if col_widths:
+        graphic_frame.width = sum(widths)
+    graphic_frame.height = sum(heights)
+    return graphic_frame
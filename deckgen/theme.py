@@ -0,0 +1,188 @@
+"""Compile slide chrome into slide layouts.
+
+The title bar, section covers and title/closing slides used to be drawn as
+fresh rectangles and text boxes on every slide. ``Theme`` instead compiles
+each (chrome kind, palette) combination into a real slide layout on the
+deck's master the first time it is needed: background, bars and accent
+lines become layout shapes, and the text becomes placeholders carrying the
+font, size, colour and alignment. Slides built on such a layout only hold
+placeholder references with their text.
+
+Chrome kinds match the slide layouts of ``deckgen.builder``: ``content``,
+``cover``, ``title`` and ``closing``. Placeholder indexes are listed in
+``PLACEHOLDERS``.
+"""
+
+import weakref
+
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+from pptx.parts.slide import SlideLayoutPart
+from pptx.util import Inches
+
+from .palette import TITLE_BG, TITLE_SUBTITLE, WHITE
+from .trace import span
+
+SLIDE_W_IN = 13.333
+
+# Placeholder idx for each text role, per chrome kind (idx 0 is the title)
+PLACEHOLDERS = {
+    "content": {"title": 0, "subtitle": 1},
+    "cover": {"title": 0, "company": 1, "tagline": 2},
+    "title": {"title": 0, "subtitle": 1},
+    "closing": {"title": 0, "subtitle": 1},
+}
+
+_ALIGN = {"left": "l", "center": "ctr", "right": "r"}
+
+
+def _rect(x, y, cx, cy, color):
+    return (f'<p:sp><p:nvSpPr><p:cNvPr id="0" name="Rectangle"/><p:cNvSpPr/><p:nvPr userDrawn="1"/></p:nvSpPr>'
+            f'<p:spPr><a:xfrm><a:off x="{Inches(x)}" y="{Inches(y)}"/><a:ext cx="{Inches(cx)}" cy="{Inches(cy)}"/>'
+            f'</a:xfrm><a:prstGeom prst="rect"><a:avLst/></a:prstGeom>'
+            f'<a:solidFill><a:srgbClr val="{color}"/></a:solidFill><a:ln><a:noFill/></a:ln></p:spPr></p:sp>')
+
+
+def _placeholder(role, idx, x, y, cx, cy, size, color, bold=False, align="left"):
+    ph = '<p:ph type="title"/>' if idx == 0 else f'<p:ph type="body" idx="{idx}"/>'
+    b = ' b="1"' if bold else ""
+    return (f'<p:sp><p:nvSpPr><p:cNvPr id="0" name="{role.title()} Placeholder"/>'
+            f'<p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr><p:nvPr>{ph}</p:nvPr></p:nvSpPr>'
+            f'<p:spPr><a:xfrm><a:off x="{Inches(x)}" y="{Inches(y)}"/><a:ext cx="{Inches(cx)}" cy="{Inches(cy)}"/>'
+            f'</a:xfrm></p:spPr>'
+            f'<p:txBody><a:bodyPr wrap="square" lIns="91440" tIns="45720" rIns="91440" bIns="45720" anchor="t">'
+            f'<a:noAutofit/></a:bodyPr><a:lstStyle>'
+            f'<a:lvl1pPr marL="0" indent="0" algn="{_ALIGN[align]}"><a:lnSpc><a:spcPct val="100000"/></a:lnSpc>'
+            f'<a:spcBef><a:spcPts val="0"/></a:spcBef><a:buNone/>'
+            f'<a:defRPr sz="{size * 100}"{b}><a:solidFill><a:srgbClr val="{color}"/></a:solidFill>'
+            f'<a:latin typeface="Calibri"/></a:defRPr></a:lvl1pPr></a:lstStyle>'
+            f'<a:p><a:r><a:rPr lang="en-US"/><a:t>{role.title()}</a:t></a:r></a:p></p:txBody></p:sp>')
+
+
+def content_chrome(palette, spec):
+    """Title bar for content slides — shows company branding."""
+    return WHITE, [
+        _rect(0, 0, SLIDE_W_IN, 1.2, palette.primary),
+        _placeholder("title", 0, 0.6, 0.15, 12, 0.7, 28, WHITE, bold=True),
+        _placeholder("subtitle", 1, 0.6, 0.75, 12, 0.4, 14, palette.subtitle),
+        _rect(0, 1.2, SLIDE_W_IN, 0.06, palette.accent),
+    ]
+
+
+def cover_chrome(palette, spec):
+    return palette.primary, [
+        _rect(0.8, 2.8, 11.733, 0.05, palette.accent_line),
+        _placeholder("title", 0, 1, 3.1, 11.333, 1.0, 44, WHITE, bold=True, align="center"),
+        _placeholder("company", 1, 1, 4.3, 11.333, 0.5, 22, palette.subtitle, align="center"),
+        _placeholder("tagline", 2, 1, 5.0, 11.333, 0.5, 15, palette.tagline, align="center"),
+        _rect(0.8, 5.6, 11.733, 0.05, palette.accent_line),
+    ]
+
+
+def title_chrome(palette, spec):
+    return spec.get("background", TITLE_BG), [
+        _rect(2, 2.0, 9.333, 0.05, palette.accent),
+        _placeholder("title", 0, 1, 2.3, 11.333, 1.5, 40, WHITE, bold=True, align="center"),
+        _placeholder("subtitle", 1, 1, 4.2, 11.333, 0.6, 20, spec.get("subtitle_color", TITLE_SUBTITLE),
+                     align="center"),
+        _rect(2, 5.1, 9.333, 0.05, palette.accent),
+    ]
+
+
+def closing_chrome(palette, spec):
+    return spec.get("background", TITLE_BG), [
+        _rect(2, 2.8, 9.333, 0.05, palette.accent),
+        _placeholder("title", 0, 1, 3.1, 11.333, 1.0, 44, WHITE, bold=True, align="center"),
+        _placeholder("subtitle", 1, 1, 4.3, 11.333, 0.8, 18, spec.get("subtitle_color", TITLE_SUBTITLE),
+                     align="center"),
+        _rect(2, 5.4, 9.333, 0.05, palette.accent),
+    ]
+
+
+CHROME = {
+    "content": content_chrome,
+    "cover": cover_chrome,
+    "title": title_chrome,
+    "closing": closing_chrome,
+}
+
+
+def layout_xml(name, background, shapes):
+    xml = (f'<p:sldLayout {nsdecls("a", "r", "p")} preserve="1" userDrawn="1">'
+           f'<p:cSld name="{name}">'
+           f'<p:bg><p:bgPr><a:solidFill><a:srgbClr val="{background}"/></a:solidFill><a:effectLst/></p:bgPr></p:bg>'
+           f'<p:spTree><p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+           f'<p:grpSpPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="0" cy="0"/>'
+           f'<a:chOff x="0" y="0"/><a:chExt cx="0" cy="0"/></a:xfrm></p:grpSpPr>'
+           f'{"".join(shapes)}</p:spTree></p:cSld>'
+           f'<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sldLayout>')
+    sldLayout = parse_xml(xml)
+    for n, cNvPr in enumerate(sldLayout.iter(qn("p:cNvPr"))):
+        if n:
+            cNvPr.set("id", str(n + 1))
+            cNvPr.set("name", f"{cNvPr.get('name')} {n}")
+    return sldLayout
+
+
+class Theme:
+    """Slide layouts compiled for one presentation, created on first use."""
+
+    def __init__(self, prs):
+        self.prs = prs
+        self._layouts = {}
+
+    def layout(self, kind, palette, spec):
+        """The compiled layout for chrome ``kind`` in ``palette`` (plus any ``spec`` colour overrides)."""
+        background, shapes = CHROME[kind](palette, spec)
+        key = (kind, background, *shapes)
+        layout = self._layouts.get(key)
+        if layout is None:
+            name = f"deckgen {kind} {palette.primary}/{palette.accent}"
+            with span(name, "theme") as s:
+                layout = self._layouts[key] = self._add_layout(layout_xml(name, background, shapes))
+                s.measure(layout._element)
+        return layout
+
+    def _add_layout(self, sldLayout):
+        master = self.prs.slide_master
+        master_part = master.part
+        package = master_part.package
+        partname = package.next_partname("/ppt/slideLayouts/slideLayout%d.xml")
+        layout_part = SlideLayoutPart(partname, CT.PML_SLIDE_LAYOUT, package, sldLayout)
+        layout_part.relate_to(master_part, RT.SLIDE_MASTER)
+        rId = master_part.relate_to(layout_part, RT.SLIDE_LAYOUT)
+
+        # Layout ids share one number space with the master ids in presentation.xml
+        used = [int(e.get("id")) for e in master._element.iter(qn("p:sldLayoutId"))]
+        used += [int(e.get("id")) for e in self.prs.part._element.iter(qn("p:sldMasterId"))]
+        sldLayoutIdLst = master._element.get_or_add_sldLayoutIdLst()
+        entry = sldLayoutIdLst._add_sldLayoutId()
+        entry.set("id", str(max(used) + 1))
+        entry.set(qn("r:id"), rId)
+        return layout_part.slide_layout
+
+
+_themes = weakref.WeakKeyDictionary()
+
+
+def theme_for(prs):
+    """The ``Theme`` attached to ``prs`` (keyed by its part; ``Presentation`` isn't hashable)."""
+    theme = _themes.get(prs.part)
+    if theme is None:
+        theme = _themes[prs.part] = Theme(prs)
+    return theme
+
+
+def fill_placeholders(slide, kind, values):
+    """Set placeholder text on ``slide``; placeholders with no text are removed."""
+    for role, idx in PLACEHOLDERS[kind].items():
+        text = values.get(role)
+        placeholder = next((p for p in slide.placeholders if p.placeholder_format.idx == idx), None)
+        if placeholder is None:
+            continue
+        if text:
+            placeholder.text_frame.paragraphs[0].text = text
+        else:
+            placeholder.element.getparent().remove(placeholder.element)
@@ -0,0 +1,182 @@
+"""Build instrumentation: timed spans written as a Chrome trace-event file.
+
+Tracing is off by default. While it is off, ``span()`` returns a shared
+no-op object and ``@traced`` helpers call straight through after one
+global check, so a normal build pays next to nothing.
+
+While it is on, every slide (``deckgen.builder.add_slide``), layout
+compile, slide helper (``add_table``, ``add_bullets``, ``add_text_box``,
+``rect``, ...) and save is recorded with its duration and, where there is
+XML behind it, the number of shapes, the number of XML elements and the
+serialized size in bytes. Measuring happens after a span closes and its
+cost is taken off the trace clock, so it doesn't inflate enclosing spans.
+
+The output loads in chrome://tracing, https://ui.perfetto.dev or
+speedscope. An optional cProfile capture (``.prof``, for snakeviz or
+``python -m pstats``) covers the same stretch::
+
+    from deckgen import trace
+
+    with trace.tracing("build.trace.json", profile="build.prof"):
+        save_deck(spec, "out.pptx")
+
+or ``python -m deckgen --trace build.trace.json --profile build.prof build``.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+_P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+_SHAPE_TAGS = (_P + "sp", _P + "graphicFrame", _P + "pic", _P + "grpSp", _P + "cxnSp")
+
+_tracer = None
+
+
+def measure(element):
+    """Shape count, XML element count and serialized size of an lxml ``element``."""
+    from lxml import etree
+
+    shapes = elements = 0
+    for e in element.iter():
+        elements += 1
+        if e.tag in _SHAPE_TAGS:
+            shapes += 1
+    return {"shapes": shapes, "elements": elements, "bytes": len(etree.tostring(element))}
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "element", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.element = None
+
+    def __enter__(self):
+        self.start = self.tracer.now()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.record(self, self.tracer.now())
+
+    def set(self, **args):
+        """Attach extra ``args`` to the event."""
+        self.args.update(args)
+
+    def measure(self, element):
+        """Report shapes / elements / bytes of ``element`` when the span closes."""
+        self.element = element
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+    def set(self, **args):
+        pass
+
+    def measure(self, element):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects complete ("X") trace events for one process."""
+
+    def __init__(self):
+        self.events = []
+        self._origin = time.perf_counter()
+        self._overhead = 0.0                     # seconds spent measuring, hidden from the clock
+        self._pid = os.getpid()
+
+    def now(self):
+        return time.perf_counter() - self._overhead
+
+    def record(self, span, end):
+        if span.element is not None:
+            start = time.perf_counter()
+            span.args.update(measure(span.element))
+            self._overhead += time.perf_counter() - start
+        self.events.append({
+            "name": span.name, "cat": span.cat, "ph": "X", "pid": self._pid, "tid": threading.get_ident(),
+            "ts": round((span.start - self._origin) * 1e6, 3), "dur": round((end - span.start) * 1e6, 3),
+            "args": span.args,
+        })
+
+    def write(self, path):
+        # Parents first at equal timestamps, so viewers nest spans correctly
+        events = sorted(self.events, key=lambda e: (e["ts"], -e["dur"]))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def span(name, cat="deck", **args):
+    """Context manager timing one span; a shared no-op when tracing is off."""
+    if _tracer is None:
+        return _NULL_SPAN
+    return _Span(_tracer, name, cat, args)
+
+
+def traced(func):
+    """Record every call of a slide helper as a span measuring the shape it returns."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _tracer is None:
+            return func(*args, **kwargs)
+        with _Span(_tracer, name, "helper", {}) as s:
+            result = func(*args, **kwargs)
+            s.measure(getattr(result, "_element", None))
+        return result
+
+    return wrapper
+
+
+def enable():
+    """Start collecting spans; returns the ``Tracer``."""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def disable():
+    """Stop collecting spans; returns the ``Tracer`` that was active (or None)."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+@contextlib.contextmanager
+def tracing(path=None, profile=None):
+    """Trace the enclosed block into ``path`` and/or cProfile it into ``profile``."""
+    profiler = None
+    if profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    tracer = enable() if path else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield tracer
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile)
+        if tracer is not None:
+            disable()
+            tracer.write(path)
@@ -0,0 +1,309 @@
+"""Watch mode: keep decks up to date while their sources are edited.
+
+``python -m deckgen watch`` stays running with python-pptx and lxml imported
+and the markdown/asset caches warm. Every deck is built once at start-up,
+and after that it is rebuilt only when one of the files it is made from
+changes:
+
+* an analysis deck: its ``.md`` files;
+* a JSON spec: the spec file;
+* a built-in deck: its module under ``deckgen/decks`` and the data files it
+  lists in ``SOURCES`` (the module is reloaded, so ``SPEC`` is recomputed);
+* any deck: the images its ``image`` blocks show.
+
+Rebuilds go through ``deckgen.incremental``, so only the slides whose
+fingerprint changed are rendered. Changes are picked up with Linux inotify
+(through ctypes, watching the parent directories so editors that save by
+renaming a temporary file are seen too) or, where that isn't available, by
+polling mtimes. A burst of events, such as an editor writing a backup and
+then the file, is debounced into a single rebuild: nothing is built until
+no event has arrived for ``debounce`` seconds.
+
+Changes to deckgen's own builders, palettes or a batch manifest need a
+restart.
+"""
+
+import ctypes
+import ctypes.util
+import importlib
+import importlib.util
+import os
+import select
+import struct
+import sys
+import time
+import traceback
+
+from .trace import span
+
+DEFAULT_DEBOUNCE = 0.15          # seconds without events before rebuilding
+DEFAULT_POLL_INTERVAL = 0.25     # seconds between stats when polling
+
+# inotify(7) event bits
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+
+# Writes are reported when the file is closed, so a rebuild never reads a half-written file
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_ATTRIB
+
+_EVENT = struct.Struct("iIII")           # wd, mask, cookie, len; followed by len bytes of name
+
+
+# ================================================================
+# WATCHERS — ``watch(paths)``, ``changes(timeout) -> set of paths``, ``close()``
+# ================================================================
+
+class InotifyWatcher:
+    """Changed files, as reported by inotify on their directories."""
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc.inotify_init1.argtypes = [ctypes.c_int]
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1: {os.strerror(err)}")
+        self._dirs = {}                  # directory -> watch descriptor
+        self._wds = {}                   # watch descriptor -> directory
+        self.files = set()
+
+    def watch(self, paths):
+        """Watch exactly ``paths`` (files; they don't have to exist yet if their directory does)."""
+        self.files = {os.path.abspath(p) for p in paths}
+        wanted = {os.path.dirname(p) for p in self.files}
+        for d in set(self._dirs) - wanted:
+            self._libc.inotify_rm_watch(self._fd, self._dirs.pop(d))
+        for d in wanted - set(self._dirs):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(d), WATCH_MASK)
+            if wd >= 0:
+                self._dirs[d] = wd
+                self._wds[wd] = d
+
+    def changes(self, timeout=None):
+        """Watched files changed since the last call, waiting up to ``timeout`` seconds for the first."""
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            pos = 0
+            while pos < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, pos)
+                name = data[pos + _EVENT.size:pos + _EVENT.size + length].rstrip(b"\0")
+                pos += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    changed |= self.files
+                elif wd in self._wds and name:
+                    path = os.path.join(self._wds[wd], os.fsdecode(name))
+                    if path in self.files:
+                        changed.add(path)
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """Changed files, found by comparing their mtime and size every ``interval`` seconds."""
+
+    def __init__(self, interval=DEFAULT_POLL_INTERVAL):
+        self.interval = interval
+        self._stats = {}
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    @property
+    def files(self):
+        return set(self._stats)
+
+    def watch(self, paths):
+        paths = {os.path.abspath(p) for p in paths}
+        self._stats = {p: self._stats[p] if p in self._stats else self._stat(p) for p in paths}
+
+    def changes(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if wait > 0:
+                time.sleep(wait)
+            changed = set()
+            for path, old in self._stats.items():
+                new = self._stat(path)
+                if new != old:
+                    self._stats[path] = new
+                    changed.add(path)
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def open_watcher(poll=None):
+    """An ``InotifyWatcher``, or a ``PollingWatcher`` if ``poll`` (an interval) is given or inotify fails."""
+    if poll is None and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):             # no libc, no inotify symbols, out of instances
+            pass
+    return PollingWatcher(poll or DEFAULT_POLL_INTERVAL)
+
+
+# ================================================================
+# TARGETS — a deck, where its spec comes from and which files it is made from
+# ================================================================
+
+def image_sources(spec):
+    """Paths of the images shown by ``spec``'s image blocks."""
+    from .assets import resolve
+
+    return [resolve(block["src"]) for slide in spec["slides"] for block in slide.get("blocks", ())
+            if block.get("type") == "image"]
+
+
+class Target:
+    """One watched deck.
+
+    ``load()`` returns ``(spec, source files)``; it is called for the first
+    build and again whenever one of the files it returned (or an image in
+    the spec) changes. ``files`` seeds the watch set with the sources known
+    up front, so a spec that fails to load is still rebuilt once it's fixed.
+    """
+
+    def __init__(self, name, output, load, files=()):
+        self.name = name
+        self.output = output
+        self._load = load
+        self._known = {os.path.abspath(p) for p in files}
+        self.files = set(self._known)
+
+    def build(self):
+        """(Re)build the deck; returns ``(slides, rendered, reused)``."""
+        from .incremental import rebuild_deck
+
+        spec, sources = self._load()
+        # Keep watching the new sources even if the build below fails
+        self.files = self._known | {os.path.abspath(p) for p in (*sources, *image_sources(spec))}
+        rendered, reused = rebuild_deck(spec, self.output)
+        return rendered + reused, rendered, reused
+
+
+def deck_target(name_or_path, output=None):
+    """Target for a deck as ``python -m deckgen build`` takes it (built-in name, JSON spec or .md)."""
+    from .decks import DECKS, default_output, load_spec
+
+    output = output or default_output(name_or_path)
+    if name_or_path not in DECKS:
+        return Target(os.path.basename(output), output, lambda: (load_spec(name_or_path), [name_or_path]),
+                      [name_or_path])
+
+    loaded = []
+
+    def load():
+        # Re-execute the module so SPEC is recomputed from the current data
+        module = importlib.reload(loaded[0]) if loaded else importlib.import_module(DECKS[name_or_path])
+        loaded[:] = [module]
+        return module.SPEC, [module.__file__, *getattr(module, "SOURCES", ())]
+    return Target(os.path.basename(output), output, load, [importlib.util.find_spec(DECKS[name_or_path]).origin])
+
+
+def analysis_target(sources, output=None, title=None, subtitle=None):
+    """Target for an analysis deck; ``sources`` is a list of ``(path, palette)`` pairs."""
+    from .markdown import analysis_spec
+
+    output = output or os.path.splitext(os.path.basename(sources[0][0]))[0] + ".pptx"
+    return Target(os.path.basename(output), output,
+                  lambda: (analysis_spec(sources, title=title, subtitle=subtitle), [p for p, _ in sources]),
+                  [p for p, _ in sources])
+
+
+def manifest_targets(path, output_dir=None):
+    """Targets for every deck in a batch manifest (see ``deckgen.batch``)."""
+    from .batch import load_manifest
+
+    jobs, default_dir = load_manifest(path)
+    output_dir = output_dir or default_dir
+    os.makedirs(output_dir, exist_ok=True)
+    targets = []
+    for job in jobs:
+        output = os.path.join(output_dir, job["name"] + ".pptx")
+        if "sources" in job:
+            sources = [(s["analysis"], s.get("palette", "danyelza")) for s in job["sources"]]
+            targets.append(analysis_target(sources, output, job.get("title"), job.get("subtitle")))
+        else:
+            targets.append(deck_target(job["spec"], output))
+    return targets
+
+
+# ================================================================
+# LOOP
+# ================================================================
+
+def _rebuild(target, changed=(), since=None):
+    """Build ``target``; returns a result dict and never raises.
+
+    ``seconds`` is the build time and ``latency`` the time from the first
+    change event (``since``, a ``time.perf_counter()`` value) to the deck
+    being written.
+    """
+    start = time.perf_counter()
+    result = {"name": target.name, "path": target.output, "changed": sorted(changed), "slides": 0,
+              "rendered": 0, "reused": 0, "error": None}
+    try:
+        with span(target.name, "watch", changed=len(result["changed"])):
+            result["slides"], result["rendered"], result["reused"] = target.build()
+    except Exception:
+        result["error"] = traceback.format_exc()
+    end = time.perf_counter()
+    result["seconds"] = round(end - start, 4)
+    result["latency"] = None if since is None else round(end - since, 4)
+    return result
+
+
+def watch(targets, debounce=DEFAULT_DEBOUNCE, poll=None, watcher=None):
+    """Build every target, then yield a result dict (see ``_rebuild``) for every rebuild.
+
+    Runs until the caller stops iterating. ``poll`` (seconds) forces the
+    polling watcher.
+    """
+    from . import builder  # noqa: F401  -- pay for python-pptx once, before the first change
+
+    watcher = watcher or open_watcher(poll)
+    try:
+        for target in targets:
+            yield _rebuild(target)
+        watcher.watch(set().union(*(t.files for t in targets)))
+        while True:
+            changed = watcher.changes()
+            if not changed:
+                continue
+            since = time.perf_counter()
+            while True:
+                more = watcher.changes(debounce)
+                if not more:
+                    break
+                changed |= more
+            for target in targets:
+                if target.files & changed:
+                    yield _rebuild(target, target.files & changed, since)
+            watcher.watch(set().union(*(t.files for t in targets)))
+    finally:
+        watcher.close()
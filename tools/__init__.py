@@ -0,0 +1,6 @@
+"""Build-time tools for the static dashboard pages.
+
+Each tool is a module run from the repository root, e.g.
+``python -m tools.prv_layout``. They read the data embedded in the pages
+(``nodesData``, ``RAW_DATA``, ``DEALS``, ...) with ``tools.jsdata``.
+"""
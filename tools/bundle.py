@@ -0,0 +1,103 @@
+"""Columnar bundles: dictionary-encoded columns with inverted indexes per facet.
+
+A bundle replaces an array of row objects in a page. Rows are stored column
+by column, so each key is written once instead of once per row::
+
+    {
+      "version": 1,
+      "rows": 519,
+      "fields": ["name", "tumor", ...],           # original key order
+      "columns": {
+        "name": {"values": [...]},                # plain column
+        "moa_raw": {"dict": [...], "codes": [...]},   # dictionary-encoded
+        "tumor": {"dict": [...], "index": [[0, 7, ...], ...]}   # facet
+      }
+    }
+
+Facet columns carry an inverted index instead of codes: ``index[k]`` holds
+the (ascending) row numbers whose value is ``dict[k]``. The page gets codes
+back from the index in one pass, and a filter on a facet is a lookup of
+the matching rows, not a scan. ``dict`` is sorted, so it doubles as the
+facet's option list. Other columns are dictionary-encoded only when that is
+smaller than writing the values out.
+
+``databundle.js`` is the browser-side reader; ``decode`` here is its Python
+twin.
+"""
+
+import json
+
+BUNDLE_VERSION = 1
+
+
+def _sort_key(value):
+    # Numbers, then strings, then null, the way the facet menus list them
+    if value is None:
+        return (2, "")
+    if isinstance(value, str):
+        return (1, value)
+    return (0, value)
+
+
+def _size(value):
+    return len(json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+
+
+def encode(rows, facets=()):
+    """Bundle for ``rows`` (a list of dicts), with an inverted index for each field in ``facets``."""
+    fields = list(dict.fromkeys(key for row in rows for key in row))
+    missing = [f for f in facets if f not in fields]
+    if missing:
+        raise ValueError(f"facet field(s) not in the data: {', '.join(missing)}")
+
+    columns = {}
+    for field in fields:
+        values = [row.get(field) for row in rows]
+        if any(isinstance(v, (list, dict)) for v in values):
+            # Lists and objects can't be dictionary entries: write the column out as is
+            if field in facets:
+                raise ValueError(f"facet field {field!r} has list or object values")
+            columns[field] = {"values": values}
+            continue
+        # Keyed by type as well, so True and 1 (or 2024 and 2024.0) stay distinct values
+        keys = [(type(v), v) for v in values]
+        distinct = sorted(dict.fromkeys(keys), key=lambda key: _sort_key(key[1]))
+        code = {key: k for k, key in enumerate(distinct)}
+        dictionary = [v for _, v in distinct]
+        if field in facets:
+            index = [[] for _ in distinct]
+            for i, key in enumerate(keys):
+                index[code[key]].append(i)
+            columns[field] = {"dict": dictionary, "index": index}
+            continue
+        encoded = {"dict": dictionary, "codes": [code[key] for key in keys]}
+        columns[field] = encoded if _size(encoded) < _size(values) else {"values": values}
+    return {"version": BUNDLE_VERSION, "rows": len(rows), "fields": fields, "columns": columns}
+
+
+def column(bundle, field):
+    """The decoded values of one column, in row order."""
+    col = bundle["columns"][field]
+    if "values" in col:
+        return col["values"]
+    if "codes" in col:
+        return [col["dict"][k] for k in col["codes"]]
+    values = [None] * bundle["rows"]
+    for value, rows in zip(col["dict"], col["index"]):
+        for i in rows:
+            values[i] = value
+    return values
+
+
+def decode(bundle):
+    """The rows of ``bundle`` as a list of dicts (keys in the original order)."""
+    if bundle.get("version") != BUNDLE_VERSION:
+        raise ValueError(f"bundle version {bundle.get('version')!r}, expected {BUNDLE_VERSION}")
+    fields = bundle["fields"]
+    columns = [column(bundle, f) for f in fields]
+    return [dict(zip(fields, values)) for values in zip(*columns)]
+
+
+def dumps(bundle):
+    """Compact JS/JSON source for ``bundle``, safe to inline in a ``<script>``."""
+    return json.dumps(bundle, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
@@ -0,0 +1,88 @@
+"""Compile the dashboards' data into columnar bundles (see ``tools.bundle``).
+
+For each dataset in ``tools.datasets`` this reads the rows from ``data/``
+and writes the bundle into the page as ``const <NAME>_BUNDLE = {...};``.
+The page decodes it with ``databundle.js``. A page that still carries a
+plain row array (``const RAW_DATA = [...]``) is converted on the first run,
+and its rows are saved to ``data/`` if the source file doesn't exist yet.
+Datasets with a ``snapshot_var`` also get their precomputed aggregates
+(``deckgen.deals.load_snapshot``, shared with the deck builds) written as
+``const <NAME>_SNAPSHOT = {...};`` right after the rows::
+
+    python -m tools.bundle_data                # every dataset
+    python -m tools.bundle_data deals --check  # exit 1 if the page is stale
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+from . import bundle
+from .datasets import DATASETS, get_dataset, load_rows, save_rows, source_path
+from .jsdata import find, read_page, write_page
+
+
+def bundle_page(dataset, html, rows):
+    """``html`` with the dataset's bundle (re)written; converts a legacy row literal."""
+    source = bundle.dumps(bundle.encode(rows, dataset.facets))
+    try:
+        start, end = find(html, dataset.bundle_var)
+    except ValueError:
+        start, end = find(html, dataset.rows_var)
+        decl = re.compile(r"\b(?:const|let|var)\s+" + re.escape(dataset.rows_var) + r"\s*=\s*$")
+        m = decl.search(html, 0, start)
+        html = (f"{html[:m.start()]}const {dataset.bundle_var} = {source};\n"
+                f"const {dataset.rows_var} = DataBundle.rows({dataset.bundle_var})" + html[end:])
+    else:
+        html = html[:start] + source + html[end:]
+    return snapshot_page(dataset, html, rows) if dataset.snapshot_var else html
+
+
+def snapshot_page(dataset, html, rows):
+    """``html`` with the dataset's snapshot (re)written, declared after the rows if it is new."""
+    from deckgen.deals import snapshot_for_rows
+
+    source = bundle.dumps(snapshot_for_rows(rows))
+    try:
+        start, end = find(html, dataset.snapshot_var)
+    except ValueError:
+        decl = re.compile(r"\b(?:const|let|var)\s+" + re.escape(dataset.rows_var) + r"\s*=[^;]*;")
+        end = decl.search(html, find(html, dataset.bundle_var)[1]).end()
+        return html[:end] + f"\nconst {dataset.snapshot_var} = {source};" + html[end:]
+    return html[:start] + source + html[end:]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tools.bundle_data", description=__doc__.splitlines()[0])
+    parser.add_argument("datasets", nargs="*", metavar="DATASET", help=f"default: all ({', '.join(DATASETS)})")
+    parser.add_argument("--check", action="store_true", help="don't write; exit 1 if a page is out of date")
+    args = parser.parse_args(argv)
+
+    stale = 0
+    for name in args.datasets or DATASETS:
+        dataset = get_dataset(name)
+        start = time.perf_counter()
+        rows = load_rows(name)
+        if not os.path.exists(source_path(dataset)) and not args.check:
+            save_rows(name, rows)
+            print(f"{name}: extracted {len(rows)} rows from {dataset.page} to {dataset.source}")
+        html = read_page(dataset.page)
+        new = bundle_page(dataset, html, rows)
+        if new == html:
+            print(f"{name}: {dataset.page} is up to date")
+            continue
+        stale += 1
+        if args.check:
+            print(f"{name}: {dataset.page} is out of date")
+            continue
+        write_page(dataset.page, new)
+        print(f"{name}: {len(rows)} rows, {len(dataset.facets)} facets -> {dataset.page} "
+              f"({len(html.encode()) / 1024:.0f} KB -> {len(new.encode()) / 1024:.0f} KB, "
+              f"{time.perf_counter() - start:.2f}s)")
+    return 1 if args.check and stale else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
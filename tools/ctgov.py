@@ -0,0 +1,501 @@
+"""Refresh the trials dataset's ClinicalTrials.gov fields from the registry.
+
+Every row of the trials dataset (``data/oncology_trials.json``, bundled
+into oncology_dashboard_final_dvn.html as ``RAW_DATA``) that has an
+``nct_id`` gets its ``ct_url``, ``ct_title`` (the brief title) and
+``ct_status`` (the overall status) from the ClinicalTrials.gov API::
+
+    python -m tools.ctgov refresh              # fetch what is missing or stale, rewrite data + page
+    python -m tools.ctgov refresh --dry-run    # report what would change
+    python -m tools.ctgov refresh --base-url http://127.0.0.1:8790/api/v2
+    python -m tools.ctgov mock --port 8790     # a local stand-in for the registry
+
+Studies are fetched ``batch`` ids per request (``filter.ids``), over a
+pool of ``concurrency`` keep-alive connections (asyncio streams, no
+third-party client), at most ``rate`` requests per second. Connection
+errors, timeouts, 429 and 5xx answers are retried with exponential
+backoff (honouring ``Retry-After``); a batch that still fails is reported
+and its trials keep their current values.
+
+Results go into an SQLite cache (``ctgov.sqlite`` under
+``$DECKGEN_CACHE_DIR``) with an expiry per record: trials that are still
+running are refetched after ``--ttl`` hours, closed ones (completed,
+terminated, withdrawn) after ``--closed-ttl``, ids the registry doesn't
+know after ``--ttl``. Only ids that are missing or expired are fetched,
+so a refresh of a mostly cached dataset makes few or no requests.
+
+The rows are written back to ``data/`` and the page's bundle rebuilt (see
+``tools.bundle_data``) only if a value changed. The mock server answers
+``GET /studies`` from a JSON file of studies (by default the dataset's
+current values) and can inject failures and latency to exercise the
+retry path.
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import random
+import re
+import sqlite3
+import sys
+import time
+import zlib
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from deckgen.cache import default_cache_dir
+
+from .bundle_data import bundle_page
+from .datasets import get_dataset, load_rows, save_rows
+from .jsdata import read_page, write_page
+
+DATASET = "trials"
+BASE_URL = "https://clinicaltrials.gov/api/v2"
+STUDY_URL = "https://clinicaltrials.gov/study/{}"
+FIELDS = "NCTId,BriefTitle,OverallStatus"
+
+DEFAULT_BATCH = 100                  # ids per request
+DEFAULT_CONCURRENCY = 4              # connections / requests in flight
+DEFAULT_RATE = 0.8                   # requests per second (the public API allows about 50 a minute)
+DEFAULT_TTL = 24                     # hours, trials still running and unknown ids
+DEFAULT_CLOSED_TTL = 30 * 24         # hours, trials that are over
+RETRIES = 4
+TIMEOUT = 30                         # seconds per request
+
+CLOSED = {"COMPLETED", "TERMINATED", "WITHDRAWN", "NO_LONGER_AVAILABLE"}
+
+_NCT = re.compile(r"NCT\d{8}")
+
+
+def nct_id(row):
+    """The row's NCT id, normalized (from ``nct_id``, else ``ct_url``), or None."""
+    for value in (row.get("nct_id"), row.get("ct_url")):
+        m = _NCT.search((value or "").upper())
+        if m:
+            return m.group(0)
+    return None
+
+
+# ================================================================
+# HTTP — a small keep-alive client over asyncio streams
+# ================================================================
+
+class HTTPStatusError(Exception):
+    def __init__(self, status, headers, body):
+        super().__init__(f"HTTP {status}: {body[:200].decode('utf-8', 'replace').strip()}")
+        self.status = status
+        self.headers = headers
+
+
+class HTTPClient:
+    """GET requests to one origin over at most ``size`` reused HTTP/1.1 connections."""
+
+    def __init__(self, base_url, size=DEFAULT_CONCURRENCY, timeout=TIMEOUT):
+        url = urlsplit(base_url)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError(f"not an http(s) URL: {base_url!r}")
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.ssl = url.scheme == "https"
+        self.base = url.path.rstrip("/")
+        self.timeout = timeout
+        self.requests = 0
+        self.connections = 0
+        self._idle = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def _connect(self):
+        self.connections += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl or None)
+
+    async def get(self, path, params):
+        """``(status, headers, body)``; raises ``HTTPStatusError`` for anything but 200."""
+        target = f"{self.base}{path}?{urlencode(params, safe=',')}"
+        async with self._slots:
+            while True:
+                reused = bool(self._idle)
+                reader, writer = self._idle.pop() if reused else await self._connect()
+                try:
+                    status, headers, body, keep = await asyncio.wait_for(
+                        self._exchange(reader, writer, target), self.timeout)
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    writer.close()
+                    if reused:                   # the server closed an idle connection: try a new one
+                        continue
+                    raise
+                break
+            self.requests += 1
+            if keep:
+                self._idle.append((reader, writer))
+            else:
+                writer.close()
+        if status != 200:
+            raise HTTPStatusError(status, headers, body)
+        return status, headers, body
+
+    async def _exchange(self, reader, writer, target):
+        host = self.host if self.port in (80, 443) else f"{self.host}:{self.port}"
+        writer.write((f"GET {target} HTTP/1.1\r\nHost: {host}\r\nAccept: application/json\r\n"
+                      f"Accept-Encoding: gzip\r\nUser-Agent: deckgen-ctgov\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise asyncio.IncompleteReadError(b"", None)
+        version, status = status_line.decode("latin-1").split()[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        keep = headers.get("connection", "").lower() != "close" and version != "HTTP/1.0"
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if not size:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass                     # trailers
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body, keep = await reader.read(), False
+        if headers.get("content-encoding") == "gzip":
+            body = gzip.decompress(body)
+        elif headers.get("content-encoding") == "deflate":
+            body = zlib.decompress(body)
+        return int(status), headers, body, keep
+
+    def close(self):
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+class RateLimiter:
+    """Lets through at most ``rate`` callers per second (token bucket of ``burst``)."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def _backoff(attempt, retry_after=None):
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    return min(30.0, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+# ================================================================
+# REGISTRY
+# ================================================================
+
+def parse_studies(payload):
+    """``{nct_id: {"title", "status"}}`` from a ``/studies`` response."""
+    studies = {}
+    for study in payload.get("studies", ()):
+        section = study.get("protocolSection", {})
+        nct = section.get("identificationModule", {}).get("nctId")
+        if nct:
+            studies[nct.upper()] = {"title": section.get("identificationModule", {}).get("briefTitle", ""),
+                                    "status": section.get("statusModule", {}).get("overallStatus", "")}
+    return studies
+
+
+async def fetch_batch(client, limiter, ids, retries=RETRIES):
+    """Studies for ``ids`` (following pages), retrying transient failures."""
+    params = {"filter.ids": ",".join(ids), "fields": FIELDS, "pageSize": len(ids), "format": "json"}
+    studies = {}
+    while True:
+        for attempt in range(retries + 1):
+            await limiter.acquire()
+            try:
+                _, _, body = await client.get("/studies", params)
+                break
+            except HTTPStatusError as exc:
+                if exc.status != 429 and exc.status < 500 or attempt == retries:
+                    raise
+                delay = _backoff(attempt, exc.headers.get("retry-after"))
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                if attempt == retries:
+                    raise
+                delay = _backoff(attempt)
+            await asyncio.sleep(delay)
+        payload = json.loads(body)
+        studies.update(parse_studies(payload))
+        if not payload.get("nextPageToken"):
+            return studies
+        params = dict(params, pageToken=payload["nextPageToken"])
+
+
+# ================================================================
+# CACHE
+# ================================================================
+
+class TrialCache:
+    """Fetched studies in SQLite, each with its own expiry time."""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(default_cache_dir(), "ctgov.sqlite")
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS trials (nct_id TEXT PRIMARY KEY, found INTEGER NOT NULL, "
+                        "title TEXT, status TEXT, fetched REAL NOT NULL, expires REAL NOT NULL)")
+
+    def get(self, ids, now=None):
+        """``(records, stale)``: cached records for ``ids`` by id, and the ids missing or expired."""
+        now = time.time() if now is None else now
+        ids = list(dict.fromkeys(ids))
+        records = {}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            query = ("SELECT nct_id, found, title, status, expires FROM trials "
+                     f"WHERE nct_id IN ({','.join('?' * len(chunk))})")
+            for nct, found, title, status, expires in self.db.execute(query, chunk):
+                records[nct] = {"found": bool(found), "title": title, "status": status, "expires": expires}
+        stale = [nct for nct in ids if nct not in records or records[nct]["expires"] <= now]
+        return records, stale
+
+    def put(self, ids, studies, ttl, closed_ttl, now=None):
+        """Store the result of fetching ``ids``; ``studies`` holds the ones the registry returned."""
+        now = time.time() if now is None else now
+        rows = []
+        for nct in ids:
+            study = studies.get(nct)
+            hours = closed_ttl if study and study["status"] in CLOSED else ttl
+            expires = now + hours * 3600 * random.uniform(0.9, 1.0)     # spread the refetches out
+            rows.append((nct, study is not None, (study or {}).get("title"), (study or {}).get("status"),
+                         now, expires))
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO trials VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def close(self):
+        self.db.close()
+
+
+# ================================================================
+# REFRESH
+# ================================================================
+
+async def fetch_stale(ids, cache, base_url=BASE_URL, batch=DEFAULT_BATCH, concurrency=DEFAULT_CONCURRENCY,
+                      rate=DEFAULT_RATE, ttl=DEFAULT_TTL, closed_ttl=DEFAULT_CLOSED_TTL, log=print):
+    """Fetch ``ids`` in batches into ``cache``; returns ``(requests, failed ids)``."""
+    client = HTTPClient(base_url, concurrency)
+    limiter = RateLimiter(rate, burst=concurrency)
+    failed = []
+
+    async def one(chunk):
+        try:
+            studies = await fetch_batch(client, limiter, chunk)
+        except (HTTPStatusError, OSError, ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError) as exc:
+            log(f"batch of {len(chunk)} ({chunk[0]}...) failed: {type(exc).__name__}: {exc}")
+            failed.extend(chunk)
+            return
+        cache.put(chunk, studies, ttl, closed_ttl)
+
+    try:
+        await asyncio.gather(*(one(ids[i:i + batch]) for i in range(0, len(ids), batch)))
+    finally:
+        client.close()
+    return client.requests, failed
+
+
+def apply(rows, records):
+    """Write the cached registry values into ``rows``; returns how many rows changed."""
+    changed = 0
+    for row in rows:
+        nct = nct_id(row)
+        record = records.get(nct)
+        if record is None or not record["found"]:
+            continue
+        new = {"nct_id": nct, "ct_url": STUDY_URL.format(nct),
+               "ct_title": record["title"] or row.get("ct_title", ""),
+               "ct_status": record["status"] or row.get("ct_status", "")}
+        if any(row.get(k) != v for k, v in new.items()):
+            row.update(new)
+            changed += 1
+    return changed
+
+
+def refresh(base_url=BASE_URL, batch=DEFAULT_BATCH, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE,
+            ttl=DEFAULT_TTL, closed_ttl=DEFAULT_CLOSED_TTL, force=False, dry_run=False, cache_path=None, log=print):
+    """Refresh the dataset; returns a summary dict (``failed`` lists the ids that couldn't be fetched)."""
+    start = time.perf_counter()
+    rows = load_rows(DATASET)
+    ids = list(dict.fromkeys(filter(None, map(nct_id, rows))))
+    cache = TrialCache(cache_path)
+    try:
+        records, stale = cache.get(ids)
+        if force:
+            stale = ids
+        requests, failed = 0, []
+        if stale:
+            log(f"fetching {len(stale)} of {len(ids)} trials from {base_url}")
+            requests, failed = asyncio.run(fetch_stale(stale, cache, base_url, batch, concurrency, rate, ttl,
+                                                       closed_ttl, log))
+            records, _ = cache.get(ids)
+    finally:
+        cache.close()
+
+    changed = apply(rows, records)
+    if changed and not dry_run:
+        dataset = get_dataset(DATASET)
+        save_rows(DATASET, rows)
+        html = read_page(dataset.page)
+        new = bundle_page(dataset, html, rows)
+        if new != html:
+            write_page(dataset.page, new)
+    return {"trials": len(ids), "rows": len(rows), "fetched": len(stale) - len(failed), "cached": len(ids) - len(stale),
+            "requests": requests, "not_found": sorted(n for n in ids if n in records and not records[n]["found"]),
+            "failed": failed, "changed": changed, "seconds": round(time.perf_counter() - start, 3)}
+
+
+# ================================================================
+# MOCK REGISTRY
+# ================================================================
+
+def mock_studies(path=None):
+    """``{nct_id: {"title", "status"}}`` from a JSON file, or the dataset's current values."""
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return {k.upper(): v for k, v in json.load(f).items()}
+    return {nct_id(row): {"title": row.get("ct_title", ""), "status": row.get("ct_status", "")}
+            for row in load_rows(DATASET) if nct_id(row)}
+
+
+def _mock_study(nct, study):
+    return {"protocolSection": {"identificationModule": {"nctId": nct, "briefTitle": study["title"]},
+                                "statusModule": {"overallStatus": study["status"]}}}
+
+
+async def serve_mock(studies, host="127.0.0.1", port=8790, fail_rate=0.0, delay=0.0, log=None, ready=None):
+    """Answer ``GET .../studies?filter.ids=...`` like the registry's API v2, until cancelled."""
+    from deckgen.serve import HTTPError, read_request, response
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except (HTTPError, asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    return
+                if request is None:
+                    return
+                _, target, _, _ = request
+                url = urlsplit(target)
+                ids = [i.strip().upper() for i in ",".join(parse_qs(url.query).get("filter.ids", [])).split(",")
+                       if i.strip()]
+                if delay:
+                    await asyncio.sleep(delay)
+                if random.random() < fail_rate:
+                    status, body, extra = 503, b'{"error": "try again"}', [("Retry-After", "0")]
+                elif not url.path.endswith("/studies"):
+                    status, body, extra = 404, b'{"error": "not found"}', []
+                else:
+                    found = [_mock_study(i, studies[i]) for i in ids if i in studies]
+                    status, body, extra = 200, json.dumps({"studies": found}).encode(), []
+                writer.write(response(status, body, "application/json", extra))
+                await writer.drain()
+                if log:
+                    log(f"GET {url.path} {status} ({len(ids)} ids)")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    if ready is not None:
+        ready(server.sockets[0].getsockname()[:2])
+    async with server:
+        await server.serve_forever()
+
+
+# ================================================================
+# CLI
+# ================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tools.ctgov", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("refresh", help="fetch missing / stale trials and write them into the dataset")
+    p.add_argument("--base-url", default=BASE_URL, help=f"registry API root (default: {BASE_URL})")
+    p.add_argument("--batch", type=int, default=DEFAULT_BATCH, help=f"ids per request (default: {DEFAULT_BATCH})")
+    p.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                   help=f"connections / requests in flight (default: {DEFAULT_CONCURRENCY})")
+    p.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                   help=f"requests per second (default: {DEFAULT_RATE})")
+    p.add_argument("--ttl", type=float, default=DEFAULT_TTL, metavar="HOURS",
+                   help=f"refetch running trials after this long (default: {DEFAULT_TTL})")
+    p.add_argument("--closed-ttl", type=float, default=DEFAULT_CLOSED_TTL, metavar="HOURS",
+                   help=f"refetch completed / terminated / withdrawn trials after this long "
+                        f"(default: {DEFAULT_CLOSED_TTL})")
+    p.add_argument("--force", action="store_true", help="refetch every trial, cached or not")
+    p.add_argument("--dry-run", action="store_true", help="don't write the dataset or the page")
+    p.add_argument("--cache", help="SQLite cache file (default: $DECKGEN_CACHE_DIR/ctgov.sqlite)")
+
+    p = commands.add_parser("mock", help="serve a local stand-in for the registry API")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("-p", "--port", type=int, default=8790)
+    p.add_argument("--studies", help='JSON file of {"NCT...": {"title": ..., "status": ...}} '
+                                     "(default: the dataset's current values)")
+    p.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered 503")
+    p.add_argument("--delay", type=float, default=0.0, metavar="SECONDS", help="latency added to every request")
+    p.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "mock":
+        studies = mock_studies(args.studies)
+
+        def ready(address):
+            print(f"mock registry with {len(studies)} studies on http://{address[0]}:{address[1]}/api/v2", flush=True)
+        try:
+            asyncio.run(serve_mock(studies, args.host, args.port, args.fail_rate, args.delay,
+                                   None if args.quiet else print, ready))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.batch < 1 or args.concurrency < 1 or args.rate <= 0:
+        parser.error("--batch and --concurrency must be at least 1 and --rate positive")
+    try:
+        HTTPClient(args.base_url)
+    except ValueError as exc:
+        parser.error(str(exc))
+    summary = refresh(args.base_url, args.batch, args.concurrency, args.rate, args.ttl, args.closed_ttl,
+                      args.force, args.dry_run, args.cache)
+    print(f"{summary['trials']} trials: {summary['cached']} cached, {summary['fetched']} fetched in "
+          f"{summary['requests']} requests, {len(summary['failed'])} failed, {len(summary['not_found'])} not in "
+          f"the registry; {summary['changed']} rows {'would change' if args.dry_run else 'updated'} "
+          f"({summary['seconds']:.2f}s)")
+    for nct in summary["not_found"]:
+        print(f"  not in the registry: {nct}")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""The datasets behind the dashboard pages and where their rows live.
+
+Each dataset's rows are kept as JSON in ``data/`` (one row per line, so
+edits diff cleanly); that file is the source of truth. The page carries a
+columnar bundle built from it by ``python -m tools.bundle_data``. If the
+source file doesn't exist yet, rows are read back out of the page, either
+from the bundle or from a plain row-array literal.
+"""
+
+import json
+import os
+from collections import namedtuple
+
+from . import bundle
+from .jsdata import ROOT, extract, read_page
+
+# ``snapshot_var`` names the page's precomputed aggregates, if it has any (see deckgen.deals)
+Dataset = namedtuple("Dataset", "name page rows_var bundle_var source facets snapshot_var", defaults=(None,))
+
+DATASETS = {
+    "trials": Dataset(
+        "trials", "oncology_dashboard_final_dvn.html", "RAW_DATA", "RAW_BUNDLE", "data/oncology_trials.json",
+        facets=("year", "stage", "tumor", "line", "moa", "ct_status"),
+    ),
+    "deals": Dataset(
+        "deals", "oncology_deals_dashboard.html", "DEALS", "DEALS_BUNDLE", "data/oncology_deals.json",
+        facets=("year", "q", "type", "modality", "indCat", "phase", "country", "biomarker", "buyer"),
+        snapshot_var="DEALS_SNAPSHOT",
+    ),
+}
+
+
+def get_dataset(name):
+    try:
+        return DATASETS[name]
+    except KeyError:
+        raise ValueError(f"unknown dataset {name!r} (known: {', '.join(DATASETS)})") from None
+
+
+def source_path(dataset):
+    return os.path.join(ROOT, dataset.source)
+
+
+def rows_from_page(dataset, html=None):
+    """Rows embedded in the dataset's page, from its bundle or a legacy row literal."""
+    html = read_page(dataset.page) if html is None else html
+    try:
+        return bundle.decode(extract(html, dataset.bundle_var))
+    except ValueError:
+        return extract(html, dataset.rows_var)
+
+
+def load_rows(name):
+    """The rows of dataset ``name`` (a list of dicts)."""
+    dataset = get_dataset(name)
+    path = source_path(dataset)
+    if not os.path.exists(path):
+        return rows_from_page(dataset)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_rows(name, rows):
+    """Write the source file of dataset ``name``, one row per line."""
+    path = source_path(get_dataset(name))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("[\n" + ",\n".join(json.dumps(row, ensure_ascii=False) for row in rows) + "\n]\n")
+    os.replace(tmp, path)
@@ -0,0 +1,186 @@
+"""3D force-directed layout in NumPy, the same model as prv_graph.html's ``simulate3D()``.
+
+Every step, each node's velocity gets:
+
+* a pull towards the origin, ``-position * center_k``;
+* repulsion from every other node, ``repulsion / dist**2`` along the line
+  between them;
+* for each edge, a spring force ``(dist - spring_len) * spring_k``;
+
+then velocities are multiplied by ``damping`` and added to positions. Forces
+within a step only read positions, so a step vectorizes exactly: repulsion
+is a blocked all-pairs computation and springs are ``bincount`` sums over the
+edge arrays.
+
+For larger graphs (``method="auto"`` above ``BARNES_HUT_MIN`` nodes)
+repulsion uses Barnes-Hut on a linear octree. Bodies are sorted by Morton
+code; the cells at each depth are runs of equal code prefixes. Far cells
+(``size / dist < theta``) act as one body at their centre of mass. The tree
+is walked for all bodies at once, one depth per pass, so the cost is
+O(n log n) in array operations rather than O(n**2).
+
+Seeds are the page's Fibonacci sphere with seeded jitter, so layouts are
+reproducible.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+Model = namedtuple("Model", "repulsion spring_len spring_k center_k damping")
+
+# The constants in prv_graph.html's simulate3D()
+PRV_MODEL = Model(repulsion=300.0, spring_len=16.0, spring_k=0.008, center_k=0.003, damping=0.88)
+
+BARNES_HUT_MIN = 1500
+_BLOCK = 512                                     # rows per all-pairs block (bounds memory at ~n * 512)
+_DEPTH = 10                                      # octree depth; Morton codes use 3 * _DEPTH bits
+_LEAF = 8                                        # cells with at most this many bodies are summed directly
+
+
+def fibonacci_sphere(n, spread=35.0, jitter=8.0, seed=0):
+    """The page's seed: points on a Fibonacci sphere of radius ``spread``, plus uniform jitter."""
+    i = np.arange(n)
+    phi = np.arccos(-1 + 2 * i / max(n, 1))
+    theta = np.sqrt(n * np.pi) * phi
+    pos = spread * np.column_stack([np.cos(theta) * np.sin(phi), np.sin(theta) * np.sin(phi), np.cos(phi)])
+    rng = np.random.default_rng(seed)
+    return pos + (rng.random((n, 3)) - 0.5) * jitter
+
+
+def repulsion_direct(pos, strength):
+    """Velocity change from all-pairs repulsion, computed in row blocks."""
+    out = np.empty_like(pos)
+    for lo in range(0, len(pos), _BLOCK):
+        d = pos[lo:lo + _BLOCK, None, :] - pos[None, :, :]          # a - b
+        dist = np.sqrt(np.einsum("ijk,ijk->ij", d, d))
+        dist[dist == 0] = 1.0                    # the page's `|| 1`: coincident nodes don't push
+        out[lo:lo + _BLOCK] = np.einsum("ijk,ij->ik", d, strength / dist ** 3)
+    return out
+
+
+def _ranges(starts, counts):
+    """Concatenated ``range(s, s + c)`` for each start/count pair."""
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(starts, counts) + np.arange(counts.sum()) - offsets
+
+
+def _scatter(index, vectors, n):
+    """Sum ``vectors`` (k, 3) into an (n, 3) array at rows ``index``."""
+    return np.column_stack([np.bincount(index, vectors[:, k], n) for k in range(3)])
+
+
+class _Octree:
+    """Linear octree: per depth, the cells (runs of equal Morton prefix) of the sorted bodies."""
+
+    def __init__(self, pos):
+        lo = pos.min(axis=0)
+        self.size = float((pos.max(axis=0) - lo).max()) or 1.0
+        cells = np.minimum(((pos - lo) / self.size * (1 << _DEPTH)).astype(np.int64), (1 << _DEPTH) - 1)
+        codes = np.zeros(len(pos), dtype=np.int64)
+        for bit in range(_DEPTH):
+            for axis in range(3):
+                codes |= ((cells[:, axis] >> bit) & 1) << (3 * bit + axis)
+        self.order = np.argsort(codes, kind="stable")
+        self.pos = pos[self.order]
+        codes = codes[self.order]
+
+        # Per depth: [first body, body count, centre of mass, (first child, child count) or None]
+        self.levels = []
+        for depth in range(_DEPTH + 1):
+            prefix = codes >> (3 * (_DEPTH - depth))
+            keep = np.flatnonzero(np.r_[True, prefix[1:] != prefix[:-1]])
+            count = np.diff(np.r_[keep, len(codes)])
+            com = np.add.reduceat(self.pos, keep, axis=0) / count[:, None]
+            self.levels.append([keep, count, com, prefix[keep]])
+        for depth in range(_DEPTH):
+            parent, child = self.levels[depth], self.levels[depth + 1]
+            first = np.searchsorted(child[3] >> 3, parent[3], "left")
+            last = np.searchsorted(child[3] >> 3, parent[3], "right")
+            parent[3] = (first, last - first)
+        self.levels[_DEPTH][3] = None
+
+    def repulsion(self, strength, theta):
+        """Velocity change of every body (in sorted order) from Barnes-Hut repulsion."""
+        pos = self.pos
+        out = np.zeros_like(pos)
+        bodies = np.arange(len(pos))
+        cells = np.zeros(len(pos), dtype=np.int64)
+        for depth, (start, count, com, children) in enumerate(self.levels):
+            if not len(bodies):
+                break
+            d = pos[bodies] - com[cells]
+            dist = np.sqrt(np.einsum("ij,ij->i", d, d))
+            n = count[cells]
+            inside = (bodies >= start[cells]) & (bodies < start[cells] + n)
+            far = ~inside & ((self.size / (1 << depth)) < theta * dist)
+            leaf = ~far & ((n <= _LEAF) | (children is None))
+
+            # Far cells act as one body of weight n at their centre of mass
+            if far.any():
+                out += _scatter(bodies[far], d[far] * (strength * n[far] / dist[far] ** 3)[:, None], len(pos))
+
+            # Leaves: sum their bodies directly, skipping the body itself
+            if leaf.any():
+                b = np.repeat(bodies[leaf], n[leaf])
+                j = _ranges(start[cells[leaf]], n[leaf])
+                keep = b != j
+                b, j = b[keep], j[keep]
+                dd = pos[b] - pos[j]
+                r = np.sqrt(np.einsum("ij,ij->i", dd, dd))
+                r[r == 0] = 1.0
+                out += _scatter(b, dd * (strength / r ** 3)[:, None], len(pos))
+
+            # Everything else opens up into its children at the next depth
+            near = ~far & ~leaf
+            if children is None or not near.any():
+                break
+            first, nchild = children[0][cells[near]], children[1][cells[near]]
+            bodies = np.repeat(bodies[near], nchild)
+            cells = _ranges(first, nchild)
+        return out
+
+
+def repulsion_barnes_hut(pos, strength, theta=0.7):
+    tree = _Octree(pos)
+    out = np.empty_like(pos)
+    out[tree.order] = tree.repulsion(strength, theta)
+    return out
+
+
+def layout(n, edges, model=PRV_MODEL, pos=None, steps=10000, tol=1e-3, method="auto", theta=0.7, seed=0):
+    """Run the force model until the largest velocity drops below ``tol`` (or ``steps`` run out).
+
+    ``edges`` is an ``(m, 2)`` array of node indexes; ``pos`` the starting
+    positions (default: ``fibonacci_sphere``). Returns ``(positions, steps run)``.
+    """
+    pos = fibonacci_sphere(n, seed=seed) if pos is None else np.array(pos, dtype=float)
+    vel = np.zeros_like(pos)
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    src, tgt = edges[:, 0], edges[:, 1]
+    if method == "auto":
+        method = "barnes-hut" if n >= BARNES_HUT_MIN else "direct"
+    if method not in ("direct", "barnes-hut"):
+        raise ValueError(f"unknown layout method {method!r}")
+    if n == 0:                           # nothing to lay out
+        return pos, 0
+
+    for step in range(1, steps + 1):
+        vel -= pos * model.center_k
+        if method == "direct":
+            vel += repulsion_direct(pos, model.repulsion)
+        else:
+            vel += repulsion_barnes_hut(pos, model.repulsion, theta)
+
+        d = pos[tgt] - pos[src]
+        dist = np.sqrt(np.einsum("ij,ij->i", d, d))
+        dist[dist == 0] = 1.0
+        f = d * ((dist - model.spring_len) * model.spring_k / dist)[:, None]
+        for k in range(3):
+            vel[:, k] += np.bincount(src, f[:, k], n) - np.bincount(tgt, f[:, k], n)
+
+        vel *= model.damping
+        pos += vel
+        if np.abs(vel).max() < tol:
+            break
+    return pos, step
@@ -0,0 +1,180 @@
+"""Serve index.html's images as sized AVIF/WebP variants.
+
+Every local ``<img>`` in the page whose class (or source) names a slot in
+``SLOTS`` becomes a ``<picture>``:
+
+* AVIF and WebP sources at 1x and 2x the slot's CSS size;
+* a PNG or JPEG fallback ``<img>`` with explicit ``width`` / ``height``.
+
+Variants are rendered by ``deckgen.assets``: each image is decoded once,
+encodings are cached by content hash, and near-duplicate images are
+rendered from one source. Files go to ``assets/img/`` under names carrying
+their content hash, so they can be cached forever. The original file stays
+in ``data-src`` and re-running rewrites the ``<picture>`` in place::
+
+    python -m tools.images            # rewrite index.html, refresh assets/img/
+    python -m tools.images --check    # exit 1 if index.html or assets/img/ is stale
+"""
+
+import argparse
+import glob
+import html as html_lib
+import os
+import re
+import sys
+
+from deckgen import assets
+from deckgen.cache import content_hash
+
+from .jsdata import ROOT, read_page, write_page
+
+PAGE = "index.html"
+OUT_DIR = "assets/img"
+
+# CSS box (px) and fit of each slot, from styles.css
+SLOTS = {
+    "hero-photo": (320, 320, "cover"),
+    "company-logo": (80, 44, "contain"),
+    "edu-logo": (64, 64, "contain"),
+}
+SLOT_BY_SRC = {"headshot.png": "hero-photo"}
+EAGER = {"hero-photo"}                     # above the fold: no lazy loading
+DENSITIES = (1, 2)
+WEB_FORMATS = ("avif", "webp")
+
+_IMG = re.compile(r"<img\b([^>]*)>")
+_PICTURE = re.compile(r'<picture data-src="([^"]+)">.*?(<img\b[^>]*>)</picture>', re.S)
+_ATTR = re.compile(r'([\w-]+)="([^"]*)"')
+_ADDED = ("width", "height", "loading", "decoding")
+
+
+def attributes(tag):
+    return dict(_ATTR.findall(tag))
+
+
+def slot_for(attrs):
+    for cls in attrs.get("class", "").split():
+        if cls in SLOTS:
+            return cls
+    return SLOT_BY_SRC.get(attrs.get("src"))
+
+
+def restore(html):
+    """``html`` with every generated ``<picture>`` turned back into the original ``<img>``."""
+    def original(m):
+        attrs = {k: v for k, v in attributes(m.group(2)).items() if k not in _ADDED}
+        attrs["src"] = html_lib.unescape(m.group(1))
+        return "<img " + " ".join(f'{k}="{v}"' for k, v in attrs.items()) + ">"
+    return _PICTURE.sub(original, html)
+
+
+class Variants:
+    """Renders and names the files for the page.
+
+    ``files`` maps output name -> bytes; ``served[(format, density)]`` is the
+    set of files a browser picking that source downloads.
+    """
+
+    def __init__(self, sources):
+        self.canonical = assets.canonical_sources([os.path.join(ROOT, s) for s in sources])
+        self.files = {}
+        self.served = {}
+
+    def file(self, src, box, fmt, mode):
+        path = self.canonical[os.path.join(ROOT, src)]
+        data = assets.render(path, box, fmt, mode)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        w, h = assets.fit(assets.decode(path).size, box, mode)
+        name = f"{OUT_DIR}/{stem}-{w}x{h}.{content_hash(data)[:10]}.{fmt}"
+        self.files[name] = data
+        return name, (w, h)
+
+    def picture(self, attrs, slot):
+        src = attrs["src"]
+        bw, bh, mode = SLOTS[slot]
+        path = self.canonical[os.path.join(ROOT, src)]
+        sources = []
+        for fmt in WEB_FORMATS:
+            srcset = []
+            for d in DENSITIES:
+                name, _ = self.file(src, (bw * d, bh * d), fmt, mode)
+                self.served.setdefault((fmt, d), set()).add(name)
+                srcset.append(f"{name} {d}x")
+            sources.append(f'<source type="{assets.MIME_TYPES[fmt]}" srcset="{", ".join(srcset)}">')
+        fallback, _ = self.file(src, (bw * DENSITIES[-1], bh * DENSITIES[-1]), assets.fallback_format(path), mode)
+        w, h = assets.fit(assets.decode(path).size, (bw, bh), mode)
+        img = dict(attrs, src=fallback, width=str(w), height=str(h), decoding="async")
+        if slot not in EAGER:
+            img["loading"] = "lazy"
+        tag = "<img " + " ".join(f'{k}="{v}"' for k, v in img.items()) + ">"
+        return f'<picture data-src="{html_lib.escape(src)}">{"".join(sources)}{tag}</picture>'
+
+
+def rewrite(html):
+    """``(new html, Variants)`` for ``html``."""
+    html = restore(html)
+    found = []
+    for m in _IMG.finditer(html):
+        attrs = attributes(m.group(0))
+        src = attrs.get("src", "")
+        if slot_for(attrs) and not re.match(r"[a-z]+:|//", src) and os.path.exists(os.path.join(ROOT, src)):
+            found.append(src)
+    variants = Variants(dict.fromkeys(found))
+
+    def replace(m):
+        attrs = attributes(m.group(0))
+        slot = slot_for(attrs)
+        return variants.picture(attrs, slot) if attrs.get("src") in found else m.group(0)
+    return _IMG.sub(replace, html), variants
+
+
+def report_duplicates():
+    """Print near-duplicate images, and same-named files that are different pictures."""
+    paths = sorted(glob.glob(os.path.join(ROOT, "logos", "*"))) + [os.path.join(ROOT, "headshot.png")]
+    rel = lambda p: os.path.relpath(p, ROOT)  # noqa: E731
+    for group in assets.near_duplicates(paths):
+        print(f"near-duplicates: {', '.join(map(rel, group))} (rendered from {rel(group[0])})")
+    stems = {}
+    for p in paths:
+        stems.setdefault(os.path.splitext(p)[0], []).append(p)
+    for group in stems.values():
+        if len(group) > 1 and not assets.same_picture(*group[:2]):
+            print(f"note: {', '.join(map(rel, group))} share a name but are different pictures")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tools.images", description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="don't write; exit 1 if anything is out of date")
+    args = parser.parse_args(argv)
+
+    html = read_page(PAGE)
+    new, variants = rewrite(html)
+    out_dir = os.path.join(ROOT, OUT_DIR)
+    existing = set(os.listdir(out_dir)) if os.path.isdir(out_dir) else set()
+    wanted = {os.path.basename(name) for name in variants.files}
+    stale = new != html or wanted != existing
+    if args.check:
+        print(f"{PAGE} and {OUT_DIR}/ are {'out of date' if stale else 'up to date'}")
+        return 1 if stale else 0
+
+    report_duplicates()
+    os.makedirs(out_dir, exist_ok=True)
+    for name, data in variants.files.items():
+        if os.path.basename(name) not in existing:
+            with open(os.path.join(ROOT, name), "wb") as f:
+                f.write(data)
+    for name in existing - wanted:
+        os.remove(os.path.join(out_dir, name))
+    if new != html:
+        write_page(PAGE, new)
+
+    originals = {m.group(1) for m in _PICTURE.finditer(new)}
+    before = sum(os.path.getsize(os.path.join(ROOT, s)) for s in originals)
+    print(f"{len(originals)} images ({before / 1024:.0f} KB as shipped), {len(variants.files)} files in {OUT_DIR}/")
+    for (fmt, d), names in sorted(variants.served.items()):
+        print(f"  {fmt} {d}x: {sum(len(variants.files[n]) for n in names) / 1024:.0f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""Read and rewrite the data literals embedded in the dashboard pages.
+
+The pages keep their data in ``const NAME = <literal>;`` statements inside
+``<script>`` blocks. Some are plain JSON (``RAW_DATA``), others are
+hand-written JavaScript with unquoted keys, single-quoted strings and
+trailing commas (``nodesData``, ``DEALS``). ``parse_literal`` accepts both;
+anything that isn't a literal (function calls, expressions) is an error::
+
+    html = read_page("prv_graph.html")
+    nodes = extract(html, "nodesData")
+    html = replace(html, "LAYOUT_POSITIONS", json.dumps(positions))
+"""
+
+import json
+import os
+import re
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_DECL = r"\b(?:const|let|var)\s+{}\s*=\s*"
+_SPACE = re.compile(r"(?:\s+|//[^\n]*|/\*.*?\*/)*", re.S)
+_NUMBER = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_IDENT = re.compile(r"[A-Za-z_$][\w$]*")
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0"}
+_WORDS = {"true": True, "false": False, "null": None, "undefined": None}
+_json = json.JSONDecoder()
+
+
+def page_path(name):
+    """Path of a page in the repository root."""
+    return os.path.join(ROOT, name)
+
+
+def read_page(name):
+    with open(page_path(name), encoding="utf-8") as f:
+        return f.read()
+
+
+def write_page(name, html):
+    path = page_path(name)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(html)
+    os.replace(tmp, path)
+
+
+def _skip(text, pos):
+    return _SPACE.match(text, pos).end()
+
+
+def _string(text, pos):
+    quote = text[pos]
+    out = []
+    i = pos + 1
+    while True:
+        j = i
+        while j < len(text) and text[j] != quote and text[j] != "\\":
+            j += 1
+        if j >= len(text):
+            raise ValueError(f"unterminated string at offset {pos}")
+        out.append(text[i:j])
+        if text[j] == quote:
+            return "".join(out), j + 1
+        esc = text[j + 1]
+        if esc == "u":
+            out.append(chr(int(text[j + 2:j + 6], 16)))
+            i = j + 6
+        elif esc == "x":
+            out.append(chr(int(text[j + 2:j + 4], 16)))
+            i = j + 4
+        elif esc == "\n":                        # line continuation
+            i = j + 2
+        else:
+            out.append(_ESCAPES.get(esc, esc))
+            i = j + 2
+
+
+def parse_literal(text, pos=0):
+    """Parse the JS literal starting at ``text[pos]``; returns ``(value, end)``."""
+    pos = _skip(text, pos)
+    if text.startswith(("[", "{"), pos):
+        # Plain JSON is by far the most common case; the decoder is C-accelerated
+        try:
+            return _json.raw_decode(text, pos)
+        except ValueError:
+            pass
+    return _value(text, pos)
+
+
+def _value(text, pos):
+    pos = _skip(text, pos)
+    c = text[pos:pos + 1]
+    if c == "[":
+        items = []
+        pos = _skip(text, pos + 1)
+        while text[pos] != "]":
+            item, pos = _value(text, pos)
+            items.append(item)
+            pos = _skip(text, pos)
+            if text[pos] == ",":
+                pos = _skip(text, pos + 1)
+            elif text[pos] != "]":
+                raise ValueError(f"expected ',' or ']' at offset {pos}")
+        return items, pos + 1
+    if c == "{":
+        obj = {}
+        pos = _skip(text, pos + 1)
+        while text[pos] != "}":
+            if text[pos] in "'\"":
+                key, pos = _string(text, pos)
+            else:
+                m = _IDENT.match(text, pos) or _NUMBER.match(text, pos)
+                if m is None:
+                    raise ValueError(f"expected a property name at offset {pos}")
+                key, pos = m.group(), m.end()
+            pos = _skip(text, pos)
+            if text[pos] != ":":
+                raise ValueError(f"expected ':' at offset {pos}")
+            obj[key], pos = _value(text, pos + 1)
+            pos = _skip(text, pos)
+            if text[pos] == ",":
+                pos = _skip(text, pos + 1)
+            elif text[pos] != "}":
+                raise ValueError(f"expected ',' or '}}' at offset {pos}")
+        return obj, pos + 1
+    if c in ("'", '"'):
+        return _string(text, pos)
+    m = _NUMBER.match(text, pos)
+    if m:
+        n = m.group()
+        return (float(n) if any(ch in n for ch in ".eE") else int(n)), m.end()
+    m = _IDENT.match(text, pos)
+    if m and m.group() in _WORDS:
+        return _WORDS[m.group()], m.end()
+    raise ValueError(f"not a literal at offset {pos}: {text[pos:pos + 30]!r}")
+
+
+def _declaration(html, name):
+    m = re.search(_DECL.format(re.escape(name)), html)
+    if m is None:
+        raise ValueError(f"no `const {name} = ...` in page")
+    return _skip(html, m.end())
+
+
+def find(html, name):
+    """``(start, end)`` of the literal assigned to ``name``; raises ValueError if it isn't there."""
+    start = _declaration(html, name)
+    return start, parse_literal(html, start)[1]
+
+
+def extract(html, name):
+    """The value of ``const name = <literal>`` in ``html``."""
+    return parse_literal(html, _declaration(html, name))[0]
+
+
+def replace(html, name, literal):
+    """``html`` with the literal assigned to ``name`` replaced by the JS source ``literal``."""
+    start, end = find(html, name)
+    return html[:start] + literal + html[end:]
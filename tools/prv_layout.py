@@ -0,0 +1,81 @@
+"""Precompute the 3D layout of prv_graph.html.
+
+The page used to run ``simulate3D()`` for the first ~8 seconds of every visit.
+This tool runs the same force model offline (``tools.forcelayout``) on the
+page's ``nodesData`` / ``edgesData`` until it converges, and writes the
+positions into the page's ``LAYOUT_POSITIONS`` literal. The page places nodes
+there directly and only simulates live if some node has no stored position,
+i.e. nodes were added since the last run::
+
+    python -m tools.prv_layout                 # rewrite prv_graph.html in place
+    python -m tools.prv_layout --json layout.json --dry-run
+
+Re-run it whenever nodes or edges change.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from . import forcelayout
+from .jsdata import extract, read_page, replace, write_page
+
+PAGE = "prv_graph.html"
+
+
+def graph(html):
+    """``(node ids, (m, 2) edge index array)`` from the page's data."""
+    nodes = extract(html, "nodesData")
+    ids = [n["id"] for n in nodes]
+    index = {node_id: i for i, node_id in enumerate(ids)}
+    edges = []
+    for e in extract(html, "edgesData"):
+        try:
+            edges.append((index[e["source"]], index[e["target"]]))
+        except KeyError as exc:
+            raise ValueError(f"edge {e['source']} -> {e['target']} names unknown node {exc}") from None
+    return ids, np.array(edges, dtype=np.int64).reshape(-1, 2)
+
+
+def positions_js(ids, pos):
+    """``LAYOUT_POSITIONS`` source: ``{id: [x, y, z], ...}``, one node per line."""
+    lines = [f"  {json.dumps(node_id)}: [{x:.2f}, {y:.2f}, {z:.2f}]," for node_id, (x, y, z) in zip(ids, pos)]
+    return "{\n" + "\n".join(lines) + "\n}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tools.prv_layout", description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=10000, help="maximum simulation steps (default: 10000)")
+    parser.add_argument("--tol", type=float, default=1e-3,
+                        help="stop once no node moves more than this per step (default: 0.001)")
+    parser.add_argument("--method", choices=("auto", "direct", "barnes-hut"), default="auto",
+                        help=f"repulsion: all pairs, or Barnes-Hut (auto: from {forcelayout.BARNES_HUT_MIN} nodes)")
+    parser.add_argument("--theta", type=float, default=0.7, help="Barnes-Hut opening angle (default: 0.7)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the starting jitter")
+    parser.add_argument("--json", help="also write {id: [x, y, z]} to this file")
+    parser.add_argument("--dry-run", action="store_true", help=f"don't rewrite {PAGE}")
+    args = parser.parse_args(argv)
+
+    html = read_page(PAGE)
+    ids, edges = graph(html)
+    start = time.perf_counter()
+    pos, steps = forcelayout.layout(len(ids), edges, steps=args.steps, tol=args.tol, method=args.method,
+                                    theta=args.theta, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    converged = "converged" if steps < args.steps else "step limit reached"
+    print(f"{len(ids)} nodes, {len(edges)} edges: {steps} steps, {converged} ({elapsed:.2f}s)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({node_id: [round(float(c), 2) for c in p] for node_id, p in zip(ids, pos)}, f, indent=1)
+    if not args.dry_run:
+        write_page(PAGE, replace(html, "LAYOUT_POSITIONS", positions_js(ids, pos)))
+        print(f"positions written to {PAGE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())